@@ -68,6 +68,23 @@ def tests(session: Session) -> None:
             session.notify("coverage", posargs=[])
 
 
+# runs the benchmarks of the hot paths, not run by default
+# compares to benchmarks/baseline.json if there is one and fails if
+# anything is slower by more than the threshold
+# save a baseline with: nox -s bench -- --output benchmarks/baseline.json
+@session(python=python_versions[0])
+def bench(session: Session) -> None:
+    """Run the benchmarks and compare to the baseline."""
+    session.install(".")
+    args = session.posargs
+    if not args:
+        Path("benchmarks").mkdir(exist_ok=True)
+        args = ["--output", "benchmarks/results.json"]
+        if Path("benchmarks/baseline.json").exists():
+            args += ["--baseline", "benchmarks/baseline.json"]
+    session.run("python", "-m", "tennisim.bench", *args)
+
+
 # session to check coverage of tests
 @session
 def coverage(session: Session) -> None:
@@ -0,0 +1,173 @@
+import math
+import random
+import time
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from tennisim.montecarlo import Statistic
+from tennisim.montecarlo import play
+from tennisim.stream import RunningStats
+
+
+class AdaptiveEstimate(NamedTuple):
+    """Estimate of the mean of one statistic from `run_adaptive`
+
+    Attributes:
+        mean (float): estimate
+        std_err (float): standard error of the estimate
+        ci (Tuple[float, float]): lower and upper ends of the confidence
+        interval
+    """
+
+    mean: float
+    std_err: float
+    ci: Tuple[float, float]
+
+
+class AdaptiveRun(NamedTuple):
+    """Result of `run_adaptive`
+
+    Attributes:
+        estimates (Dict[str, AdaptiveEstimate]): {name: estimate}
+        paths (int): matches simulated
+        seconds (float): wall time taken
+        converged (bool): True if every interval got within its target
+        width, False if the time or path budget ran out first
+    """
+
+    estimates: Dict[str, AdaptiveEstimate]
+    paths: int
+    seconds: float
+    converged: bool
+
+
+def z_score(level: float) -> float:
+    """Returns z such that a standard normal is within [-z, z] with the given
+    probability, by bisection on `math.erf`
+
+    Args:
+        level (float): confidence level e.g. 0.95
+
+    Raises:
+        ValueError: if level is not within (0, 1)
+
+    Returns:
+        float: z score e.g. 1.96 for 0.95
+    """
+    if not 0 < level < 1:
+        raise ValueError(f"level must be within (0, 1), got {level}")
+    lo = 0.0
+    hi = 40.0
+    for x in range(100):
+        mid = (lo + hi) / 2
+        if math.erf(mid / math.sqrt(2)) < level:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def run_adaptive(
+    stats: Mapping[str, Statistic],
+    p_a: float,
+    p_b: float,
+    width: Union[float, Mapping[str, float]] = 0.01,
+    level: float = 0.95,
+    max_seconds: Optional[float] = None,
+    max_paths: int = 10_000_000,
+    chunk: int = 1000,
+    min_paths: int = 1000,
+    best_of: int = 3,
+    a_first: bool = True,
+    rng: Any = None,
+) -> AdaptiveRun:
+    """Simulates matches in chunks until the confidence interval of every
+    statistic is narrower than its target width, or the time or path budget
+    runs out. Running means and variances are kept in fixed memory, so the
+    sample size fits the question: cheap questions stop early and noisy ones
+    carry on
+
+    The intervals are normal approximations, mean +/- z * std_err. Rare
+    events should have min_paths large enough to see a few of them, as a
+    statistic that has only ever been 0 has a std_err of 0
+
+    Args:
+        stats (Mapping[str, Statistic]): {name: function of a
+        `tennisim.montecarlo.MatchSummary`}
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        width (Union[float, Mapping[str, float]], optional): target width of
+        each interval, upper less lower end, either one for all or one per
+        statistic. Defaults to 0.01.
+        level (float, optional): confidence level of the intervals.
+        Defaults to 0.95.
+        max_seconds (Optional[float], optional): stop after the chunk that
+        takes the run past this. Defaults to None for no time limit.
+        max_paths (int, optional): most matches to simulate.
+        Defaults to 10_000_000.
+        chunk (int, optional): matches to simulate between checks.
+        Defaults to 1000.
+        min_paths (int, optional): least matches to simulate before
+        stopping. Defaults to 1000.
+        best_of (int, optional): how many sets match is 'best of'.
+        Defaults to 3.
+        a_first (bool, optional): True if 'a' serves first. Defaults to True.
+        rng (Any, optional): random source with a `random` method, or a seed
+        for `random.Random`. Defaults to None for a fresh seed
+
+    Returns:
+        AdaptiveRun: estimates, paths used, time taken and whether the
+        targets were hit
+    """
+    if not hasattr(rng, "random"):
+        rng = random.Random(rng)
+    names = list(stats)
+    funcs = list(stats.values())
+    if isinstance(width, Mapping):
+        target = np.array([width[x] for x in names], dtype=float)
+    else:
+        target = np.full(len(names), float(width))
+    z = z_score(level)
+
+    start = time.perf_counter()
+    running = RunningStats((len(names),))
+    values = np.empty((chunk, len(names)))
+    converged = False
+    while running.count < max_paths:
+        n = min(chunk, max_paths - running.count)
+        for i in range(n):
+            summary = play(p_a, p_b, a_first, best_of, rng=rng)
+            values[i] = [f(summary) for f in funcs]
+        running.update(values[:n])
+
+        if running.count >= min_paths:
+            widths = 2 * z * running.std_err
+            if np.all(widths <= target):
+                converged = True
+                break
+        elapsed = time.perf_counter() - start
+        if max_seconds is not None and elapsed >= max_seconds:
+            break
+
+    std_err = running.std_err
+    estimates = {
+        x: AdaptiveEstimate(
+            float(running.mean[i]),
+            float(std_err[i]),
+            (
+                float(running.mean[i] - z * std_err[i]),
+                float(running.mean[i] + z * std_err[i]),
+            ),
+        )
+        for i, x in enumerate(names)
+    }
+    return AdaptiveRun(
+        estimates, running.count, time.perf_counter() - start, converged
+    )
@@ -0,0 +1,377 @@
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+# anything numpy will accept to seed or be a random generator
+RNG = Optional[Union[int, np.random.Generator]]
+
+
+def _broadcast(
+    size: Optional[int], *args: Union[float, bool, np.ndarray]
+) -> Tuple[np.ndarray, ...]:
+    """Broadcasts scalar or per item inputs to 1d arrays of a common length
+
+    Args:
+        size (Optional[int]): length to broadcast to. If None then takes the
+        length of the longest input
+        *args (Union[float, bool, np.ndarray]): inputs to broadcast
+
+    Returns:
+        Tuple[np.ndarray, ...]: inputs as arrays of the same length
+    """
+    arrays = [np.asarray(x) for x in args]
+    if size is None:
+        size = max(x.size for x in arrays)
+    return tuple(np.broadcast_to(x, (size,)) for x in arrays)
+
+
+def _check_endless(a_s: np.ndarray, b_s: np.ndarray) -> None:
+    """Raises if any tiebreak would never end, as happens when both players
+    win every point on serve or both lose every point on serve
+
+    Args:
+        a_s (np.ndarray): prob player a wins point on serve
+        b_s (np.ndarray): prob player b wins point on serve
+
+    Raises:
+        ValueError: if a_s and b_s are both 1 or both 0 for any item
+    """
+    if np.any((a_s == b_s) & ((a_s == 1) | (a_s == 0))):
+        raise ValueError(
+            "Tiebreaks would never end with serve probs both 1 or both 0"
+        )
+
+
+def _game_over(s: np.ndarray, r: np.ndarray, ppg: int) -> np.ndarray:
+    """Returns mask of games that are over given points won by server, s,
+    and returner, r
+
+    Args:
+        s (np.ndarray): points won by server in each game
+        r (np.ndarray): points won by returner in each game
+        ppg (int): points per game
+
+    Returns:
+        np.ndarray: True where someone has ppg points and is 2 clear
+    """
+    return ((s >= ppg) & (s - r >= 2)) | ((r >= ppg) & (r - s >= 2))
+
+
+def sim_game_batch(
+    p_s: Union[float, np.ndarray],
+    size: Optional[int] = None,
+    ppg: int = 4,
+    rng: RNG = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate many games of tennis at once using prob server wins point.
+    All games are advanced in lockstep and those that have finished are
+    dropped from the active set, so the same rules as `sim_game` apply but
+    the work is done over numpy arrays rather than per point in python
+
+    Args:
+        p_s (Union[float, np.ndarray]): probability server wins point, either
+        one value for all games or one value per game
+        size (Optional[int], optional): count of games to simulate. Defaults
+        to None which takes the count from the length of p_s
+        ppg (int): points per game in case want to play with longer game length
+        rng (RNG, optional): numpy random generator or seed to create one.
+        Defaults to None for a freshly seeded generator
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: tuple of bool array with True where the
+        server won the game and int array of points played in each game
+    """
+    rng = np.random.default_rng(rng)
+    (p_s,) = _broadcast(size, p_s)
+    size = p_s.size
+
+    wins = np.zeros(size, dtype=bool)
+    points = np.zeros(size, dtype=np.int64)
+
+    # no game can finish before ppg points so draw those all at once
+    s = (rng.random((size, ppg)) <= p_s[:, None]).sum(axis=1)
+    r = ppg - s
+    played = ppg
+
+    # game is over once someone has ppg points and is 2 clear
+    # this covers winning pre deuce as well as after deuce
+    done = _game_over(s, r, ppg)
+    wins[done] = s[done] > r[done]
+    points[done] = played
+
+    # keep only the games still going
+    active = np.flatnonzero(~done)
+    p_act = p_s[active]
+    s = s[active]
+    r = r[active]
+
+    while active.size:
+        # simulate next point for every game still going
+        won = rng.random(active.size) <= p_act
+        s = s + won
+        r = r + ~won
+        played += 1
+
+        done = _game_over(s, r, ppg)
+        if done.any():
+            ended = active[done]
+            wins[ended] = s[done] > r[done]
+            points[ended] = played
+            # drop the finished games
+            going = ~done
+            active = active[going]
+            p_act = p_act[going]
+            s = s[going]
+            r = r[going]
+
+    return wins, points
+
+
+def sim_tiebreak_batch(
+    a_s: Union[float, np.ndarray],
+    b_s: Union[float, np.ndarray],
+    a_first: Union[bool, np.ndarray] = True,
+    size: Optional[int] = None,
+    rng: RNG = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate many tiebreaks at once using probab of each player winning on
+    serve. Follows the same rules as `sim_tiebreak` - first server serves one
+    point then players alternate every 2 points until someone has 7 and is 2
+    clear
+
+    Args:
+        a_s (Union[float, np.ndarray]): prob player a wins point on serve
+        b_s (Union[float, np.ndarray]): prob player b wins point on serve
+        a_first (Union[bool, np.ndarray], optional): bool to mark who serves
+        first. Defaults to True for player a to serve first
+        size (Optional[int], optional): count of tiebreaks to simulate.
+        Defaults to None which takes the count from the inputs
+        rng (RNG, optional): numpy random generator or seed to create one.
+        Defaults to None for a freshly seeded generator
+
+    Raises:
+        ValueError: if a_s and b_s are both 1 or both 0 for any tiebreak
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: tuple of bool array with True where 'a'
+        won the tiebreak and int array of points played in each tiebreak
+    """
+    a_s, b_s, a_first = _broadcast(size, a_s, b_s, a_first)
+    _check_endless(a_s, b_s)
+    rng = np.random.default_rng(rng)
+    size = a_s.size
+
+    a_won = np.zeros(size, dtype=bool)
+    points = np.zeros(size, dtype=np.int64)
+
+    active = np.arange(size)
+    a_act = a_s.copy()
+    b_act = b_s.copy()
+    first_act = a_first.copy()
+    a = np.zeros(size, dtype=np.int64)
+    b = np.zeros(size, dtype=np.int64)
+    played = 0
+
+    while active.size:
+        # first server serves point 0, then 2 each starting with the other
+        first_serves = ((played + 1) // 2) % 2 == 0
+        a_serving = first_act == first_serves
+        # draw point from server perspective then map to 'a' or 'b'
+        server_won = rng.random(active.size) <= np.where(
+            a_serving, a_act, b_act
+        )
+        a_point = server_won == a_serving
+        a = a + a_point
+        b = b + ~a_point
+        played += 1
+
+        # tiebreak over once someone has 7 and is 2 clear
+        done = _game_over(a, b, 7)
+        if done.any():
+            ended = active[done]
+            a_won[ended] = a[done] > b[done]
+            points[ended] = played
+            going = ~done
+            active = active[going]
+            a_act = a_act[going]
+            b_act = b_act[going]
+            first_act = first_act[going]
+            a = a[going]
+            b = b[going]
+
+    return a_won, points
+
+
+def sim_set_batch(
+    a_s: Union[float, np.ndarray],
+    b_s: Union[float, np.ndarray],
+    a_first: Union[bool, np.ndarray] = True,
+    size: Optional[int] = None,
+    rng: RNG = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate many sets at once using probab of each player winning on
+    serve. Follows the same rules as `sim_set` - first to 6 games and 2 clear
+    with a tiebreak at 6-6
+
+    Args:
+        a_s (Union[float, np.ndarray]): prob player a wins point on serve
+        b_s (Union[float, np.ndarray]): prob player b wins point on serve
+        a_first (Union[bool, np.ndarray], optional): bool to mark who serves
+        first. Defaults to True for player a to serve first
+        size (Optional[int], optional): count of sets to simulate. Defaults to
+        None which takes the count from the inputs
+        rng (RNG, optional): numpy random generator or seed to create one.
+        Defaults to None for a freshly seeded generator
+
+    Raises:
+        ValueError: if a_s and b_s are both 1 or both 0 for any set
+
+    Returns:
+        Tuple[np.ndarray, ...]: tuple of arrays for each set of:
+         - True if 'a' won the set
+         - games won by 'a'
+         - games won by 'b'
+         - True if the set went to a tiebreak
+         - points played in the set
+    """
+    a_s, b_s, a_first = _broadcast(size, a_s, b_s, a_first)
+    _check_endless(a_s, b_s)
+    rng = np.random.default_rng(rng)
+    size = a_s.size
+
+    games_a = np.zeros(size, dtype=np.int64)
+    games_b = np.zeros(size, dtype=np.int64)
+    points = np.zeros(size, dtype=np.int64)
+
+    active = np.arange(size)
+    played = 0
+    while active.size:
+        # servers alternate each game starting with the first server
+        a_serving = a_first[active] == (played % 2 == 0)
+        held, pts = sim_game_batch(
+            np.where(a_serving, a_s[active], b_s[active]), rng=rng
+        )
+        a_game = held == a_serving
+        games_a[active] += a_game
+        games_b[active] += ~a_game
+        points[active] += pts
+        played += 1
+
+        g_a = games_a[active]
+        g_b = games_b[active]
+        done = _game_over(g_a, g_b, 6)
+
+        # at 6-6 the set goes to a tiebreak which ends it
+        tb = (g_a == 6) & (g_b == 6)
+        if tb.any():
+            # 12 games played so set's first server serves first in tiebreak
+            tb_sets = active[tb]
+            a_tb, tb_pts = sim_tiebreak_batch(
+                a_s[tb_sets], b_s[tb_sets], a_first[tb_sets], rng=rng
+            )
+            games_a[tb_sets] += a_tb
+            games_b[tb_sets] += ~a_tb
+            points[tb_sets] += tb_pts
+            done = done | tb
+
+        active = active[~done]
+
+    tiebreak = (games_a + games_b) == 13
+    return games_a > games_b, games_a, games_b, tiebreak, points
+
+
+class MatchBatch(NamedTuple):
+    """Compact results of many simulated matches, one entry per match
+
+    Attributes:
+        winner (np.ndarray): True where 'a' won the match
+        sets_a (np.ndarray): sets won by 'a'
+        sets_b (np.ndarray): sets won by 'b'
+        games_a (np.ndarray): games won by 'a' in each set, shape
+        (matches, best_of) with -1 for sets not played
+        games_b (np.ndarray): games won by 'b' in each set, as games_a
+        tiebreaks (np.ndarray): True where the set went to a tiebreak, shape
+        (matches, best_of)
+        points (np.ndarray): total points played in the match
+    """
+
+    winner: np.ndarray
+    sets_a: np.ndarray
+    sets_b: np.ndarray
+    games_a: np.ndarray
+    games_b: np.ndarray
+    tiebreaks: np.ndarray
+    points: np.ndarray
+
+
+def sim_match_batch(
+    a_s: Union[float, np.ndarray],
+    b_s: Union[float, np.ndarray],
+    size: Optional[int] = None,
+    a_first: bool = True,
+    best_of: int = 3,
+    rng: RNG = None,
+) -> MatchBatch:
+    """Simulate many tennis matches at once using probab of each player
+    winning on serve. Follows the same rules as `sim_match` including who
+    serves first in each set, but only keeps compact per match arrays rather
+    than the full progression of scores
+
+    Args:
+        a_s (Union[float, np.ndarray]): prob player a wins point on serve
+        b_s (Union[float, np.ndarray]): prob player b wins point on serve
+        size (Optional[int], optional): count of matches to simulate. Defaults
+        to None which takes the count from the inputs
+        a_first (bool, optional): bool to mark who serves first.
+        Defaults to True for player a to serve first
+        best_of (int, optional): how many sets to play best of. Defaults to 3.
+        rng (RNG, optional): numpy random generator or seed to create one.
+        Defaults to None for a freshly seeded generator
+
+    Raises:
+        ValueError: if a_s and b_s are both 1 or both 0 for any match
+
+    Returns:
+        MatchBatch: arrays of winner, sets, games per set, tiebreaks and points
+    """
+    a_s, b_s, starting_server = _broadcast(size, a_s, b_s, a_first)
+    _check_endless(a_s, b_s)
+    rng = np.random.default_rng(rng)
+    size = a_s.size
+    starting_server = starting_server.copy()
+    first_to = (best_of // 2) + 1
+
+    sets_a = np.zeros(size, dtype=np.int64)
+    sets_b = np.zeros(size, dtype=np.int64)
+    games_a = np.full((size, best_of), -1, dtype=np.int64)
+    games_b = np.full((size, best_of), -1, dtype=np.int64)
+    tiebreaks = np.zeros((size, best_of), dtype=bool)
+    points = np.zeros(size, dtype=np.int64)
+
+    active = np.arange(size)
+    for i in range(best_of):
+        a_set, g_a, g_b, tb, pts = sim_set_batch(
+            a_s[active], b_s[active], starting_server[active], rng=rng
+        )
+        sets_a[active] += a_set
+        sets_b[active] += ~a_set
+        games_a[active, i] = g_a
+        games_b[active, i] = g_b
+        tiebreaks[active, i] = tb
+        points[active] += pts
+
+        # if we played an odd number of games then change who serves first
+        starting_server[active] ^= (g_a + g_b) % 2 != 0
+
+        # drop matches that are over
+        going = (sets_a[active] < first_to) & (sets_b[active] < first_to)
+        active = active[going]
+        if not active.size:
+            break
+
+    return MatchBatch(
+        sets_a > sets_b, sets_a, sets_b, games_a, games_b, tiebreaks, points
+    )
@@ -0,0 +1,571 @@
+import argparse
+import json
+import os
+import pickle
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from tennisim import batch
+from tennisim import direct
+from tennisim import grad
+from tennisim import sim
+from tennisim.columnar import MatchStore
+from tennisim.columnar import annotate_matches
+from tennisim.columnar import write_matches
+from tennisim.game import prob_game
+from tennisim.game import theory_game
+from tennisim.match import MatchTable
+from tennisim.match import prob_match
+from tennisim.match import reformat_match
+from tennisim.set import prob_set
+from tennisim.tiebreak import prob_tiebreak
+
+# serve probs used throughout so results are comparable between runs
+P_A = 0.64
+P_B = 0.61
+SEED = 1234
+# paths per call of the batch simulators
+BATCH_SIZE = 10_000
+# matches annotated, written and read back by the storage benchmarks
+STORE_SIZE = 200
+# bump to the serve probs when finding sensitivities by re-pricing
+BUMP = 1e-6
+
+# representative states for the closed forms: start, mid and late
+GAME_STATES = [(0, 0), (2, 1), (3, 3), (1, 3)]
+TB_STATES = [(0, 0), (3, 4), (6, 5)]
+SET_STATES = [(0, 0), (3, 2), (5, 5), (2, 5)]
+MATCH_STATES = [
+    (0, 0, 0, 0, 0, 0),
+    (1, 0, 3, 2, 1, 2),
+    (1, 1, 6, 6, 3, 4),
+    (0, 1, 5, 4, 0, 0),
+]
+
+
+class Benchmark(NamedTuple):
+    """One benchmark of the suite
+
+    Attributes:
+        name (str): unique name, also the key in saved results
+        unit (str): unit of the measure, lower is always better
+        measure (Callable[[float], float]): takes the least seconds to spend
+        timing and returns the measure
+    """
+
+    name: str
+    unit: str
+    measure: Callable[[float], float]
+
+
+class Regression(NamedTuple):
+    """A benchmark that got worse than the baseline by more than allowed
+
+    Attributes:
+        name (str): name of the benchmark
+        baseline (float): value in the baseline
+        value (float): value in this run
+        ratio (float): value over baseline
+    """
+
+    name: str
+    baseline: float
+    value: float
+    ratio: float
+
+
+def time_per_call(
+    func: Callable[[], Any], min_time: float = 0.2, repeat: int = 5
+) -> float:
+    """Seconds per call of func, taking the best of several repeats as
+    `timeit` does. Each repeat calls func enough times to take at least
+    min_time / repeat seconds so timer resolution doesn't matter
+
+    Args:
+        func (Callable[[], Any]): function to time, called with no arguments
+        min_time (float, optional): least total seconds to spend timing.
+        Defaults to 0.2.
+        repeat (int, optional): how many repeats to take the best of.
+        Defaults to 5.
+
+    Returns:
+        float: seconds per call in the fastest repeat
+    """
+    target = min_time / repeat
+    # double the loop count until one repeat is long enough
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for x in range(number):
+            func()
+        took = time.perf_counter() - start
+        if took >= target:
+            break
+        number *= 2
+    best = took / number
+    for x in range(repeat - 1):
+        start = time.perf_counter()
+        for x in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def deep_size(obj: Any) -> int:
+    """Bytes held by a nest of lists and tuples and everything in them, each
+    object counted once
+
+    Args:
+        obj (Any): object to measure
+
+    Returns:
+        int: total size in bytes
+    """
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if id(x) in seen:
+            continue
+        seen.add(id(x))
+        total += sys.getsizeof(x)
+        if isinstance(x, (list, tuple)):
+            stack.extend(x)
+    return total
+
+
+def _over_states(
+    func: Callable[..., Any], probs: Sequence[float], states: Sequence[tuple]
+) -> Callable[[], None]:
+    """Returns a function that calls func once for each state
+
+    Args:
+        func (Callable[..., Any]): closed form function
+        probs (Sequence[float]): serve probs passed first
+        states (Sequence[tuple]): score states passed after the probs
+
+    Returns:
+        Callable[[], None]: function to time
+    """
+
+    def _call() -> None:
+        for state in states:
+            func(*probs, *state)
+
+    return _call
+
+
+def _latency(
+    func: Callable[..., Any], probs: Sequence[float], states: Sequence[tuple]
+) -> Callable[[float], float]:
+    """Measure of the mean seconds per call of func across states
+
+    Args:
+        func (Callable[..., Any]): closed form function
+        probs (Sequence[float]): serve probs passed first
+        states (Sequence[tuple]): score states passed after the probs
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _measure(min_time: float) -> float:
+        call = _over_states(func, probs, states)
+        return time_per_call(call, min_time) / len(states)
+
+    return _measure
+
+
+def _scalar(func: Callable[..., Any], *args: Any) -> Callable[[float], float]:
+    """Measure of seconds per call of a `tennisim.sim` function with a seeded
+    random source
+
+    Args:
+        func (Callable[..., Any]): simulation function
+        *args (Any): serve probs passed to func
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _measure(min_time: float) -> float:
+        rng = random.Random(SEED)
+        return time_per_call(lambda: func(*args, rng=rng), min_time)
+
+    return _measure
+
+
+def _batch(func: Callable[..., Any], *args: Any) -> Callable[[float], float]:
+    """Measure of seconds per path of a `tennisim.batch` function
+
+    Args:
+        func (Callable[..., Any]): batch simulation function
+        *args (Any): serve probs passed to func
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _measure(min_time: float) -> float:
+        rng = random.Random(SEED)
+
+        def _call() -> None:
+            func(*args, size=BATCH_SIZE, rng=rng.getrandbits(32))
+
+        return time_per_call(_call, min_time) / BATCH_SIZE
+
+    return _measure
+
+
+def _reformat(min_time: float) -> float:
+    """Seconds per call of `reformat_match` with a shared table
+
+    Args:
+        min_time (float): least seconds to spend timing
+
+    Returns:
+        float: seconds per call
+    """
+    data = sim.sim_match(P_A, P_B, rng=random.Random(SEED))
+    table = MatchTable(P_A, P_B)
+    return time_per_call(
+        lambda: reformat_match(data, P_A, P_B, table=table), min_time
+    )
+
+
+def _annotate(min_time: float) -> float:
+    """Seconds per match of `annotate_matches` with a shared table
+
+    Args:
+        min_time (float): least seconds to spend timing
+
+    Returns:
+        float: seconds per match
+    """
+    rng = random.Random(SEED)
+    results = [sim.sim_match(P_A, P_B, rng=rng) for x in range(STORE_SIZE)]
+    table = MatchTable(P_A, P_B)
+    took = time_per_call(
+        lambda: annotate_matches(results, P_A, P_B, table), min_time
+    )
+    return took / STORE_SIZE
+
+
+def _bumped(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps a closed form of (p_a, p_b, *state) to price it as well with
+    each serve prob bumped, the way sensitivities are found without `grad`
+
+    Args:
+        func (Callable[..., Any]): closed form function
+
+    Returns:
+        Callable[..., Any]: function pricing all three
+    """
+
+    def _call(p_a: float, p_b: float, *state: Any) -> None:
+        func(p_a, p_b, *state)
+        func(p_a + BUMP, p_b, *state)
+        func(p_a, p_b + BUMP, *state)
+
+    return _call
+
+
+def _table(grads: bool) -> Callable[[float], float]:
+    """Measure of seconds to price every state of a matchup with its
+    sensitivities, from a `GradTable` or three bumped `MatchTable`
+
+    Args:
+        grads (bool): True to build a `GradTable`
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _call() -> None:
+        if grads:
+            grad.GradTable(P_A, P_B)
+        else:
+            _bumped(MatchTable)(P_A, P_B)
+
+    def _measure(min_time: float) -> float:
+        return time_per_call(_call, min_time)
+
+    return _measure
+
+
+def _trace_bytes(best_of: int) -> Callable[[float], float]:
+    """Measure of the mean bytes held by a full `sim_match` trace
+
+    Args:
+        best_of (int): how many sets the matches are 'best of'
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _measure(min_time: float) -> float:
+        # seeded so the same matches are measured every run
+        rng = random.Random(SEED)
+        sizes = [
+            deep_size(sim.sim_match(P_A, P_B, best_of=best_of, rng=rng))
+            for x in range(100)
+        ]
+        return sum(sizes) / len(sizes)
+
+    return _measure
+
+
+def _disk_size(path: str) -> int:
+    """Bytes on disk of a file or everything under a directory
+
+    Args:
+        path (str): file or directory
+
+    Returns:
+        int: total size in bytes
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(x, y))
+        for x, _, files in os.walk(path)
+        for y in files
+    )
+
+
+def _storage(fmt: str, mode: str) -> Callable[[float], float]:
+    """Measure per point of storing the `reformat_match` rows of simulated
+    matches, either pickled or with `tennisim.columnar`: seconds to write
+    them, seconds to read them back and sum the match probability of every
+    point, or bytes on disk
+
+    Args:
+        fmt (str): 'pickle' or 'columnar'
+        mode (str): 'write', 'read' or 'bytes'
+
+    Returns:
+        Callable[[float], float]: measure for a `Benchmark`
+    """
+
+    def _write(results: List[tuple], table: MatchTable, path: str) -> None:
+        if fmt == "columnar":
+            write_matches(path, results, P_A, P_B, table=table)
+        else:
+            rows = [reformat_match(x, P_A, P_B, table) for x in results]
+            with open(path, "wb") as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _read(path: str) -> float:
+        if fmt == "columnar":
+            return float(MatchStore(path).points["prob"].sum())
+        with open(path, "rb") as f:
+            rows = pickle.load(f)
+        return sum(y["prob"] for x in rows for y in x)
+
+    def _measure(min_time: float) -> float:
+        rng = random.Random(SEED)
+        results = [sim.sim_match(P_A, P_B, rng=rng) for x in range(STORE_SIZE)]
+        table = MatchTable(P_A, P_B)
+        points = sum(len(reformat_match(x, P_A, P_B, table)) for x in results)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "store")
+            _write(results, table, path)
+            if mode == "read":
+                value = time_per_call(lambda: _read(path), min_time)
+            elif mode == "write":
+                value = time_per_call(
+                    lambda: _write(results, table, path), min_time
+                )
+            else:
+                value = _disk_size(path)
+        return value / points
+
+    return _measure
+
+
+BENCHMARKS = [
+    Benchmark("sim_game", "s", _scalar(sim.sim_game, P_A)),
+    Benchmark("sim_tiebreak", "s", _scalar(sim.sim_tiebreak, P_A, P_B)),
+    Benchmark("sim_set", "s", _scalar(sim.sim_set, P_A, P_B)),
+    Benchmark("sim_match", "s", _scalar(sim.sim_match, P_A, P_B)),
+    Benchmark(
+        "sim_match_direct", "s", _scalar(direct.sim_match_direct, P_A, P_B)
+    ),
+    Benchmark("sim_game_batch", "s/path", _batch(batch.sim_game_batch, P_A)),
+    Benchmark(
+        "sim_tiebreak_batch",
+        "s/path",
+        _batch(batch.sim_tiebreak_batch, P_A, P_B),
+    ),
+    Benchmark(
+        "sim_set_batch", "s/path", _batch(batch.sim_set_batch, P_A, P_B)
+    ),
+    Benchmark(
+        "sim_match_batch", "s/path", _batch(batch.sim_match_batch, P_A, P_B)
+    ),
+    Benchmark("theory_game", "s", _latency(theory_game, [P_A], [()])),
+    Benchmark("prob_game", "s", _latency(prob_game, [P_A], GAME_STATES)),
+    Benchmark(
+        "prob_tiebreak", "s", _latency(prob_tiebreak, [P_A, P_B], TB_STATES)
+    ),
+    Benchmark("prob_set", "s", _latency(prob_set, [P_A, P_B], SET_STATES)),
+    Benchmark(
+        "prob_match", "s", _latency(prob_match, [P_A, P_B], MATCH_STATES)
+    ),
+    Benchmark(
+        "grad_prob_match",
+        "s",
+        _latency(grad.prob_match, [P_A, P_B], MATCH_STATES),
+    ),
+    Benchmark(
+        "bump_prob_match",
+        "s",
+        _latency(_bumped(prob_match), [P_A, P_B], MATCH_STATES),
+    ),
+    Benchmark("grad_table", "s", _table(True)),
+    Benchmark("bump_table", "s", _table(False)),
+    Benchmark("reformat_match", "s", _reformat),
+    Benchmark("annotate_matches", "s/match", _annotate),
+    Benchmark("sim_match_trace_bo3", "bytes", _trace_bytes(3)),
+    Benchmark("sim_match_trace_bo5", "bytes", _trace_bytes(5)),
+    Benchmark("store_pickle_write", "s/point", _storage("pickle", "write")),
+    Benchmark("store_pickle_read", "s/point", _storage("pickle", "read")),
+    Benchmark(
+        "store_pickle_bytes", "bytes/point", _storage("pickle", "bytes")
+    ),
+    Benchmark(
+        "store_columnar_write", "s/point", _storage("columnar", "write")
+    ),
+    Benchmark("store_columnar_read", "s/point", _storage("columnar", "read")),
+    Benchmark(
+        "store_columnar_bytes", "bytes/point", _storage("columnar", "bytes")
+    ),
+]
+
+
+def run(
+    names: Optional[Sequence[str]] = None, min_time: float = 0.2
+) -> Dict[str, Dict[str, Any]]:
+    """Runs the benchmarks
+
+    Args:
+        names (Optional[Sequence[str]], optional): names of the benchmarks to
+        run. Defaults to None to run all of them
+        min_time (float, optional): least seconds to spend timing each.
+        Defaults to 0.2.
+
+    Raises:
+        ValueError: if any name is not a known benchmark
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {name: {"value": .., "unit": ..}}
+    """
+    known = {x.name: x for x in BENCHMARKS}
+    if names is None:
+        names = list(known)
+    unknown = [x for x in names if x not in known]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown}")
+    return {
+        x: {"value": known[x].measure(min_time), "unit": known[x].unit}
+        for x in names
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.25,
+) -> List[Regression]:
+    """Finds the benchmarks that got worse than the baseline by more than
+    threshold. Benchmarks missing from either are skipped
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): output of `run`
+        baseline (Dict[str, Dict[str, Any]]): earlier output of `run`
+        threshold (float, optional): largest allowed relative increase e.g.
+        0.25 for 25% slower. Defaults to 0.25.
+
+    Returns:
+        List[Regression]: benchmarks that regressed
+    """
+    regressions = []
+    for name, res in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]["value"]
+        ratio = res["value"] / base
+        if ratio > 1 + threshold:
+            regressions.append(Regression(name, base, res["value"], ratio))
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point, run with `python -m tennisim.bench`
+
+    Args:
+        argv (Optional[Sequence[str]], optional): arguments. Defaults to None
+        to use sys.argv
+
+    Returns:
+        int: exit code, 1 if anything regressed
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmarks of the tennisim hot paths"
+    )
+    parser.add_argument("--output", help="file to save results JSON to")
+    parser.add_argument("--baseline", help="results JSON to compare to")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="largest allowed relative increase, default 0.25",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="least seconds to spend timing each benchmark, default 0.2",
+    )
+    parser.add_argument("names", nargs="*", help="benchmarks to run")
+    args = parser.parse_args(argv)
+
+    results = run(args.names or None, args.min_time)
+    for name, res in results.items():
+        print(f"{name:<24}{res['value']:>14.4g} {res['unit']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for x in regressions:
+            print(
+                f"REGRESSION {x.name}: {x.value:.4g} vs baseline "
+                f"{x.baseline:.4g} ({x.ratio:.2f}x)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+from functools import lru_cache
+from typing import Any
+from typing import List
+from typing import Tuple
+
+# rows of pascal's triangle, grown as larger n are asked for
+_PASCAL: List[List[int]] = [[1]]
+
+# highest power kept in the cached tables per probability, enough for the
+# games either player serves before 5-5 in a set or points before 6-6 in a
+# tiebreak
+TABLE_POWERS = 8
+
+
+def comb_row(n: int) -> List[int]:
+    """Returns row n of pascal's triangle, growing the table if needed
+
+    Args:
+        n (int): row to return
+
+    Raises:
+        ValueError: if n is negative
+
+    Returns:
+        List[int]: combination counts for choosing 0 to n from n
+    """
+    if n < 0:
+        # a negative index would quietly return a row from the end
+        raise ValueError(f"n must be non-negative, got {n}")
+    if n >= len(_PASCAL):
+        while len(_PASCAL) <= n:
+            last = _PASCAL[-1]
+            _PASCAL.append(
+                [1] + [x + y for x, y in zip(last, last[1:])] + [1]
+            )
+    return _PASCAL[n]
+
+
+def comb(n: int, r: int) -> int:
+    """Returns exact combination count for binomial from a table of pascal's
+    triangle that is built once and reused, rather than computing factorials
+    on every call
+
+    Args:
+        n (int): how many options to choose from
+        r (int): how many you want to choose
+
+    Returns:
+        int: count of combinations, 0 if r is outside [0, n]
+    """
+    if r < 0 or r > n:
+        return 0
+    return comb_row(n)[r]
+
+
+def powers(p: Any, n: int) -> List[Any]:
+    """Returns [p ** 0, p ** 1, ..., p ** n]. Works for floats or numpy
+    arrays
+
+    Args:
+        p (Any): probability or array of them
+        n (int): highest power needed
+
+    Returns:
+        List[Any]: powers of p from 0 to n
+    """
+    return [p ** k for k in range(n + 1)]
+
+
+@lru_cache(maxsize=4096)
+def _power_table(p: float) -> Tuple[List[float], List[float]]:
+    """Cached tables of powers of p and 1 - p for a float probability
+
+    Args:
+        p (float): probability
+
+    Returns:
+        Tuple[List[float], List[float]]: powers of p and of 1 - p
+    """
+    return powers(p, TABLE_POWERS), powers(1 - p, TABLE_POWERS)
+
+
+def power_table(
+    p: Any, n: int = TABLE_POWERS
+) -> Tuple[List[Any], List[Any]]:
+    """Tables of powers of p and 1 - p up to at least n. For a float p these
+    are cached, as the same probability is raised to many powers across the
+    outcomes of a set or tiebreak and across repeated calls for a matchup.
+    Arrays of probabilities are computed each time
+
+    Args:
+        p (Any): probability or array of them
+        n (int, optional): highest power needed. Defaults to TABLE_POWERS.
+
+    Returns:
+        Tuple[List[Any], List[Any]]: powers of p and of 1 - p, indexed by
+        the power. Must not be changed as they may be shared
+    """
+    if isinstance(p, float) and n <= TABLE_POWERS:
+        return _power_table(p)
+    return powers(p, n), powers(1 - p, n)
+
+
+def binom_pmf(n: int, k: int, p: Any) -> Any:
+    """Probability of exactly k successes out of n with success prob p
+
+    Args:
+        n (int): count of trials
+        k (int): count of successes
+        p (Any): probability of success or array of them
+
+    Raises:
+        ValueError: if n is negative or k is outside [0, n]
+
+    Returns:
+        Any: binomial probability, float or array as p
+    """
+    if not 0 <= k <= n:
+        raise ValueError(f"k must be within [0, n], got n={n}, k={k}")
+    p_pow, q_pow = power_table(p, n)
+    return comb_row(n)[k] * p_pow[k] * q_pow[n - k]
+
+
+def binom_pmfs(n: int, p: Any) -> List[Any]:
+    """Binomial pmf for every count of successes out of n
+
+    Args:
+        n (int): count of trials
+        p (Any): probability of success or array of them
+
+    Returns:
+        List[Any]: prob of k successes for k from 0 to n
+    """
+    row = comb_row(n)
+    p_pow, q_pow = power_table(p, n)
+    return [row[k] * p_pow[k] * q_pow[n - k] for k in range(n + 1)]
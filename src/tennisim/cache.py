@@ -0,0 +1,282 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from tennisim import game
+from tennisim import match
+from tennisim import set as set_
+from tennisim import tiebreak
+
+# names the closed forms call each other by, looked up in their modules at
+# call time, so a cache can route the calls made while computing a miss
+# through itself
+NESTED = (
+    (match, "prob_game"),
+    (match, "prob_tiebreak"),
+    (match, "prob_set"),
+    (set_, "theory_game"),
+    (set_, "prob_tiebreak"),
+)
+# held while the nested names are routed through a cache
+_ROUTING = threading.Lock()
+
+
+class CacheInfo(NamedTuple):
+    """Counters for one function wrapped by a `ProbCache`
+
+    Attributes:
+        hits (int): calls answered from the cache
+        misses (int): calls that had to be computed
+        evictions (int): entries of this function dropped to make space
+        size (int): entries of this function currently held
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class ProbCache:
+    """Bounded least recently used cache in front of the closed form
+    probability functions. Each function has the same arguments as the one it
+    wraps and all share one store of at most `maxsize` entries, dropping the
+    least recently used entry once full. Nothing is cached unless calls go
+    through an instance so the plain functions are unchanged
+
+    The calls the functions make to each other while computing a miss go
+    through the cache too, e.g. the prob of the set from 0-0 that every
+    `prob_match` needs, by pointing the names they are called by at the
+    cache until the miss is computed. Calls from other threads meanwhile
+    still go to the plain functions
+
+    If `decimals` is given the serve probabilities are rounded to that many
+    places before being looked up and before being computed, so nearby
+    probabilities share an entry and every result is exact for the rounded
+    inputs
+
+    Args:
+        maxsize (int, optional): most entries to hold. Defaults to 4096.
+        decimals (Optional[int], optional): decimal places to round serve
+        probabilities to. Defaults to None for no rounding.
+    """
+
+    def __init__(
+        self, maxsize: int = 4096, decimals: Optional[int] = None
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self._store: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions: Dict[str, int] = {}
+        # True while computing a miss with the nested names routed here
+        self._routed = False
+
+    def _get(
+        self,
+        func: Callable,
+        probs: Sequence[float],
+        states: Sequence[int],
+        **kwargs: Any,
+    ) -> Any:
+        """Returns func(*probs, *states, **kwargs) from the store if held,
+        else computes and stores it
+
+        Args:
+            func (Callable): closed form function to wrap
+            probs (Sequence[float]): serve probabilities
+            states (Sequence[int]): integer score states
+            **kwargs (Any): passed through to func
+
+        Returns:
+            Any: result of func
+        """
+        name = func.__name__
+        if self.decimals is not None:
+            probs = [round(float(x), self.decimals) for x in probs]
+        key = (name, *probs, *states, *kwargs.values())
+        store = self._store
+        if key in store:
+            store.move_to_end(key)
+            self._hits[name] = self._hits.get(name, 0) + 1
+            return store[key]
+
+        self._misses[name] = self._misses.get(name, 0) + 1
+        if self._routed:
+            value = func(*probs, *states, **kwargs)
+        else:
+            value = self._compute(func, (*probs, *states), kwargs)
+        store[key] = value
+        if len(store) > self.maxsize:
+            # drop least recently used
+            old = store.popitem(last=False)[0][0]
+            self._evictions[old] = self._evictions.get(old, 0) + 1
+        return value
+
+    def _compute(
+        self, func: Callable, args: Sequence[Any], kwargs: Dict[str, Any]
+    ) -> Any:
+        """Computes func(*args, **kwargs) with the calls it makes to the
+        other closed forms routed through the cache
+
+        Args:
+            func (Callable): closed form function
+            args (Sequence[Any]): its positional arguments
+            kwargs (Dict[str, Any]): its keyword arguments
+
+        Returns:
+            Any: result of func
+        """
+        owner = threading.get_ident()
+
+        def _route(cached: Callable, plain: Callable) -> Callable:
+            def _call(*args: Any) -> Any:
+                if threading.get_ident() == owner:
+                    return cached(*args)
+                return plain(*args)
+
+            return _call
+
+        with _ROUTING:
+            plain = [getattr(x, y) for x, y in NESTED]
+            self._routed = True
+            try:
+                for (module, name), orig in zip(NESTED, plain):
+                    setattr(module, name, _route(getattr(self, name), orig))
+                return func(*args, **kwargs)
+            finally:
+                for (module, name), orig in zip(NESTED, plain):
+                    setattr(module, name, orig)
+                self._routed = False
+
+    def theory_game(self, p: float) -> float:
+        """Cached `tennisim.game.theory_game`
+
+        Args:
+            p (float): Probability that server wins given point
+
+        Returns:
+            float: Theoretical probability that server wins game
+        """
+        return self._get(game.theory_game, (p,), ())
+
+    def prob_game(self, p: float, x: int, y: int) -> float:
+        """Cached `tennisim.game.prob_game`
+
+        Args:
+            p (float): probability server wins a point
+            x (int): points already won by server
+            y (int): points already won by returner
+
+        Returns:
+            float: probability of winning the game
+        """
+        return self._get(game.prob_game, (p,), (x, y))
+
+    def prob_tiebreak(
+        self, p_a: float, p_b: float, pt_a: int, pt_b: int
+    ) -> Tuple[float, dict]:
+        """Cached `tennisim.tiebreak.prob_tiebreak`. The dict of final score
+        probabilities is shared between calls so should not be changed
+
+        Args:
+            p_a (float): probability that current server wins a point they
+            serve
+            p_b (float): probability that current returner wins a point they
+            serve
+            pt_a (int): points already won by current server
+            pt_b (int): points already won by current returner
+
+        Returns:
+            Tuple[float, dict]: probability that current server will win the
+            tiebreak and probabilities of each final score
+        """
+        return self._get(tiebreak.prob_tiebreak, (p_a, p_b), (pt_a, pt_b))
+
+    def prob_set(self, p_a: float, p_b: float, g_a: int, g_b: int) -> float:
+        """Cached `tennisim.set.prob_set`
+
+        Args:
+            p_a (float): prob current server wins any point on their serve
+            p_b (float): prob current returner wins any point on their serve
+            g_a (int): games already won by current server
+            g_b (int): games already won by current returner
+
+        Returns:
+            float: Probability that current server will win the set
+        """
+        return self._get(set_.prob_set, (p_a, p_b), (g_a, g_b))
+
+    def prob_match(
+        self,
+        p_a: float,
+        p_b: float,
+        st_a: int = 0,
+        st_b: int = 0,
+        g_a: int = 0,
+        g_b: int = 0,
+        pt_a: int = 0,
+        pt_b: int = 0,
+        sets: int = 3,
+    ) -> float:
+        """Cached `tennisim.match.prob_match`
+
+        Args:
+            p_a (float): prob that player 'a' wins a point on their serve
+            p_b (float): prob that player 'b' wins a point on their serve
+            st_a (int, optional): sets already won by 'a'. Defaults to 0.
+            st_b (int, optional): sets already won by 'b'. Defaults to 0.
+            g_a (int, optional): games in curr set won by 'a'. Defaults to 0.
+            g_b (int, optional): games in curr set won by 'b'. Defaults to 0.
+            pt_a (int, optional): points in curr game won by 'a'.
+            Defaults to 0.
+            pt_b (int, optional): points in curr game won by 'b'.
+            Defaults to 0.
+            sets (int, optional): how many sets match is 'best of'.
+            Defaults to 3.
+
+        Returns:
+            float: probability that player 'a' wins the match
+        """
+        return self._get(
+            match.prob_match,
+            (p_a, p_b),
+            (st_a, st_b, g_a, g_b, pt_a, pt_b),
+            sets=sets,
+        )
+
+    def info(self) -> Dict[str, CacheInfo]:
+        """Returns the counters for each function that has been called
+
+        Returns:
+            Dict[str, CacheInfo]: {function name: counters}
+        """
+        sizes: Dict[str, int] = {}
+        for key in self._store:
+            sizes[key[0]] = sizes.get(key[0], 0) + 1
+        names = set(self._hits) | set(self._misses) | set(self._evictions)
+        return {
+            x: CacheInfo(
+                self._hits.get(x, 0),
+                self._misses.get(x, 0),
+                self._evictions.get(x, 0),
+                sizes.get(x, 0),
+            )
+            for x in sorted(names)
+        }
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters"""
+        self._store.clear()
+        self._hits.clear()
+        self._misses.clear()
+        self._evictions.clear()
@@ -0,0 +1,134 @@
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+
+from tennisim import vector
+
+# anything numpy can turn into an array
+ArrayLike = Any
+
+# keep serve probabilities this far inside (0, 1) so the closed forms never
+# divide 0 by 0
+EDGE = 1e-9
+
+
+class Calibration(NamedTuple):
+    """Implied serve probabilities for many matchups with convergence
+    diagnostics, each an array with the shape of the broadcast inputs
+
+    Attributes:
+        p_a (np.ndarray): prob that player 'a' wins a point on their serve
+        p_b (np.ndarray): prob that player 'b' wins a point on their serve
+        converged (np.ndarray): True where the target was hit within tol
+        iterations (np.ndarray): iterations used by each matchup
+        error (np.ndarray): prob_match at (p_a, p_b) less the target
+    """
+
+    p_a: np.ndarray
+    p_b: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+    error: np.ndarray
+
+
+def implied_serve_probs(
+    target: ArrayLike,
+    total: ArrayLike,
+    sets: int = 3,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> Calibration:
+    """Solves for the serve probabilities of many matchups at once so that
+    `prob_match(p_a, p_b)` hits the target probability that 'a' wins, with
+    p_a + p_b fixed at the given total. Along that line prob_match only
+    increases with p_a so each matchup has one root, which is found by
+    false position with the Illinois change to keep the bracket shrinking
+    from both sides. Every iteration is one call of `vector.prob_match` over
+    the matchups that haven't converged yet
+
+    Targets that can't be reached with p_a + p_b = total are left at the
+    nearest end of the line and marked as not converged
+
+    Args:
+        target (ArrayLike): probs that 'a' wins the match e.g. from prices
+        total (ArrayLike): sum of the serve probabilities of both players,
+        e.g. from a total games price or tour averages
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+        tol (float, optional): largest accepted absolute error in the match
+        probability. Defaults to 1e-10.
+        max_iter (int, optional): most iterations before giving up.
+        Defaults to 100.
+
+    Raises:
+        ValueError: if any total is not within (0, 2)
+
+    Returns:
+        Calibration: serve probabilities and convergence diagnostics
+    """
+    arrays = np.broadcast_arrays(
+        np.asarray(target, dtype=float), np.asarray(total, dtype=float)
+    )
+    shape = arrays[0].shape
+    target, total = [x.ravel() for x in arrays]
+    if np.any((total <= 0) | (total >= 2)):
+        raise ValueError("Total serve probability must be within (0, 2)")
+
+    # p_a = half + d and p_b = half - d, with d kept so both are in (0, 1)
+    half = total / 2
+    width = np.minimum(half, 1 - half) - EDGE
+
+    def _f(d: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        probs = vector.prob_match(half[idx] + d, half[idx] - d, sets=sets)
+        return probs - target[idx]
+
+    every = np.arange(target.size)
+    lo = -width
+    hi = width.copy()
+    f_lo = _f(lo, every)
+    f_hi = _f(hi, every)
+
+    # start at whichever end is closest for targets out of reach
+    d = np.where(np.abs(f_lo) <= np.abs(f_hi), lo, hi)
+    err = np.where(np.abs(f_lo) <= np.abs(f_hi), f_lo, f_hi)
+    converged = np.abs(err) <= tol
+    iterations = np.zeros(target.size, dtype=np.int64)
+
+    # bracket of each matchup still going, with f(a) and f(b) either side
+    active = np.flatnonzero(~converged & (f_lo < 0) & (f_hi > 0))
+    a, b = lo[active], hi[active]
+    f_a, f_b = f_lo[active], f_hi[active]
+    for x in range(max_iter):
+        if not active.size:
+            break
+        iterations[active] += 1
+        # secant through the bracket ends, bisect if it can't be trusted
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = b - f_b * (b - a) / (f_b - f_a)
+        inside = np.isfinite(step) & (step > np.minimum(a, b))
+        inside &= step < np.maximum(a, b)
+        c = np.where(inside, step, (a + b) / 2)
+        f_c = _f(c, active)
+        d[active] = c
+        err[active] = f_c
+
+        # keep the end on the other side of the root from c
+        flip = (f_c > 0) != (f_b > 0)
+        a = np.where(flip, b, a)
+        f_a = np.where(flip, f_b, f_a / 2)
+        b, f_b = c, f_c
+
+        # also stop once the bracket is down to rounding
+        done = (np.abs(f_c) <= tol) | (np.abs(b - a) <= 1e-15)
+        converged[active[done]] = np.abs(f_c[done]) <= tol
+        going = ~done
+        active = active[going]
+        a, b, f_a, f_b = a[going], b[going], f_a[going], f_b[going]
+
+    return Calibration(
+        (half + d).reshape(shape),
+        (half - d).reshape(shape),
+        converged.reshape(shape),
+        iterations.reshape(shape),
+        err.reshape(shape),
+    )
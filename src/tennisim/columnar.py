@@ -0,0 +1,363 @@
+import json
+import os
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from tennisim.match import MatchTable
+from tennisim.match import encode_state
+
+# anything numpy can turn into an array
+ArrayLike = Any
+
+# file holding the column names, dtypes and row count of a table
+SCHEMA = "schema.json"
+
+# columns of the per point table, as keys of `reformat_match` rows plus the
+# match each point belongs to
+POINT_COLUMNS = {
+    "match": "int64",
+    "st_a": "int16",
+    "st_b": "int16",
+    "g_a": "int16",
+    "g_b": "int16",
+    "pt_a": "int16",
+    "pt_b": "int16",
+    "p_a": "float64",
+    "p_b": "float64",
+    "pc": "int32",
+    "gc": "int32",
+    "sc": "int16",
+    "prob": "float64",
+    "prob_w": "float64",
+    "prob_l": "float64",
+}
+
+# columns of the per match table, start and stop are the rows of its points
+MATCH_COLUMNS = {
+    "winner": "bool",
+    "sets_a": "int16",
+    "sets_b": "int16",
+    "start": "int64",
+    "stop": "int64",
+}
+
+
+class ColumnWriter:
+    """Writes a table to a directory as one flat binary file per column,
+    appending a chunk of rows at a time so nothing has to be held in memory.
+    The names, dtypes and row count go in schema.json on `close`, after
+    which `read_columns` can memory map the columns
+
+    Args:
+        path (str): directory to write to, created if needed
+        columns (Mapping[str, str]): {column name: numpy dtype}
+    """
+
+    def __init__(self, path: str, columns: Mapping[str, str]) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.dtypes = {x: np.dtype(y) for x, y in columns.items()}
+        self.rows = 0
+        self._files: Dict[str, BinaryIO] = {
+            x: open(os.path.join(path, f"{x}.bin"), "wb") for x in columns
+        }
+
+    def append(self, chunk: Mapping[str, ArrayLike]) -> None:
+        """Appends rows, one array per column all of the same length
+
+        Args:
+            chunk (Mapping[str, ArrayLike]): {column name: values}
+
+        Raises:
+            ValueError: if columns are missing or of different lengths
+        """
+        if set(chunk) != set(self.dtypes):
+            raise ValueError(f"Columns must be {sorted(self.dtypes)}")
+        arrays = {
+            x: np.asarray(chunk[x], dtype=y) for x, y in self.dtypes.items()
+        }
+        lengths = {x.shape[0] for x in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("Columns must all have the same length")
+        for name, values in arrays.items():
+            self._files[name].write(values.tobytes())
+        self.rows += lengths.pop()
+
+    def close(self) -> None:
+        """Closes the column files and writes the schema"""
+        for file in self._files.values():
+            file.close()
+        schema = {
+            "rows": self.rows,
+            "columns": {x: y.str for x, y in self.dtypes.items()},
+        }
+        with open(os.path.join(self.path, SCHEMA), "w") as f:
+            json.dump(schema, f)
+
+    def __enter__(self) -> "ColumnWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def read_columns(path: str) -> Dict[str, np.ndarray]:
+    """Memory maps every column of a table written by `ColumnWriter`. Only
+    the parts that are used are read from disk, so tables far bigger than
+    memory can be scanned
+
+    Args:
+        path (str): directory of the table
+
+    Returns:
+        Dict[str, np.ndarray]: {column name: read only memory mapped array}
+    """
+    with open(os.path.join(path, SCHEMA)) as f:
+        schema = json.load(f)
+    rows = schema["rows"]
+    out: Dict[str, np.ndarray] = {}
+    for name, dtype in schema["columns"].items():
+        file = os.path.join(path, f"{name}.bin")
+        if rows:
+            out[name] = np.memmap(file, dtype=dtype, mode="r", shape=(rows,))
+        else:
+            # can't map an empty file
+            out[name] = np.zeros(0, dtype=dtype)
+    return out
+
+
+def _flatten(
+    results: Sequence[tuple],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flattens FULL `sim_match` results into a row per game and the score
+    before each point. The final score of each match is added on as a game
+    of one point from 0-0 so it gets its row as in `reformat_match`
+
+    Args:
+        results (Sequence[tuple]): FULL results of `sim_match`
+
+    Raises:
+        ValueError: if any result was not recorded with FULL
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: games as rows of match
+        index, st_a, st_b, g_a, g_b and games played before, how many
+        points each game had, and each point's score before it was played
+        from the view of the game's first server
+    """
+    games: List[Tuple[int, ...]] = []
+    sizes: List[int] = []
+    prev: List[Tuple[int, int]] = [(0, 0)]
+    for m, result in enumerate(results):
+        set_prog = result[1]
+        point_progs = result[3]
+        if not isinstance(point_progs[0][0], list):
+            raise ValueError("Results must be recorded with FULL")
+        gc = 0
+        st_a = st_b = 0
+        for i, set_games in enumerate(result[2]):
+            g_a = g_b = 0
+            for game, pts in zip(set_games, point_progs[i]):
+                games.append((m, st_a, st_b, g_a, g_b, gc))
+                sizes.append(len(pts))
+                # scores before each point, the 0-0 for the next game's
+                # first point is added on after this game's
+                prev.extend(pts[:-1])
+                prev.append((0, 0))
+                g_a, g_b = game
+                gc += 1
+            st_a, st_b = set_prog[i]
+        games.append((m, st_a, st_b, 0, 0, gc))
+        sizes.append(1)
+        prev.append((0, 0))
+    # drop the 0-0 added after the last final score
+    return np.array(games), np.array(sizes), np.array(prev[:-1])
+
+
+def annotate_matches(
+    results: Sequence[tuple],
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable] = None,
+    first_id: int = 0,
+) -> Dict[str, np.ndarray]:
+    """Annotates many simulated matches at once into one table with a row per
+    point, the same as `reformat_match` on each match in turn plus a match id
+    column. Python only walks the scores to flatten them; who is serving
+    and the state of every point are then worked out over whole arrays and
+    the match probabilities looked up at once from the flat `MatchTable`
+
+    Args:
+        results (Sequence[tuple]): FULL results of `sim_match`, all between
+        the same players and 'best of' the same sets
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable], optional): table of match probabilities
+        to annotate with. Defaults to None to build one from the first match
+        first_id (int, optional): match id of the first result, the rest
+        follow on in order. Defaults to 0.
+
+    Raises:
+        ValueError: if any result was not recorded with FULL
+
+    Returns:
+        Dict[str, np.ndarray]: {column name: values} with the dtypes of
+        POINT_COLUMNS
+    """
+    if not len(results):
+        return {x: np.zeros(0, dtype=y) for x, y in POINT_COLUMNS.items()}
+    if table is None:
+        # winner has won the majority of sets so infer 'best of' from that
+        sets = 2 * max(results[0][1][-1]) - 1
+        table = MatchTable(p_a, p_b, sets=sets)
+
+    games, sizes, prev = _flatten(results)
+    # the final score of each match is its last game
+    final = np.zeros(len(sizes), dtype=bool)
+    final[np.flatnonzero(np.diff(games[:, 0], append=-1))] = True
+    match, st_a, st_b, g_a, g_b, gc = np.repeat(games, sizes, axis=0).T
+    final = np.repeat(final, sizes)
+
+    # scores are kept from the view of the game's first server, and 'a'
+    # serves first in even games
+    even = gc % 2 == 0
+    pt_a = np.where(even, prev[:, 0], prev[:, 1])
+    pt_b = np.where(even, prev[:, 1], prev[:, 0])
+    # in a tiebreak serve changes after the first point then every 2
+    tiebreak = (g_a == 6) & (g_b == 6)
+    swap = (pt_a + pt_b) % 4 == 1
+    a_serving = np.where(tiebreak, even != swap, even) | final
+
+    # points played in the match before each one
+    starts = np.flatnonzero(np.diff(match, prepend=-1))
+    counts = np.diff(starts, append=len(match))
+    pc = np.arange(len(match)) - np.repeat(starts, counts)
+
+    probs = table.probs
+    state = (st_a, st_b, g_a, g_b)
+    prob = probs[encode_state(*state, pt_a, pt_b, a_serving, table.sets)]
+    prob_w = probs[
+        encode_state(*state, pt_a + 1, pt_b, a_serving, table.sets)
+    ]
+    prob_l = probs[
+        encode_state(*state, pt_a, pt_b + 1, a_serving, table.sets)
+    ]
+
+    cols = {
+        "match": match + first_id,
+        "st_a": st_a,
+        "st_b": st_b,
+        "g_a": g_a,
+        "g_b": g_b,
+        "pt_a": pt_a,
+        "pt_b": pt_b,
+        "p_a": np.full(len(match), p_a),
+        "p_b": np.full(len(match), p_b),
+        "pc": pc,
+        "gc": gc,
+        "sc": st_a + st_b,
+        "prob": prob,
+        "prob_w": np.where(final, prob, prob_w),
+        "prob_l": np.where(final, prob, prob_l),
+    }
+    return {x: cols[x].astype(y) for x, y in POINT_COLUMNS.items()}
+
+
+def write_matches(
+    path: str,
+    results: Iterable[tuple],
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable] = None,
+    chunk: int = 1000,
+) -> int:
+    """Writes simulated matches to path as two columnar tables: `points`
+    with a row per point as from `reformat_match`, and `matches` with a row
+    per match whose start and stop give the rows of its points. Matches are
+    annotated and written a chunk at a time with `annotate_matches` as they
+    come, so results can be a generator
+
+    Args:
+        path (str): directory to write to
+        results (Iterable[tuple]): FULL results of `sim_match`
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable], optional): table of match probabilities
+        to annotate with. Defaults to None to build one from the first match
+        chunk (int, optional): matches to gather before writing.
+        Defaults to 1000.
+
+    Returns:
+        int: count of matches written
+    """
+    points = ColumnWriter(os.path.join(path, "points"), POINT_COLUMNS)
+    matches = ColumnWriter(os.path.join(path, "matches"), MATCH_COLUMNS)
+    pending: List[tuple] = []
+
+    def _flush() -> None:
+        nonlocal table
+        if not pending:
+            return
+        if table is None:
+            sets = 2 * max(pending[0][1][-1]) - 1
+            table = MatchTable(p_a, p_b, sets=sets)
+        cols = annotate_matches(pending, p_a, p_b, table, matches.rows)
+        sizes = np.bincount(cols["match"] - matches.rows)
+        stop = points.rows + np.cumsum(sizes)
+        points.append(cols)
+        matches.append(
+            {
+                "winner": [x[0] for x in pending],
+                "sets_a": [x[1][-1][0] for x in pending],
+                "sets_b": [x[1][-1][1] for x in pending],
+                "start": stop - sizes,
+                "stop": stop,
+            }
+        )
+        pending.clear()
+
+    with points, matches:
+        for result in results:
+            pending.append(result)
+            if len(pending) >= chunk:
+                _flush()
+        _flush()
+    return matches.rows
+
+
+class MatchStore:
+    """Reads matches written by `write_matches`, memory mapping every column
+    so analyses can scan the points of far more matches than fit in memory
+
+    Args:
+        path (str): directory written by `write_matches`
+    """
+
+    def __init__(self, path: str) -> None:
+        self.points = read_columns(os.path.join(path, "points"))
+        self.matches = read_columns(os.path.join(path, "matches"))
+
+    def __len__(self) -> int:
+        return len(self.matches["start"])
+
+    def match_points(self, i: int) -> Dict[str, np.ndarray]:
+        """Returns the points of one match
+
+        Args:
+            i (int): index of the match
+
+        Returns:
+            Dict[str, np.ndarray]: {column name: values for its points}
+        """
+        start = int(self.matches["start"][i])
+        stop = int(self.matches["stop"][i])
+        return {x: y[start:stop] for x, y in self.points.items()}
@@ -0,0 +1,489 @@
+from collections import defaultdict
+from typing import DefaultDict
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from tennisim.game import prob_game
+from tennisim.tiebreak import prob_tiebreak
+
+Score = Tuple[int, int]
+Scoreline = Tuple[Score, ...]
+
+
+def set_over(g_a: int, g_b: int) -> bool:
+    """Returns True if a set with this games score has finished
+
+    Args:
+        g_a (int): games won by 'a'
+        g_b (int): games won by 'b'
+
+    Returns:
+        bool: True if someone has won 6 and is 2 clear, or won 7
+    """
+    return max(g_a, g_b) == 7 or (max(g_a, g_b) == 6 and abs(g_a - g_b) >= 2)
+
+
+def tb_first_serving(pt_a: int, pt_b: int, a_serving: bool) -> bool:
+    """Given who serves the next point of a tiebreak, returns whether 'a'
+    served the first point of it
+
+    Args:
+        pt_a (int): points in tiebreak won by 'a'
+        pt_b (int): points in tiebreak won by 'b'
+        a_serving (bool): True if 'a' serves the next point
+
+    Returns:
+        bool: True if 'a' served the first point of the tiebreak
+    """
+    # first server serves point 0, then 2 each starting with the other
+    first_serves_next = ((pt_a + pt_b + 1) // 2) % 2 == 0
+    return a_serving == first_serves_next
+
+
+def set_score_dist(
+    p_a: float,
+    p_b: float,
+    g_a: int = 0,
+    g_b: int = 0,
+    pt_a: int = 0,
+    pt_b: int = 0,
+    a_serving: bool = True,
+) -> Dict[Score, float]:
+    """Exact distribution of the final games score of a set from a given
+    state, found by stepping through the set one game at a time and carrying
+    the probability of each games score
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        g_a (int, optional): games in set won by 'a'. Defaults to 0.
+        g_b (int, optional): games in set won by 'b'. Defaults to 0.
+        pt_a (int, optional): points in curr game (or tiebreak if at 6-6) won
+        by 'a'. Defaults to 0.
+        pt_b (int, optional): points in curr game (or tiebreak if at 6-6) won
+        by 'b'. Defaults to 0.
+        a_serving (bool, optional): True if 'a' serves the current game (or
+        next point of the tiebreak). Defaults to True.
+
+    Returns:
+        Dict[Score, float]: {(g_a, g_b) final set score: probab}
+    """
+    if set_over(g_a, g_b):
+        return {(g_a, g_b): 1.0}
+
+    final: DefaultDict[Score, float] = defaultdict(float)
+    # every state in a step has played the same count of games
+    # so the same player serves the next game in all of them
+    states: Dict[Score, float] = {(g_a, g_b): 1.0}
+    first = True
+    while states:
+        new: DefaultDict[Score, float] = defaultdict(float)
+        # only the first game (or tiebreak) can already have points played
+        pts = (pt_a, pt_b) if first else (0, 0)
+        for (x, y), prob in states.items():
+            if x == 6 and y == 6:
+                # tiebreak decides the set
+                p_tb = _prob_tb_a(p_a, p_b, pts[0], pts[1], a_serving)
+                for score, p in (((7, 6), p_tb), ((6, 7), 1 - p_tb)):
+                    if p != 0:
+                        final[score] += prob * p
+                continue
+
+            # prob 'a' wins this game
+            if a_serving:
+                p_game = prob_game(p_a, pts[0], pts[1])
+            else:
+                p_game = 1 - prob_game(p_b, pts[1], pts[0])
+
+            for score, p in (((x + 1, y), p_game), ((x, y + 1), 1 - p_game)):
+                if p == 0:
+                    # impossible so don't carry it
+                    continue
+                if set_over(*score):
+                    final[score] += prob * p
+                else:
+                    new[score] += prob * p
+
+        states = new
+        a_serving = not a_serving
+        first = False
+
+    return dict(final)
+
+
+def _prob_tb_a(
+    p_a: float, p_b: float, pt_a: int, pt_b: int, a_serving: bool
+) -> float:
+    """Returns prob that 'a' wins a tiebreak given who serves the next point
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        pt_a (int): points in tiebreak won by 'a'
+        pt_b (int): points in tiebreak won by 'b'
+        a_serving (bool): True if 'a' serves the next point
+
+    Returns:
+        float: probability that 'a' wins the tiebreak
+    """
+    if a_serving:
+        return prob_tiebreak(p_a, p_b, pt_a, pt_b)[0]
+    return 1 - prob_tiebreak(p_b, p_a, pt_b, pt_a)[0]
+
+
+def match_score_dist(
+    p_a: float,
+    p_b: float,
+    best_of: int = 3,
+    played: Sequence[Score] = (),
+    g_a: int = 0,
+    g_b: int = 0,
+    pt_a: int = 0,
+    pt_b: int = 0,
+    a_serving: bool = True,
+) -> Dict[Scoreline, float]:
+    """Exact distribution of the final scoreline of a match, including the
+    games score of every set, from a given state. Each set's distribution of
+    games scores is worked out exactly for either player serving first and
+    then chained together set by set, tracking who serves first in each
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        best_of (int, optional): how many sets to play best of. Defaults to 3.
+        played (Sequence[Score], optional): games scores of sets already
+        finished e.g. [(6, 4)]. Defaults to () for none.
+        g_a (int, optional): games in curr set won by 'a'. Defaults to 0.
+        g_b (int, optional): games in curr set won by 'b'. Defaults to 0.
+        pt_a (int, optional): points in curr game (or tiebreak if at 6-6) won
+        by 'a'. Defaults to 0.
+        pt_b (int, optional): points in curr game (or tiebreak if at 6-6) won
+        by 'b'. Defaults to 0.
+        a_serving (bool, optional): True if 'a' serves the current game (or
+        next point of the tiebreak). Defaults to True.
+
+    Returns:
+        Dict[Scoreline, float]: {((6, 4), (3, 6), (7, 6)): probab, ...}
+    """
+    first_to = (best_of // 2) + 1
+
+    # find who served first in the current set
+    if g_a == 6 and g_b == 6:
+        # 12 games played so set's first server serves first in tiebreak
+        starter = tb_first_serving(pt_a, pt_b, a_serving)
+    else:
+        starter = a_serving == ((g_a + g_b) % 2 == 0)
+
+    # dist of each fresh set for 'a' or 'b' serving first
+    fresh = {
+        True: set_score_dist(p_a, p_b, a_serving=True),
+        False: set_score_dist(p_a, p_b, a_serving=False),
+    }
+
+    start: Scoreline = tuple((x, y) for x, y in played)
+    paths: Dict[Tuple[Scoreline, bool], float] = {(start, starter): 1.0}
+    # current set may be part way through
+    current: Optional[Dict[Score, float]] = set_score_dist(
+        p_a, p_b, g_a, g_b, pt_a, pt_b, a_serving
+    )
+    final: DefaultDict[Scoreline, float] = defaultdict(float)
+    while paths:
+        new: DefaultDict[Tuple[Scoreline, bool], float] = defaultdict(float)
+        for (line, starter), prob in paths.items():
+            won_a = sum(x > y for x, y in line)
+            if won_a == first_to or len(line) - won_a == first_to:
+                final[line] += prob
+                continue
+            dist = current if current is not None else fresh[starter]
+            for score, p in dist.items():
+                # odd number of games means other player starts next set
+                nxt = starter != (sum(score) % 2 != 0)
+                new[(line + (score,), nxt)] += prob * p
+        paths = new
+        current = None
+
+    return dict(final)
+
+
+def _trim(pmf: np.ndarray, tol: float) -> np.ndarray:
+    """Drops the tail of a pmf once the mass left in it is below tol
+
+    Args:
+        pmf (np.ndarray): probability of each count
+        tol (float): mass that can be dropped from the tail
+
+    Returns:
+        np.ndarray: pmf without its negligible tail
+    """
+    tail = np.cumsum(pmf[::-1])[::-1]
+    keep = np.flatnonzero(tail > tol)
+    return pmf[: keep[-1] + 1] if keep.size else pmf[:1] * 0
+
+
+def _add(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Adds two pmfs of possibly different lengths
+
+    Args:
+        x (np.ndarray): first pmf
+        y (np.ndarray): second pmf
+
+    Returns:
+        np.ndarray: elementwise sum padded to the longer length
+    """
+    if x.size < y.size:
+        x, y = y, x
+    out = x.copy()
+    out[: y.size] += y
+    return out
+
+
+def game_length_dist(
+    p: float, tol: float = 1e-12
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact distribution of the points played in a game joint with who won
+    it. Uses the same paths as `theory_game` - winning to 0, 15 or 30 or
+    going to deuce and then winning 2 points in a row
+
+    Args:
+        p (float): probability server wins a point
+        tol (float, optional): mass left in the tail of long deuce games
+        before stopping. Defaults to 1e-12.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: arrays indexed by points played of the
+        prob the server wins and the prob the returner wins in that many points
+    """
+    q = 1 - p
+    hold = [0.0] * 7
+    brk = [0.0] * 7
+    # win to 0, 15 or 30
+    for y, c in ((0, 1), (1, 4), (2, 10)):
+        hold[4 + y] = c * p ** 4 * q ** y
+        brk[4 + y] = c * q ** 4 * p ** y
+    # reach deuce then every 2 points either someone wins both or back
+    # to deuce
+    mass = 20 * p ** 3 * q ** 3
+    # p * q is 0 only when p is 0 or 1, when deuce is never reached
+    while mass > tol and p * q > 0:
+        hold += [0.0, mass * p ** 2]
+        brk += [0.0, mass * q ** 2]
+        mass *= 2 * p * q
+    return np.array(hold), np.array(brk)
+
+
+def tiebreak_length_dist(
+    p_a: float, p_b: float, tol: float = 1e-12
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact distribution of the points played in a tiebreak joint with who
+    won it, where 'a' serves the first point
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        tol (float, optional): mass left in the tail of long tiebreaks
+        before stopping. Defaults to 1e-12.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: arrays indexed by points played of the
+        prob 'a' wins and the prob 'b' wins in that many points
+    """
+    win = [0.0] * 13
+    lose = [0.0] * 13
+    states: Dict[Score, float] = {(0, 0): 1.0}
+    # play up to 6-6, the tiebreak can be won along the way
+    for k in range(12):
+        # first server serves point 0, then 2 each starting with the other
+        p_pt = p_a if ((k + 1) // 2) % 2 == 0 else 1 - p_b
+        new: DefaultDict[Score, float] = defaultdict(float)
+        for (x, y), prob in states.items():
+            if x + 1 == 7:
+                win[k + 1] += prob * p_pt
+            else:
+                new[(x + 1, y)] += prob * p_pt
+            if y + 1 == 7:
+                lose[k + 1] += prob * (1 - p_pt)
+            else:
+                new[(x, y + 1)] += prob * (1 - p_pt)
+        states = new
+
+    # from 6-6 each serves one of every 2 points until someone wins both
+    mass = states.get((6, 6), 0.0)
+    w = p_a * (1 - p_b)
+    l_ = (1 - p_a) * p_b
+    while mass > tol and w + l_ > 0:
+        win += [0.0, mass * w]
+        lose += [0.0, mass * l_]
+        mass *= 1 - w - l_
+    return np.array(win), np.array(lose)
+
+
+def set_length_dist(
+    p_a: float, p_b: float, a_serving: bool = True, tol: float = 1e-12
+) -> Dict[Score, np.ndarray]:
+    """Exact distribution of the points played in a set for each final games
+    score. Each games score carries the distribution of points played to get
+    there, which is convolved with the length of the next game
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        a_serving (bool, optional): True if 'a' serves first in the set.
+        Defaults to True.
+        tol (float, optional): mass that can be dropped from the tail of each
+        distribution. Defaults to 1e-12.
+
+    Returns:
+        Dict[Score, np.ndarray]: {(g_a, g_b): array indexed by points played}
+        where each array sums to the probability of that final score
+    """
+    hold_a, brk_a = game_length_dist(p_a, tol)
+    hold_b, brk_b = game_length_dist(p_b, tol)
+    # prob 'a' wins and loses a game in n points for each server
+    game_pmfs = {True: (hold_a, brk_a), False: (brk_b, hold_b)}
+    tb_pmfs = {
+        True: tiebreak_length_dist(p_a, p_b, tol),
+        False: tiebreak_length_dist(p_b, p_a, tol)[::-1],
+    }
+
+    final: Dict[Score, np.ndarray] = {}
+    states: Dict[Score, np.ndarray] = {(0, 0): np.ones(1)}
+    while states:
+        new: Dict[Score, np.ndarray] = {}
+        for (x, y), pmf in states.items():
+            if x == 6 and y == 6:
+                # 12 games played so set's first server serves first
+                outcomes = tb_pmfs[a_serving]
+                scores = ((7, 6), (6, 7))
+            else:
+                outcomes = game_pmfs[a_serving]
+                scores = ((x + 1, y), (x, y + 1))
+            for score, g_pmf in zip(scores, outcomes):
+                nxt = _trim(np.convolve(pmf, g_pmf), tol)
+                store = final if set_over(*score) else new
+                if score in store:
+                    nxt = _add(store[score], nxt)
+                store[score] = nxt
+        states = new
+        a_serving = not a_serving
+
+    return {k: v for k, v in final.items() if v.sum() > 0}
+
+
+def _set_key(starter: bool, g_a: int, g_b: int) -> Tuple[bool, bool, bool]:
+    """Summarises a set result by what matters for the rest of the match
+
+    Args:
+        starter (bool): True if 'a' served first in the set
+        g_a (int): games won by 'a' in the set
+        g_b (int): games won by 'b' in the set
+
+    Returns:
+        Tuple[bool, bool, bool]: 'a' served first, 'a' won the set and 'a'
+        serves first in the next set
+    """
+    # server swaps for the next set if an odd number of games were played
+    return starter, g_a > g_b, starter != ((g_a + g_b) % 2 == 1)
+
+
+class MatchLength(NamedTuple):
+    """Exact distributions of the length of a match
+
+    Attributes:
+        points (np.ndarray): prob the match lasts n points, indexed by n
+        games (np.ndarray): prob the match lasts n games, indexed by n, with
+        a tiebreak counted as a game
+        sets (np.ndarray): prob the match lasts n sets, indexed by n
+        set_games (np.ndarray): prob that set i is played and lasts n games,
+        indexed by [i, n]
+    """
+
+    points: np.ndarray
+    games: np.ndarray
+    sets: np.ndarray
+    set_games: np.ndarray
+
+
+def match_length_dist(
+    p_a: float,
+    p_b: float,
+    best_of: int = 3,
+    a_first: bool = True,
+    tol: float = 1e-12,
+) -> MatchLength:
+    """Exact distributions of the points, games and sets played in a match.
+    The per set distributions for each player serving first are convolved
+    together set by set, tracking the sets score and who serves first next
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        best_of (int, optional): how many sets to play best of. Defaults to 3.
+        a_first (bool, optional): True if 'a' serves first in the match.
+        Defaults to True.
+        tol (float, optional): mass that can be dropped from the tail of each
+        distribution. Defaults to 1e-12.
+
+    Returns:
+        MatchLength: distributions of points, games, sets and games per set
+    """
+    first_to = (best_of // 2) + 1
+    set_dists = {
+        x: set_length_dist(p_a, p_b, a_serving=x, tol=tol)
+        for x in (True, False)
+    }
+
+    # group set outcomes by who won it and who serves first in the next one
+    grouped: Dict[Tuple[bool, bool, bool], np.ndarray] = {}
+    for starter, dist in set_dists.items():
+        for (x, y), pmf in dist.items():
+            key = _set_key(starter, x, y)
+            grouped[key] = _add(grouped[key], pmf) if key in grouped else pmf
+
+    points = np.zeros(1)
+    games = np.zeros(1)
+    sets = np.zeros(best_of + 1)
+    set_games = np.zeros((best_of, 14))
+
+    # state is (sets won by 'a', sets won by 'b', 'a' serves first)
+    # holding dists of points and games played so far
+    states: Dict[Tuple[int, int, bool], List[np.ndarray]] = {
+        (0, 0, a_first): [np.ones(1), np.ones(1)]
+    }
+    for i in range(best_of):
+        new: Dict[Tuple[int, int, bool], List[np.ndarray]] = {}
+        for (st_a, st_b, starter), (pts, gms) in states.items():
+            mass = pts.sum()
+            n_gms: Dict[Tuple[bool, bool, bool], np.ndarray] = {}
+            # games only depend on the set score not the points
+            for (x, y), pmf in set_dists[starter].items():
+                set_games[i, x + y] += mass * pmf.sum()
+                key = _set_key(starter, x, y)
+                if key not in n_gms:
+                    n_gms[key] = np.zeros(gms.size + 13)
+                n_gms[key][x + y : x + y + gms.size] += gms * pmf.sum()
+            for key, s_gms in n_gms.items():
+                _, a_won, nxt = key
+                n_pts = _trim(np.convolve(pts, grouped[key]), tol)
+                state = (st_a + a_won, st_b + (not a_won), nxt)
+                if state in new:
+                    n_pts = _add(new[state][0], n_pts)
+                    s_gms = _add(new[state][1], s_gms)
+                new[state] = [n_pts, s_gms]
+
+        states = {}
+        for (st_a, st_b, nxt), (pts, gms) in new.items():
+            if st_a == first_to or st_b == first_to:
+                # match over so add to totals
+                points = _add(points, pts)
+                games = _add(games, gms)
+                sets[i + 1] += pts.sum()
+            else:
+                states[(st_a, st_b, nxt)] = [pts, gms]
+
+    return MatchLength(points, _trim(games, 0.0), sets, set_games)
@@ -1,4 +1,5 @@
-from tennisim.utils import comb
+from tennisim.binom import binom_pmf
+from tennisim.binom import comb
 
 
 def theory_game(p: float) -> float:
@@ -35,7 +36,7 @@ def prob_game_outcome(p: float, x: int, y: int) -> float:
     Returns:
         float: probability that server wins x points, returner y points
     """
-    return comb(x + y, x) * p ** x * (1 - p) ** y
+    return binom_pmf(x + y, x, p)
 
 
 def prob_win_deuce(p: float) -> float:
@@ -116,8 +117,8 @@ def prob_game(p: float, x: int, y: int) -> float:
         prob += p_deuce * p_win_deuce
     # else if in deuce but x at 'advantage'
     elif x == 4 and y == 3:
-        # then just need to win one more point to win
-        prob += p
+        # then win the next point, or lose it and win from deuce
+        prob += p + (1 - p) * prob_win_deuce(p)
     # else if in deuce but y at 'advantage'
     elif x == 3 and y == 4:
         # then need to win next point and then deuce
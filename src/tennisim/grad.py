@@ -0,0 +1,516 @@
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import NamedTuple
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from tennisim.match import TABLE_GAMES
+from tennisim.match import TABLE_POINTS
+from tennisim.match import encode_state
+
+# a probability along with its derivatives with respect to p_a and p_b, as
+# (value, d_a, d_b) of floats or arrays, or an array of them stacked
+Jet = Union[Sequence[Any], np.ndarray]
+# jets indexed [x][y] by the score
+Grid = List[List[Jet]]
+Score = Tuple[int, int]
+
+ONE = (1.0, 0.0, 0.0)
+ZERO = (0.0, 0.0, 0.0)
+
+
+def _backwards(size: int, live: Callable[[int, int], bool]) -> List[Score]:
+    """Scores (x, y) up to size - 1 each where play goes on, latest first so
+    that each comes after both the scores that follow it
+
+    Args:
+        size (int): length of the x and y axes
+        live (Callable[[int, int], bool]): True for scores where play goes
+        on point by point or game by game
+
+    Returns:
+        List[Score]: scores by total descending
+    """
+    return [
+        (x, total - x)
+        for total in range(2 * size - 2, -1, -1)
+        for x in range(max(total - size + 1, 0), min(total, size - 1) + 1)
+        if live(x, total - x)
+    ]
+
+
+# scores worked back through a point or game at a time, up to deuce in a
+# game, up to 6-6 bar 6-5 and 5-6 in a tiebreak, and up to 6-6 in a set
+GAME_ORDER = _backwards(4, lambda x, y: x + y < 6)
+TIEBREAK_ORDER = _backwards(7, lambda x, y: x + y < 11 or x < 5 or y < 5)
+SET_ORDER = _backwards(7, lambda x, y: max(x, y) < 6 or x + y == 11)
+
+
+class Grad(NamedTuple):
+    """Probability with its derivatives with respect to the serve probs
+
+    Attributes:
+        value (Any): probability
+        d_a (Any): derivative with respect to p_a
+        d_b (Any): derivative with respect to p_b
+    """
+
+    value: Any
+    d_a: Any
+    d_b: Any
+
+
+def _flip(u: Jet) -> Jet:
+    """1 - u, for the other player's view"""
+    return (1 - u[0], -u[1], -u[2])
+
+
+def _mul(u: Jet, v: Jet) -> Jet:
+    """u * v by the product rule"""
+    return (u[0] * v[0], u[0] * v[1] + v[0] * u[1], u[0] * v[2] + v[0] * u[2])
+
+
+def _mix(p: Jet, w: Jet, l_: Jet) -> Jet:
+    """p * w + (1 - p) * l_, the prob of winning from a state given the prob
+    p of winning the next point, game or set and the probs of winning from
+    the states after it is won and lost. Every closed form obeys this step
+
+    Args:
+        p (Jet): prob of winning the next point, game or set
+        w (Jet): prob of winning from the state after winning it
+        l_ (Jet): prob of winning from the state after losing it
+
+    Returns:
+        Jet: prob of winning from the state
+    """
+    p_0, p_1, p_2 = p
+    w_0, w_1, w_2 = w
+    l_0, l_1, l_2 = l_
+    q = 1 - p_0
+    gap = w_0 - l_0
+    return (
+        p_0 * w_0 + q * l_0,
+        p_1 * gap + p_0 * w_1 + q * l_1,
+        p_2 * gap + p_0 * w_2 + q * l_2,
+    )
+
+
+def _mix_other(p: Jet, w: Jet, l_: Jet) -> Jet:
+    """`_mix` where w and l_ are the probs the other player wins from the
+    states after, as when they serve next and the scores are kept from the
+    server's view, so the probs of winning from them are 1 - w and 1 - l_
+
+    Args:
+        p (Jet): prob of winning the next point or game
+        w (Jet): prob the other player wins from the state after winning it
+        l_ (Jet): prob the other player wins from the state after losing it
+
+    Returns:
+        Jet: prob of winning from the state
+    """
+    p_0, p_1, p_2 = p
+    w_0, w_1, w_2 = w
+    l_0, l_1, l_2 = l_
+    q = 1 - p_0
+    gap = l_0 - w_0
+    return (
+        1 - p_0 * w_0 - q * l_0,
+        p_1 * gap - p_0 * w_1 - q * l_1,
+        p_2 * gap - p_0 * w_2 - q * l_2,
+    )
+
+
+def _race(w: Jet, l_: Jet) -> Jet:
+    """w / (w + l_), the prob of winning from level at deuce or 6-6 in a
+    tiebreak, where w and l_ are the probs of winning and losing the next
+    two points
+
+    Args:
+        w (Jet): prob of winning the next two points
+        l_ (Jet): prob of losing the next two points
+
+    Returns:
+        Jet: prob of winning from level
+    """
+    total = w[0] + l_[0]
+    square = total * total
+    return (
+        w[0] / total,
+        (w[1] * l_[0] - w[0] * l_[1]) / square,
+        (w[2] * l_[0] - w[0] * l_[2]) / square,
+    )
+
+
+def _game_grid(p: Jet) -> Grid:
+    """`tennisim.game.prob_game` from every points score up to 5-5, worked
+    back from the end of the game one point at a time
+
+    Args:
+        p (Jet): prob server wins a point
+
+    Returns:
+        Grid: probs indexed [server points][returner points]
+    """
+    q = _flip(p)
+    deuce = _race(_mul(p, p), _mul(q, q))
+    # scores past the end are 0 as `prob_game` has them, whether the server
+    # lost or the score is never reached like 4-4
+    grid: Grid = [[ZERO] * 6 for x in range(6)]
+    grid[4][:3] = [ONE] * 3
+    grid[5] = [ONE] * 6
+    grid[3][3] = deuce
+    grid[4][3] = _mix(p, ONE, deuce)
+    grid[3][4] = _mix(p, deuce, ZERO)
+    for x, y in GAME_ORDER:
+        grid[x][y] = _mix(p, grid[x + 1][y], grid[x][y + 1])
+    return grid
+
+
+def _tiebreak_grids(p_a: Jet, p_b: Jet) -> Tuple[Grid, Grid]:
+    """`tennisim.tiebreak.prob_tiebreak` from every points score up to 7-7
+    for both players as the server of the next point, worked back from the
+    end of the tiebreak one point at a time. Serve changes after every odd
+    count of points played
+
+    Args:
+        p_a (Jet): prob that player 'a' wins a point on their serve
+        p_b (Jet): prob that player 'b' wins a point on their serve
+
+    Returns:
+        Tuple[Grid, Grid]: probs the server of the next point wins indexed
+        [server points][returner points] with 'a' serving and with 'b'
+        serving
+    """
+    g_a: Grid = [[ZERO] * TABLE_POINTS for x in range(TABLE_POINTS)]
+    g_b: Grid = [[ZERO] * TABLE_POINTS for x in range(TABLE_POINTS)]
+    for grid, p, o in ((g_a, p_a, p_b), (g_b, p_b, p_a)):
+        grid[7][:6] = [ONE] * 6
+        # within a point of level from 6-6 on
+        level = _race(_mul(p, _flip(o)), _mul(_flip(p), o))
+        grid[6][6] = grid[7][7] = level
+        grid[6][5] = grid[7][6] = _mix(p, ONE, level)
+        grid[5][6] = grid[6][7] = _mix(p, level, ZERO)
+    for x, y in TIEBREAK_ORDER:
+        if (x + y) % 2:
+            # serves the next point too
+            g_a[x][y] = _mix(p_a, g_a[x + 1][y], g_a[x][y + 1])
+            g_b[x][y] = _mix(p_b, g_b[x + 1][y], g_b[x][y + 1])
+        else:
+            # the other serves next
+            g_a[x][y] = _mix_other(p_a, g_b[y][x + 1], g_b[y + 1][x])
+            g_b[x][y] = _mix_other(p_b, g_a[y][x + 1], g_a[y + 1][x])
+    return g_a, g_b
+
+
+def _set_grids(
+    s_a: Jet, s_b: Jet, tb_a: Jet, tb_b: Jet
+) -> Tuple[Grid, Grid]:
+    """`tennisim.set.prob_set` from every games score for both players as
+    server, worked back from the end of the set one game at a time as the
+    server of the next game is the returner of this one
+
+    Args:
+        s_a (Jet): prob 'a' holds serve
+        s_b (Jet): prob 'b' holds serve
+        tb_a (Jet): prob 'a' wins a tiebreak they serve first
+        tb_b (Jet): prob 'b' wins a tiebreak they serve first
+
+    Returns:
+        Tuple[Grid, Grid]: probs the server wins the set indexed [server
+        games][returner games] with 'a' serving and with 'b' serving
+    """
+    g_a: Grid = [[ZERO] * TABLE_GAMES for x in range(TABLE_GAMES)]
+    g_b: Grid = [[ZERO] * TABLE_GAMES for x in range(TABLE_GAMES)]
+    for grid, tb in ((g_a, tb_a), (g_b, tb_b)):
+        grid[7] = [ONE] * TABLE_GAMES
+        grid[6][:5] = [ONE] * 5
+        grid[6][6] = tb
+    for x, y in SET_ORDER:
+        g_a[x][y] = _mix_other(s_a, g_b[y][x + 1], g_b[y + 1][x])
+        g_b[x][y] = _mix_other(s_b, g_a[y][x + 1], g_a[y + 1][x])
+    return g_a, g_b
+
+
+def _match_grid(p_set: Jet, sets: int) -> Grid:
+    """`tennisim.match.prob_match_outcome` from every sets score
+
+    Args:
+        p_set (Jet): prob 'a' wins a set
+        sets (int): how many sets match is 'best of'
+
+    Returns:
+        Grid: probs 'a' wins the match indexed [sets 'a'][sets 'b']
+    """
+    win_m = sets // 2 + 1
+    grid: Grid = [[ZERO] * (win_m + 1) for x in range(win_m + 1)]
+    for x in range(win_m, -1, -1):
+        for y in range(win_m, -1, -1):
+            if x == win_m:
+                grid[x][y] = ONE
+            elif y != win_m:
+                grid[x][y] = _mix(p_set, grid[x + 1][y], grid[x][y + 1])
+    return grid
+
+
+def _grids(
+    p_a: Any, p_b: Any
+) -> Tuple[Tuple[Grid, Grid], Tuple[Grid, Grid], Tuple[Grid, Grid]]:
+    """Game, tiebreak and set grids with 'a' serving then with 'b' serving
+
+    Args:
+        p_a (Any): prob that player 'a' wins a point on their serve
+        p_b (Any): prob that player 'b' wins a point on their serve
+
+    Returns:
+        Tuple[Tuple[Grid, Grid], Tuple[Grid, Grid], Tuple[Grid, Grid]]:
+        game, tiebreak and set grids, each for 'a' then 'b' serving
+    """
+    a = (p_a, 1.0, 0.0)
+    b = (p_b, 0.0, 1.0)
+    games = (_game_grid(a), _game_grid(b))
+    tbs = _tiebreak_grids(a, b)
+    sets = _set_grids(
+        games[0][0][0], games[1][0][0], tbs[0][0][0], tbs[1][0][0]
+    )
+    return games, tbs, sets
+
+
+def theory_game(p: Any) -> Tuple[Any, Any]:
+    """`tennisim.game.theory_game` along with its derivative
+
+    Args:
+        p (Any): probability that server wins given point
+
+    Returns:
+        Tuple[Any, Any]: probability that server wins game and its derivative
+        with respect to p
+    """
+    res = _game_grid((p, 1.0, 0.0))[0][0]
+    return res[0], res[1]
+
+
+def prob_tiebreak(p_a: Any, p_b: Any, pt_a: int, pt_b: int) -> Grad:
+    """`tennisim.tiebreak.prob_tiebreak` along with its derivatives
+
+    Args:
+        p_a (Any): probability that current server wins a point they serve
+        p_b (Any): probability that current returner wins a point they serve
+        pt_a (int): points already won by current server
+        pt_b (int): points already won by current returner
+
+    Returns:
+        Grad: probability that current server wins the tiebreak and its
+        derivatives with respect to p_a and p_b
+    """
+    grid = _tiebreak_grids((p_a, 1.0, 0.0), (p_b, 0.0, 1.0))[0]
+    # bring long tiebreaks back down e.g. 9-8 has same prob as 6-5
+    drop = max(min(pt_a, pt_b) - 5, 0)
+    return Grad(*grid[pt_a - drop][pt_b - drop])
+
+
+def prob_set(p_a: Any, p_b: Any, g_a: int, g_b: int) -> Grad:
+    """`tennisim.set.prob_set` along with its derivatives
+
+    Args:
+        p_a (Any): prob current server wins any point on their serve
+        p_b (Any): prob current returner wins any point on their serve
+        g_a (int): games already won by current server
+        g_b (int): games already won by current returner
+
+    Returns:
+        Grad: probability that current server wins the set and its
+        derivatives with respect to p_a and p_b
+    """
+    sets = _grids(p_a, p_b)[2]
+    return Grad(*sets[0][g_a][g_b])
+
+
+def prob_match(
+    p_a: Any,
+    p_b: Any,
+    st_a: int = 0,
+    st_b: int = 0,
+    g_a: int = 0,
+    g_b: int = 0,
+    pt_a: int = 0,
+    pt_b: int = 0,
+    sets: int = 3,
+) -> Grad:
+    """`tennisim.match.prob_match` along with its derivatives
+
+    Args:
+        p_a (Any): prob that player 'a' wins a point on their serve
+        p_b (Any): prob that player 'b' wins a point on their serve
+        st_a (int, optional): sets already won by 'a'. Defaults to 0.
+        st_b (int, optional): sets already won by 'b'. Defaults to 0.
+        g_a (int, optional): games in curr set won by 'a'. Defaults to 0.
+        g_b (int, optional): games in curr set won by 'b'. Defaults to 0.
+        pt_a (int, optional): points in curr game won by 'a'. Defaults to 0.
+        pt_b (int, optional): points in curr game won by 'b'. Defaults to 0.
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+
+    Returns:
+        Grad: probability that player 'a' wins the match and its derivatives
+        with respect to p_a and p_b
+    """
+    win_m = sets // 2 + 1
+    if st_a == win_m:
+        return Grad(*ONE)
+    elif st_b == win_m:
+        return Grad(*ZERO)
+
+    games, tbs, set_grids = _grids(p_a, p_b)
+    if pt_a == 0 and pt_b == 0:
+        p_this_set = set_grids[0][g_a][g_b]
+    elif g_a == 6 and g_b == 6:
+        drop = max(min(pt_a, pt_b) - 5, 0)
+        p_this_set = tbs[0][pt_a - drop][pt_b - drop]
+    else:
+        # 'b' serves the next game
+        p_this_set = _mix_other(
+            games[0][pt_a][pt_b],
+            set_grids[1][g_b][g_a + 1],
+            set_grids[1][g_b + 1][g_a],
+        )
+    p_matches = _match_grid(set_grids[0][0][0], sets)
+    return Grad(
+        *_mix(p_this_set, p_matches[st_a + 1][st_b], p_matches[st_a][st_b + 1])
+    )
+
+
+def _to_array(grid: Grid, size: int) -> np.ndarray:
+    """Grid as an array indexed [value or derivative, x, y], padded with
+    zeros to size along x and y
+
+    Args:
+        grid (Grid): grid of jets of floats
+        size (int): length of the x and y axes
+
+    Returns:
+        np.ndarray: array of shape (3, size, size)
+    """
+    out = np.zeros((3, size, size))
+    n = len(grid)
+    out[:, :n, :n] = np.moveaxis(np.array(grid, dtype=float), 2, 0)
+    return out
+
+
+def _server_grads(
+    games: Grid, tbs: Grid, sets_s: Grid, sets_r: Grid, sets: int
+) -> np.ndarray:
+    """`tennisim.match._server_table` along with its derivatives, combining
+    the grids in the same way over whole arrays
+
+    Args:
+        games (Grid): game grid of the current server
+        tbs (Grid): tiebreak grid of the current server
+        sets_s (Grid): set grid with the current server serving
+        sets_r (Grid): set grid with the current returner serving
+        sets (int): how many sets match is 'best of'
+
+    Returns:
+        np.ndarray: array indexed [value or derivative, st_a, st_b, g_a, g_b,
+        pt_a, pt_b] where 'a' is the current server
+    """
+    win_m = sets // 2 + 1
+    if_w: Grid = [[ZERO] * TABLE_GAMES for x in range(TABLE_GAMES)]
+    if_l: Grid = [[ZERO] * TABLE_GAMES for x in range(TABLE_GAMES)]
+    for x in range(7):
+        for y in range(7):
+            if max(x, y) == 7 or (max(x, y) == 6 and abs(x - y) >= 2):
+                # set already over so never played from here
+                continue
+            if_w[x][y] = _flip(sets_r[y][x + 1])
+            if_l[x][y] = _flip(sets_r[y + 1][x])
+    w = _to_array(if_w, TABLE_GAMES)[:, :, :, None, None]
+    l_ = _to_array(if_l, TABLE_GAMES)[:, :, :, None, None]
+    p_game = _to_array(games, TABLE_POINTS)[:, None, None]
+
+    p_this_set = np.array(_mix(p_game, w, l_))
+    p_this_set[:, 6, 6] = _to_array(tbs, TABLE_POINTS)
+    p_this_set[:, :, :, 0, 0] = _to_array(sets_s, TABLE_GAMES)
+
+    p_matches = _match_grid(sets_s[0][0], sets)
+    probs = np.zeros((3, win_m + 1, win_m + 1) + p_this_set.shape[1:])
+    for x in range(win_m + 1):
+        for y in range(win_m + 1):
+            if x == win_m:
+                probs[0, x, y] = 1.0
+            elif y != win_m:
+                probs[:, x, y] = _mix(
+                    p_this_set, p_matches[x + 1][y], p_matches[x][y + 1]
+                )
+    # match not started yet
+    probs[:, 0, 0, 0, 0, 0, 0] = p_matches[0][0]
+    return probs
+
+
+class GradTable:
+    """`tennisim.match.MatchTable` along with the derivatives of the
+    probability that 'a' wins from every state with respect to p_a and p_b.
+    The game, tiebreak and set probs are worked back from the end one point
+    or game at a time, carrying their derivatives alongside in plain float
+    arithmetic, then combined over whole arrays as `MatchTable` does
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+    """
+
+    def __init__(self, p_a: float, p_b: float, sets: int = 3) -> None:
+        self.p_a = p_a
+        self.p_b = p_b
+        self.sets = sets
+        games, tbs, set_grids = _grids(p_a, p_b)
+        a_serving = _server_grads(
+            games[0], tbs[0], set_grids[0], set_grids[1], sets
+        )
+        b_serving = _server_grads(
+            games[1], tbs[1], set_grids[1], set_grids[0], sets
+        )
+        # from 'b' view then flip back to scores and probs for 'a'
+        b_serving = -b_serving.transpose(0, 2, 1, 4, 3, 6, 5)
+        b_serving[0] += 1
+        probs = np.stack([a_serving, b_serving], axis=1)
+        self.probs = probs[0].ravel()
+        self.d_a = probs[1].ravel()
+        self.d_b = probs[2].ravel()
+
+    def prob(
+        self,
+        st_a: int,
+        st_b: int,
+        g_a: int,
+        g_b: int,
+        pt_a: int,
+        pt_b: int,
+        a_serving: bool = True,
+    ) -> Grad:
+        """Returns probability that 'a' wins the match from the given state
+        and its derivatives
+
+        Args:
+            st_a (int): sets already won by 'a'
+            st_b (int): sets already won by 'b'
+            g_a (int): games in curr set won by 'a'
+            g_b (int): games in curr set won by 'b'
+            pt_a (int): points in curr game won by 'a'
+            pt_b (int): points in curr game won by 'b'
+            a_serving (bool, optional): True if 'a' is serving.
+            Defaults to True.
+
+        Returns:
+            Grad: probability that player 'a' wins the match and its
+            derivatives with respect to p_a and p_b
+        """
+        idx = encode_state(
+            st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving, self.sets
+        )
+        return Grad(
+            float(self.probs[idx]), float(self.d_a[idx]), float(self.d_b[idx])
+        )
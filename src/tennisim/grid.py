@@ -0,0 +1,328 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from tennisim import vector
+
+# match state as (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving)
+State = Tuple[int, int, int, int, int, int, bool]
+
+
+def _state_probs(
+    p_a: np.ndarray, p_b: np.ndarray, state: State, sets: int
+) -> np.ndarray:
+    """Probabilities that 'a' wins the match from a given state over arrays
+    of serve probabilities, flipping to 'b' view if 'b' is serving in the
+    same way as `tennisim.match.MatchTable`
+
+    Args:
+        p_a (np.ndarray): probs that player 'a' wins a point on their serve
+        p_b (np.ndarray): probs that player 'b' wins a point on their serve
+        state (State): (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving)
+        sets (int): how many sets match is 'best of'
+
+    Returns:
+        np.ndarray: probabilities that player 'a' wins the match
+    """
+    st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving = state
+    if a_serving:
+        return vector.prob_match(
+            p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b, sets=sets
+        )
+    return 1 - vector.prob_match(
+        p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a, sets=sets
+    )
+
+
+class ProbGrid:
+    """Precomputed grid of hold, set and match probabilities over a regular
+    grid of serve probabilities (p_a, p_b). Queries in between grid points
+    are answered by linear (hold) or bilinear (set, match) interpolation so
+    cost a handful of float operations instead of the closed forms.
+
+    The interpolation error is estimated when the grid is built by comparing
+    against the exact values at the middle of every grid cell, which is where
+    the error of linear interpolation of a smooth function is largest. The
+    worst case for each quantity is kept in `error`. It scales with the
+    square of the grid step so doubling `n` roughly quarters it
+
+    Args:
+        lo (float, optional): smallest serve probability. Defaults to 0.3.
+        hi (float, optional): largest serve probability. Defaults to 0.9.
+        n (int, optional): grid points along each axis. Defaults to 121.
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+        states (Optional[Sequence[State]], optional): match states
+        (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving) to also store the
+        probability that 'a' wins the match from. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        lo: float = 0.3,
+        hi: float = 0.9,
+        n: int = 121,
+        sets: int = 3,
+        states: Optional[Sequence[State]] = None,
+    ) -> None:
+        self.lo = lo
+        self.hi = hi
+        self.n = n
+        self.sets = sets
+        self.axis = np.linspace(lo, hi, n)
+        self.step = (hi - lo) / (n - 1)
+
+        # p_a down the rows and p_b along the columns
+        p_a, p_b = self.axis[:, None], self.axis[None, :]
+        self.hold = vector.theory_game(self.axis)
+        self.set = vector.prob_set(p_a, p_b, 0, 0)
+        self.match = vector.prob_match(p_a, p_b, sets=sets)
+        self.states: Dict[State, np.ndarray] = {}
+        for state in states or ():
+            key = _state_key(state)
+            self.states[key] = _state_probs(p_a, p_b, key, sets)
+
+        # compare against exact values at the middle of each cell
+        mid = (self.axis[:-1] + self.axis[1:]) / 2
+        m_a, m_b = mid[:, None], mid[None, :]
+        self.error: Dict[Any, float] = {
+            "hold": _max_err(
+                vector.theory_game(mid), (self.hold[:-1] + self.hold[1:]) / 2
+            ),
+            "set": _max_err(vector.prob_set(m_a, m_b, 0, 0), _mids(self.set)),
+            "match": _max_err(
+                vector.prob_match(m_a, m_b, sets=sets), _mids(self.match)
+            ),
+        }
+        for key, values in self.states.items():
+            exact = _state_probs(m_a, m_b, key, sets)
+            self.error[key] = _max_err(exact, _mids(values))
+
+    def _locate(self, p: Any) -> Tuple[Any, Any]:
+        """Finds the grid cell containing each probability
+
+        Args:
+            p (Any): serve probability or array of them
+
+        Raises:
+            ValueError: if any probability is outside the grid
+
+        Returns:
+            Tuple[Any, Any]: index of the cell start and the fraction of the
+            way across the cell
+        """
+        x = (np.asarray(p, dtype=float) - self.lo) / self.step
+        # small tolerance so the grid ends are not lost to rounding
+        if np.any(x < -1e-9) or np.any(x > self.n - 1 + 1e-9):
+            raise ValueError(
+                f"Probabilities must be within [{self.lo}, {self.hi}]"
+            )
+        i = np.clip(x.astype(np.int64), 0, self.n - 2)
+        return i, np.clip(x - i, 0, 1)
+
+    def _locate_scalar(self, p: float) -> Tuple[int, float]:
+        """Same as `_locate` for a single probability but in plain python,
+        which is much quicker than going through numpy for one lookup
+
+        Args:
+            p (float): serve probability
+
+        Raises:
+            ValueError: if the probability is outside the grid
+
+        Returns:
+            Tuple[int, float]: index of the cell start and the fraction of the
+            way across the cell
+        """
+        x = (p - self.lo) / self.step
+        if not -1e-9 <= x <= self.n - 1 + 1e-9:
+            raise ValueError(
+                f"Probabilities must be within [{self.lo}, {self.hi}]"
+            )
+        i = min(max(int(x), 0), self.n - 2)
+        return i, min(max(x - i, 0.0), 1.0)
+
+    def _interp(self, values: np.ndarray, p_a: Any, p_b: Any) -> Any:
+        """Bilinear interpolation of a table of values on the grid
+
+        Args:
+            values (np.ndarray): value at each (p_a, p_b) grid point
+            p_a (Any): probs that player 'a' wins a point on their serve
+            p_b (Any): probs that player 'b' wins a point on their serve
+
+        Returns:
+            Any: float if both probs are python numbers else array
+        """
+        if isinstance(p_a, (float, int)) and isinstance(p_b, (float, int)):
+            i, f_a = self._locate_scalar(p_a)
+            j, f_b = self._locate_scalar(p_b)
+            get = values.item
+            return (
+                get(i, j) * (1 - f_a) * (1 - f_b)
+                + get(i + 1, j) * f_a * (1 - f_b)
+                + get(i, j + 1) * (1 - f_a) * f_b
+                + get(i + 1, j + 1) * f_a * f_b
+            )
+        i, f_a = self._locate(p_a)
+        j, f_b = self._locate(p_b)
+        return (
+            values[i, j] * (1 - f_a) * (1 - f_b)
+            + values[i + 1, j] * f_a * (1 - f_b)
+            + values[i, j + 1] * (1 - f_a) * f_b
+            + values[i + 1, j + 1] * f_a * f_b
+        )
+
+    def prob_hold(self, p: Any) -> Any:
+        """Interpolated `tennisim.game.theory_game`
+
+        Args:
+            p (Any): probs that server wins a point
+
+        Returns:
+            Any: probs that server wins the game
+        """
+        if isinstance(p, (float, int)):
+            i, f = self._locate_scalar(p)
+            get = self.hold.item
+            return get(i) * (1 - f) + get(i + 1) * f
+        i, f = self._locate(p)
+        return self.hold[i] * (1 - f) + self.hold[i + 1] * f
+
+    def prob_set(self, p_a: Any, p_b: Any) -> Any:
+        """Interpolated `tennisim.set.prob_set` from the start of a set
+
+        Args:
+            p_a (Any): probs that server wins a point on their serve
+            p_b (Any): probs that returner wins a point on their serve
+
+        Returns:
+            Any: probs that server wins the set
+        """
+        return self._interp(self.set, p_a, p_b)
+
+    def prob_match(
+        self, p_a: Any, p_b: Any, state: Optional[State] = None
+    ) -> Any:
+        """Interpolated `tennisim.match.prob_match` from the start of the
+        match or from one of the states the grid was built with
+
+        Args:
+            p_a (Any): probs that player 'a' wins a point on their serve
+            p_b (Any): probs that player 'b' wins a point on their serve
+            state (Optional[State], optional): match state
+            (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving). Defaults to None
+            for the start of the match.
+
+        Raises:
+            KeyError: if the grid was not built with the given state
+
+        Returns:
+            Any: probs that player 'a' wins the match
+        """
+        if state is None:
+            return self._interp(self.match, p_a, p_b)
+        key = _state_key(state)
+        if key not in self.states:
+            raise KeyError(f"Grid was not built with state {state}")
+        return self._interp(self.states[key], p_a, p_b)
+
+    def save(self, path: str) -> None:
+        """Saves the grid to a numpy `.npz` file
+
+        Args:
+            path (str): file to save to
+        """
+        keys = list(self.states)
+        np.savez(
+            path,
+            params=np.array([self.lo, self.hi, self.n, self.sets]),
+            hold=self.hold,
+            set=self.set,
+            match=self.match,
+            state_keys=np.array(keys, dtype=np.int64).reshape(-1, 7),
+            state_values=np.array(
+                [self.states[k] for k in keys], dtype=float
+            ).reshape(-1, self.n, self.n),
+            error=np.array(
+                [self.error[k] for k in ["hold", "set", "match"] + keys]
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ProbGrid":
+        """Loads a grid saved with `save` without recomputing anything
+
+        Args:
+            path (str): file to load from
+
+        Returns:
+            ProbGrid: the saved grid
+        """
+        grid = cls.__new__(cls)
+        with np.load(path) as data:
+            lo, hi, n, sets = data["params"].tolist()
+            grid.lo, grid.hi, grid.n, grid.sets = lo, hi, int(n), int(sets)
+            grid.axis = np.linspace(lo, hi, grid.n)
+            grid.step = (hi - lo) / (grid.n - 1)
+            grid.hold = data["hold"]
+            grid.set = data["set"]
+            grid.match = data["match"]
+            keys: List[Any] = [
+                _state_key(x) for x in data["state_keys"].tolist()
+            ]
+            grid.states = dict(zip(keys, data["state_values"]))
+            errors = data["error"].tolist()
+        grid.error = dict(zip(["hold", "set", "match"] + keys, errors))
+        return grid
+
+
+def _state_key(state: Sequence[int]) -> State:
+    """Normalises a match state so it can be used as a dict key
+
+    Args:
+        state (Sequence[int]): (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving)
+
+    Returns:
+        State: state as a tuple of ints and a bool
+    """
+    st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving = state
+    return (
+        int(st_a),
+        int(st_b),
+        int(g_a),
+        int(g_b),
+        int(pt_a),
+        int(pt_b),
+        bool(a_serving),
+    )
+
+
+def _mids(values: np.ndarray) -> np.ndarray:
+    """Bilinear interpolation of a grid of values at the middle of each cell
+
+    Args:
+        values (np.ndarray): values on the grid
+
+    Returns:
+        np.ndarray: interpolated values at the middle of each cell
+    """
+    return (
+        values[:-1, :-1] + values[1:, :-1] + values[:-1, 1:] + values[1:, 1:]
+    ) / 4
+
+
+def _max_err(exact: np.ndarray, approx: np.ndarray) -> float:
+    """Largest absolute difference between exact and interpolated values
+
+    Args:
+        exact (np.ndarray): exact values
+        approx (np.ndarray): interpolated values
+
+    Returns:
+        float: largest absolute error
+    """
+    return float(np.nanmax(np.abs(exact - approx)))
@@ -0,0 +1,237 @@
+import random
+import sys
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import NamedTuple
+
+# functions that are counted and timed, by the module that defines them
+FUNCTIONS = {
+    "tennisim.game": ("theory_game", "prob_game"),
+    "tennisim.tiebreak": ("prob_tiebreak",),
+    "tennisim.set": ("prob_set", "prob_set_outcome"),
+    "tennisim.match": ("prob_match", "prob_match_outcome", "reformat_match"),
+    "tennisim.sim": (
+        "sim_point",
+        "sim_game",
+        "sim_tiebreak",
+        "sim_set",
+        "sim_match",
+    ),
+}
+# simulators that draw the points themselves, rather than through another
+SIM_LEAVES = ("sim_point", "sim_game", "sim_tiebreak")
+
+_calls: Dict[str, int] = {}
+_seconds: Dict[str, float] = {}
+_counts = {"points": 0, "games": 0, "tiebreaks": 0}
+# wrapper: original for everything currently patched in
+_wrapped: Dict[Callable, Callable] = {}
+
+
+class Snapshot(NamedTuple):
+    """Counters collected while instrumentation was enabled
+
+    Attributes:
+        calls (Dict[str, int]): calls of each function
+        seconds (Dict[str, float]): wall time spent in each function,
+        including in the functions it calls
+        points (int): points simulated
+        games (int): games simulated, not counting tiebreaks
+        tiebreaks (int): tiebreaks simulated
+    """
+
+    calls: Dict[str, int]
+    seconds: Dict[str, float]
+    points: int
+    games: int
+    tiebreaks: int
+
+
+class _CountingRandom:
+    """Random source that counts each draw, one per point simulated
+
+    Args:
+        rng (Any): random source passed to the simulator, None for the
+        global `random` module
+    """
+
+    __slots__ = ("random",)
+
+    def __init__(self, rng: Any) -> None:
+        draw = random.random if rng is None else rng.random
+
+        def _random() -> float:
+            _counts["points"] += 1
+            return draw()
+
+        self.random = _random
+
+
+def _timed(name: str, func: Callable) -> Callable:
+    """Wraps func to count its calls and time them
+
+    Args:
+        name (str): name to record the calls under
+        func (Callable): function to wrap
+
+    Returns:
+        Callable: wrapped function
+    """
+
+    @wraps(func)
+    def _wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _seconds[name] = _seconds.get(name, 0.0) + perf_counter() - start
+            _calls[name] = _calls.get(name, 0) + 1
+
+    return _wrapper
+
+
+def _counted(name: str, func: Callable) -> Callable:
+    """Wraps a simulator that draws its own points so that each draw is
+    counted as a point, as well as counting and timing its calls
+
+    Args:
+        name (str): name of the simulator
+        func (Callable): simulator to wrap, with `rng` as its last argument
+
+    Returns:
+        Callable: wrapped function
+    """
+    pos = func.__code__.co_argcount - 1
+    kind = {"sim_game": "games", "sim_tiebreak": "tiebreaks"}.get(name)
+
+    def _with_counter(*args: Any, **kwargs: Any) -> Any:
+        if len(args) > pos:
+            args = args[:pos] + (_CountingRandom(args[pos]),)
+        else:
+            kwargs["rng"] = _CountingRandom(kwargs.get("rng"))
+        if kind is not None:
+            _counts[kind] += 1
+        return func(*args, **kwargs)
+
+    return _timed(name, wraps(func)(_with_counter))
+
+
+def _patch(old: Callable, new: Callable) -> None:
+    """Points every name in the loaded tennisim modules that refers to old
+    at new instead, including names imported with `from .. import`
+
+    Args:
+        old (Callable): function to replace
+        new (Callable): function to put in its place
+    """
+    for mod_name, mod in list(sys.modules.items()):
+        if mod is None or not mod_name.startswith("tennisim"):
+            continue
+        for attr, value in list(vars(mod).items()):
+            if value is old:
+                setattr(mod, attr, new)
+
+
+def enabled() -> bool:
+    """Returns True if instrumentation is on"""
+    return bool(_wrapped)
+
+
+def enable() -> None:
+    """Turns instrumentation on by swapping the functions in FUNCTIONS for
+    counting and timing versions in every loaded tennisim module. Nothing is
+    added to the functions themselves, so when instrumentation is off they
+    run exactly as before with no overhead
+
+    Only calls made through the tennisim modules are seen. A function
+    imported into other code with `from tennisim.x import f` before enabling
+    keeps the original
+    """
+    if enabled():
+        return
+    for mod_name, names in FUNCTIONS.items():
+        mod = __import__(mod_name, fromlist=["_"])
+        for name in names:
+            func = getattr(mod, name)
+            wrap = _counted if name in SIM_LEAVES else _timed
+            new = wrap(name, func)
+            _wrapped[new] = func
+            _patch(func, new)
+
+
+def disable() -> None:
+    """Turns instrumentation off and puts the original functions back. The
+    counters are kept until `reset`
+    """
+    for new, func in list(_wrapped.items()):
+        _patch(new, func)
+    _wrapped.clear()
+
+
+@contextmanager
+def instrumented() -> Iterator[None]:
+    """Context manager that enables instrumentation inside the block and
+    disables it afterwards
+
+    Yields:
+        Iterator[None]: nothing
+    """
+    was_enabled = enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def reset() -> None:
+    """Sets every counter back to 0"""
+    _calls.clear()
+    _seconds.clear()
+    for key in _counts:
+        _counts[key] = 0
+
+
+def snapshot() -> Snapshot:
+    """Returns a copy of the counters
+
+    Returns:
+        Snapshot: calls, seconds and counts simulated so far
+    """
+    return Snapshot(
+        dict(sorted(_calls.items())),
+        dict(sorted(_seconds.items())),
+        _counts["points"],
+        _counts["games"],
+        _counts["tiebreaks"],
+    )
+
+
+def export(prefix: str = "tennisim") -> str:
+    """Returns the counters in the Prometheus text format so they can be
+    served and scraped
+
+    Args:
+        prefix (str, optional): prefix of each metric name.
+        Defaults to "tennisim".
+
+    Returns:
+        str: one line per metric
+    """
+    snap = snapshot()
+    lines = [f"# TYPE {prefix}_calls_total counter"]
+    for name, count in snap.calls.items():
+        lines.append(f'{prefix}_calls_total{{function="{name}"}} {count}')
+    lines.append(f"# TYPE {prefix}_seconds_total counter")
+    for name, secs in snap.seconds.items():
+        lines.append(f'{prefix}_seconds_total{{function="{name}"}} {secs!r}')
+    for kind in ("points", "games", "tiebreaks"):
+        lines.append(f"# TYPE {prefix}_{kind}_simulated_total counter")
+        lines.append(f"{prefix}_{kind}_simulated_total {getattr(snap, kind)}")
+    return "\n".join(lines) + "\n"
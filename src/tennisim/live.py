@@ -0,0 +1,243 @@
+from typing import Tuple
+
+from tennisim.exact import tb_first_serving
+from tennisim.match import TABLE_GAMES
+from tennisim.match import TABLE_POINTS
+from tennisim.match import MatchTable
+
+# sets, games and points for 'a' then 'b', 'a' serving the next point and
+# 'a' serving first in the tiebreak if there is one
+Fields = Tuple[int, int, int, int, int, int, bool, bool]
+
+
+class MatchState:
+    """Score of a live match that moves on one point at a time and looks up
+    the probability that 'a' wins from a `MatchTable` for the matchup. Each
+    point is a few integer updates and one array index, so many live matches
+    can be followed at once without calling `prob_match` after each point
+
+    Keeps track of who serves, including the rotation within a tiebreak and
+    who serves first in the set after it. Points within a game are kept for
+    'a' then 'b' as in `MatchTable`, with advantage points brought back to
+    deuce at 4-4
+
+    Args:
+        table (MatchTable): table for the matchup, can be shared by any
+        number of states
+        a_serving (bool, optional): True if 'a' serves the next point.
+        Defaults to True.
+        st_a (int, optional): sets already won by 'a'. Defaults to 0.
+        st_b (int, optional): sets already won by 'b'. Defaults to 0.
+        g_a (int, optional): games in curr set won by 'a'. Defaults to 0.
+        g_b (int, optional): games in curr set won by 'b'. Defaults to 0.
+        pt_a (int, optional): points in curr game won by 'a'. Defaults to 0.
+        pt_b (int, optional): points in curr game won by 'b'. Defaults to 0.
+    """
+
+    __slots__ = (
+        "table",
+        "win_m",
+        "st_a",
+        "st_b",
+        "g_a",
+        "g_b",
+        "pt_a",
+        "pt_b",
+        "a_serving",
+        "tb_first",
+        "_probs",
+        "_n_st",
+    )
+
+    def __init__(
+        self,
+        table: MatchTable,
+        a_serving: bool = True,
+        st_a: int = 0,
+        st_b: int = 0,
+        g_a: int = 0,
+        g_b: int = 0,
+        pt_a: int = 0,
+        pt_b: int = 0,
+    ) -> None:
+        self.table = table
+        self.win_m = table.sets // 2 + 1
+        self._probs = table.probs
+        self._n_st = self.win_m + 1
+        self.st_a = st_a
+        self.st_b = st_b
+        self.g_a = g_a
+        self.g_b = g_b
+        self.pt_a = pt_a
+        self.pt_b = pt_b
+        self.a_serving = a_serving
+        # only used in a tiebreak but found from who serves next
+        self.tb_first = tb_first_serving(pt_a, pt_b, a_serving)
+
+    @property
+    def over(self) -> bool:
+        """True once either player has won the match"""
+        return self.st_a == self.win_m or self.st_b == self.win_m
+
+    @property
+    def in_tiebreak(self) -> bool:
+        """True if the current set is in a tiebreak"""
+        return self.g_a == 6 and self.g_b == 6
+
+    @property
+    def score(self) -> Tuple[int, int, int, int, int, int, bool]:
+        """Current state in the order taken by `MatchTable.prob`
+
+        Returns:
+            Tuple[int, int, int, int, int, int, bool]: sets, games and points
+            for 'a' then 'b' and whether 'a' serves the next point
+        """
+        return (
+            self.st_a,
+            self.st_b,
+            self.g_a,
+            self.g_b,
+            self.pt_a,
+            self.pt_b,
+            self.a_serving,
+        )
+
+    def _fields(self) -> Fields:
+        """Returns everything that changes from point to point
+
+        Returns:
+            Fields: current score, server and tiebreak first server
+        """
+        return (
+            self.st_a,
+            self.st_b,
+            self.g_a,
+            self.g_b,
+            self.pt_a,
+            self.pt_b,
+            self.a_serving,
+            self.tb_first,
+        )
+
+    def _lookup(self, fields: Fields) -> float:
+        """Looks up the probability that 'a' wins from the given fields,
+        indexing the table as `tennisim.match.encode_state` does but with
+        plain ints
+
+        Args:
+            fields (Fields): score, server and tiebreak first server
+
+        Returns:
+            float: probability that 'a' wins the match
+        """
+        st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving = fields[:7]
+        n_st = self._n_st
+        # bring long tiebreaks back down e.g. 9-8 has same prob as 6-5
+        drop = min(pt_a, pt_b) - 5
+        if drop > 0:
+            pt_a -= drop
+            pt_b -= drop
+        idx = (0 if a_serving else n_st) + st_a
+        idx = (idx * n_st + st_b) * TABLE_GAMES + g_a
+        idx = (idx * TABLE_GAMES + g_b) * TABLE_POINTS + pt_a
+        return float(self._probs[idx * TABLE_POINTS + pt_b])
+
+    def _next(self, fields: Fields, a_won: bool) -> Fields:
+        """Works out the fields after the next point
+
+        Args:
+            fields (Fields): score, server and tiebreak first server
+            a_won (bool): True if 'a' wins the point
+
+        Returns:
+            Fields: score, server and tiebreak first server after the point
+        """
+        st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving, tb_first = fields
+        if a_won:
+            pt_a += 1
+        else:
+            pt_b += 1
+
+        if g_a == 6 and g_b == 6:
+            if max(pt_a, pt_b) < 7 or abs(pt_a - pt_b) < 2:
+                # first server serves point 0, then 2 each from the other
+                first_next = ((pt_a + pt_b + 1) // 2) % 2 == 0
+                a_serving = tb_first == first_next
+                return (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving, tb_first)
+            # set over and the first returner in the tiebreak serves next
+            if pt_a > pt_b:
+                st_a += 1
+            else:
+                st_b += 1
+            return (st_a, st_b, 0, 0, 0, 0, not tb_first, tb_first)
+
+        if pt_a == 4 and pt_b == 4:
+            # back to deuce
+            return (st_a, st_b, g_a, g_b, 3, 3, a_serving, tb_first)
+        if max(pt_a, pt_b) < 4 or abs(pt_a - pt_b) < 2:
+            return (st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving, tb_first)
+
+        # game over so server swaps, including into the next set
+        if pt_a > pt_b:
+            g_a += 1
+        else:
+            g_b += 1
+        a_serving = not a_serving
+        if g_a == 6 and g_b == 6:
+            # tiebreak served first by whoever is due to serve next game
+            return (st_a, st_b, 6, 6, 0, 0, a_serving, a_serving)
+        if max(g_a, g_b) >= 6 and abs(g_a - g_b) >= 2:
+            if g_a > g_b:
+                st_a += 1
+            else:
+                st_b += 1
+            g_a = g_b = 0
+        return (st_a, st_b, g_a, g_b, 0, 0, a_serving, tb_first)
+
+    @property
+    def prob(self) -> float:
+        """Probability that 'a' wins the match from the current state"""
+        return self._lookup(self._fields())
+
+    @property
+    def prob_w(self) -> float:
+        """Probability that 'a' wins the match if they win the next point"""
+        if self.over:
+            return self.prob
+        return self._lookup(self._next(self._fields(), True))
+
+    @property
+    def prob_l(self) -> float:
+        """Probability that 'a' wins the match if they lose the next point"""
+        if self.over:
+            return self.prob
+        return self._lookup(self._next(self._fields(), False))
+
+    def point_won_by(self, player: str) -> float:
+        """Moves the score on by one point
+
+        Args:
+            player (str): 'a' or 'b', whoever won the point
+
+        Raises:
+            ValueError: if player is not 'a' or 'b' or the match is over
+
+        Returns:
+            float: probability that 'a' wins the match after the point
+        """
+        if player != "a" and player != "b":
+            raise ValueError(f"player must be 'a' or 'b', got {player!r}")
+        if self.over:
+            raise ValueError("Match is already over")
+        fields = self._next(self._fields(), player == "a")
+        (
+            self.st_a,
+            self.st_b,
+            self.g_a,
+            self.g_b,
+            self.pt_a,
+            self.pt_b,
+            self.a_serving,
+            self.tb_first,
+        ) = fields
+        return self._lookup(fields)
@@ -1,9 +1,18 @@
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
 from typing import Tuple
+from typing import Union
 
+import numpy as np
+
+from tennisim.binom import binom_pmf
 from tennisim.game import prob_game
 from tennisim.set import prob_set
 from tennisim.tiebreak import prob_tiebreak
-from tennisim.utils import comb
 
 
 def prob_match_outcome(
@@ -40,12 +49,7 @@ def prob_match_outcome(
         # subtract 1 as has to win final set
         s_needed = ns[0] - 1
         sets_played = sum(ns) - 1
-        prob_s = (
-            p_set
-            * comb(sets_played, s_needed)
-            * p_set ** s_needed
-            * (1 - p_set) ** (sets_played - s_needed)
-        )
+        prob_s = p_set * binom_pmf(sets_played, s_needed, p_set)
         match_outcomes[ps] = prob_s
 
     return sum(match_outcomes.values()), match_outcomes
@@ -92,7 +96,7 @@ def prob_match(
     if pt_a == 0 and pt_b == 0:
         if g_a == 0 and g_b == 0:
             if st_a == 0 and st_b == 0:
-                return prob_match_outcome(p_set, 0, 0)[0]
+                return prob_match_outcome(p_set, 0, 0, sets=sets)[0]
             else:
                 # we have sets played but no games yet
                 p_this_set = p_set
@@ -133,25 +137,322 @@ def prob_match(
     return p_match
 
 
-def reformat_match(match_data: list, p_a: float, p_b: float) -> list:
-    """Reformats data generated by match simulation for ease of analysis
+# sizes of the games and points axes of a `MatchTable`
+# games run 0-7 and points 0-7, tiebreak scores past 6-6 are brought back
+# down to the same lead at 5 or 6 as they have the same win probability
+TABLE_GAMES = 8
+TABLE_POINTS = 8
+
+
+def _server_table(p_a: float, p_b: float, sets: int) -> np.ndarray:
+    """Builds array of prob_match(p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b)
+    over every state, where 'a' is the current server. Each closed form is
+    only evaluated once per games or points state and then combined in the
+    same way as `prob_match` does
+
+    Args:
+        p_a (float): prob that current server wins a point on their serve
+        p_b (float): prob that current returner wins a point on their serve
+        sets (int): how many sets match is 'best of'
+
+    Returns:
+        np.ndarray: array indexed [st_a, st_b, g_a, g_b, pt_a, pt_b]
+    """
+    win_m = sets // 2 + 1
+    gs = range(TABLE_GAMES)
+    pts = range(TABLE_POINTS)
+
+    # prob of winning set from each games score for server and returner
+    p_sets = np.array([[prob_set(p_a, p_b, x, y) for y in gs] for x in gs])
+    p_sets_r = np.array([[prob_set(p_b, p_a, x, y) for y in gs] for x in gs])
+    # prob of winning game and tiebreak from each points score
+    p_games = np.zeros((TABLE_POINTS, TABLE_POINTS))
+    for x in range(6):
+        for y in range(6):
+            p_games[x, y] = prob_game(p_a, x, y)
+    p_tbs = np.array(
+        [[prob_tiebreak(p_a, p_b, x, y)[0] for y in pts] for x in pts]
+    )
+
+    # prob of winning set if server wins or loses this game
+    # viewed from returner as they serve the next game
+    if_w = np.zeros((TABLE_GAMES, TABLE_GAMES))
+    if_l = np.zeros((TABLE_GAMES, TABLE_GAMES))
+    for x in range(7):
+        for y in range(7):
+            if max(x, y) == 7 or (max(x, y) == 6 and abs(x - y) >= 2):
+                # set already over so never played from here
+                continue
+            if_w[x, y] = 1 - p_sets_r[y, x + 1]
+            if_l[x, y] = 1 - p_sets_r[y + 1, x]
+
+    # prob of winning set from each games and points state
+    p_this_game = p_games[None, None, :, :]
+    p_this_set = p_this_game * if_w[:, :, None, None] + (
+        1 - p_this_game
+    ) * if_l[:, :, None, None]
+    # in a tiebreak at 6-6
+    p_this_set[6, 6] = p_tbs
+    # haven't started the game yet
+    p_this_set[:, :, 0, 0] = p_sets
+
+    # prob of winning match from each sets score
+    p_set = p_sets[0, 0]
+    st = range(win_m + 1)
+    p_matches = np.array(
+        [
+            [prob_match_outcome(p_set, x, y, sets=sets)[0] for y in st]
+            for x in st
+        ]
+    )
+
+    probs = np.zeros((win_m + 1, win_m + 1) + p_this_set.shape)
+    for x in st:
+        for y in st:
+            if x == win_m:
+                probs[x, y] = 1.0
+            elif y == win_m:
+                probs[x, y] = 0.0
+            else:
+                probs[x, y] = (
+                    p_this_set * p_matches[x + 1, y]
+                    + (1 - p_this_set) * p_matches[x, y + 1]
+                )
+    # match not started yet
+    probs[0, 0, 0, 0, 0, 0] = p_matches[0, 0]
+    return probs
+
+
+def encode_state(
+    st_a: Union[int, np.ndarray],
+    st_b: Union[int, np.ndarray],
+    g_a: Union[int, np.ndarray],
+    g_b: Union[int, np.ndarray],
+    pt_a: Union[int, np.ndarray],
+    pt_b: Union[int, np.ndarray],
+    a_serving: Union[bool, np.ndarray] = True,
+    sets: int = 3,
+) -> Union[int, np.ndarray]:
+    """Encodes a match state as a single integer index into the flat array
+    of a `MatchTable`. Works on ints or arrays of states
+
+    Args:
+        st_a (Union[int, np.ndarray]): sets already won by 'a'
+        st_b (Union[int, np.ndarray]): sets already won by 'b'
+        g_a (Union[int, np.ndarray]): games in curr set won by 'a'
+        g_b (Union[int, np.ndarray]): games in curr set won by 'b'
+        pt_a (Union[int, np.ndarray]): points in curr game won by 'a'
+        pt_b (Union[int, np.ndarray]): points in curr game won by 'b'
+        a_serving (Union[bool, np.ndarray], optional): True if 'a' is serving.
+        Defaults to True.
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+
+    Returns:
+        Union[int, np.ndarray]: index of the state
+    """
+    n_st = sets // 2 + 2
+    # bring long tiebreaks back down e.g. 9-8 has same prob as 6-5
+    drop = np.maximum(np.minimum(pt_a, pt_b) - 5, 0)
+    idx = np.where(a_serving, 0, 1) * n_st + st_a
+    idx = idx * n_st + st_b
+    idx = idx * TABLE_GAMES + g_a
+    idx = idx * TABLE_GAMES + g_b
+    idx = idx * TABLE_POINTS + pt_a - drop
+    return idx * TABLE_POINTS + pt_b - drop
+
+
+class MatchTable:
+    """Table of the probability that 'a' wins the match from every state,
+    built once for a given matchup so that each lookup is just an array
+    index instead of recomputing `prob_match`. For each state the value is
+    the same as `prob_match(p_a, p_b, ...)` if 'a' is serving and
+    `1 - prob_match(p_b, p_a, ...)` with the scores flipped if 'b' is
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+    """
+
+    def __init__(self, p_a: float, p_b: float, sets: int = 3) -> None:
+        self.p_a = p_a
+        self.p_b = p_b
+        self.sets = sets
+        a_serving = _server_table(p_a, p_b, sets)
+        # from 'b' view then flip back to scores and probs for 'a'
+        b_serving = 1 - _server_table(p_b, p_a, sets).transpose(
+            1, 0, 3, 2, 5, 4
+        )
+        self.probs = np.stack([a_serving, b_serving]).ravel()
+
+    def prob(
+        self,
+        st_a: int,
+        st_b: int,
+        g_a: int,
+        g_b: int,
+        pt_a: int,
+        pt_b: int,
+        a_serving: bool = True,
+    ) -> float:
+        """Returns probability that 'a' wins the match from the given state
+
+        Args:
+            st_a (int): sets already won by 'a'
+            st_b (int): sets already won by 'b'
+            g_a (int): games in curr set won by 'a'
+            g_b (int): games in curr set won by 'b'
+            pt_a (int): points in curr game won by 'a'
+            pt_b (int): points in curr game won by 'b'
+            a_serving (bool, optional): True if 'a' is serving.
+            Defaults to True.
+
+        Returns:
+            float: probability that player 'a' wins the match
+        """
+        return float(
+            self.probs[
+                encode_state(
+                    st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving, self.sets
+                )
+            ]
+        )
+
+
+class PointRow(NamedTuple):
+    """One point of a simulated match as yielded by `iter_points`, with the
+    same fields as the dicts of `reformat_match`
+
+    Attributes:
+        st_a (int): sets won by 'a' before the point
+        st_b (int): sets won by 'b' before the point
+        g_a (int): games in the set won by 'a' before the point
+        g_b (int): games in the set won by 'b' before the point
+        pt_a (int): points in the game won by 'a' before the point
+        pt_b (int): points in the game won by 'b' before the point
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        pc (int): points played before this one
+        gc (int): games played before this one
+        sc (int): sets played before this one
+        prob (float): prob that 'a' wins the match before the point
+        prob_w (float): prob that 'a' wins the match if 'a' wins the point
+        prob_l (float): prob that 'a' wins the match if 'a' loses the point
+    """
+
+    st_a: int
+    st_b: int
+    g_a: int
+    g_b: int
+    pt_a: int
+    pt_b: int
+    p_a: float
+    p_b: float
+    pc: int
+    gc: int
+    sc: int
+    prob: float
+    prob_w: float
+    prob_l: float
+
+
+# numpy dtype of structured arrays of points, fields as `PointRow`
+POINT_DTYPE = np.dtype(
+    [
+        ("st_a", np.int16),
+        ("st_b", np.int16),
+        ("g_a", np.int16),
+        ("g_b", np.int16),
+        ("pt_a", np.int16),
+        ("pt_b", np.int16),
+        ("p_a", np.float64),
+        ("p_b", np.float64),
+        ("pc", np.int32),
+        ("gc", np.int32),
+        ("sc", np.int16),
+        ("prob", np.float64),
+        ("prob_w", np.float64),
+        ("prob_l", np.float64),
+    ]
+)
+
+# forms that `iter_points` can yield points in
+POINT_FORMS = ("dict", "namedtuple", "tuple")
+
+
+def iter_points(
+    match_data: Sequence,
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable] = None,
+    form: str = "dict",
+) -> Iterator[Any]:
+    """Yields the points of a simulated match one at a time as
+    `reformat_match` would return them, so nothing is held beyond the
+    current point and downstream work can start on the first point
 
     Args:
-        match_data (list): output of match simulation function sim_match
+        match_data (Sequence): output of match simulation function sim_match
         p_a (float): prob that player 'a' wins a given point on serve
         p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable], optional): table of match probabilities
+        for p_a and p_b to reuse across matches. Defaults to None to build
+        one for this match
+        form (str, optional): 'dict' for dicts as from `reformat_match`,
+        'namedtuple' for `PointRow` or 'tuple' for plain tuples in the same
+        order, which fit `POINT_DTYPE`. Defaults to 'dict'.
+
+    Raises:
+        ValueError: if form is not one of POINT_FORMS
 
     Returns:
-        list: list of points in chronological order of the sim'ed tennis match
+        Iterator[Any]: generator of points in chronological order of the
+        sim'ed tennis match, then one for the final score
+    """
+    if form not in POINT_FORMS:
+        raise ValueError(f"form must be one of {POINT_FORMS}, got {form}")
+    return _iter_points(match_data, p_a, p_b, table, form)
+
+
+def _iter_points(
+    match_data: Sequence,
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable],
+    form: str,
+) -> Iterator[Any]:
+    """Generator behind `iter_points`, split out so a bad form is raised
+    on the call rather than on the first point
+
+    Args:
+        match_data (Sequence): output of match simulation function sim_match
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable]): table of match probabilities
+        form (str): one of POINT_FORMS
+
+    Yields:
+        Iterator[Any]: points as from `iter_points`
     """
+    make: Callable[..., Any]
+    if form == "dict":
+        make = _as_dict
+    elif form == "namedtuple":
+        make = PointRow
+    else:
+        make = _as_tuple
 
-    points = []
     game_count = 0
     point_count = 0
     set_prog = match_data[1]
     game_progs = match_data[2]
     point_progs = match_data[3]
 
+    if table is None:
+        # winner has won the majority of sets so infer 'best of' from that
+        sets = 2 * max(set_prog[-1]) - 1
+        table = MatchTable(p_a, p_b, sets=sets)
+
     for i, set_score in enumerate(set_prog):
         if i == 0:
             # then we haven't played a set yet
@@ -194,101 +495,48 @@ def reformat_match(match_data: list, p_a: float, p_b: float) -> list:
                         pt_a = p[1]
                         pt_b = p[0]
 
-                # now compute win probab for player 'a'
+                # now work out who is serving to look up win probab
+                # for player 'a'
                 # first check special situation of being in tiebreak
                 if g_a == 6 and g_b == 6:
                     # then in tiebreak
+                    # e.g. if we've played 1,2 points in tb then swap
+                    swap = (pt_a + pt_b) % 4 == 1
                     if game_count % 2 == 0:
                         # then 'a' should serve first point of tiebreak
-                        # e.g. if we've played 1,2 points in tb then 'b' serve
-                        if (pt_a + pt_b) % 4 == 1 or (pt_a + pt_b) % 4 == 1:
-                            p = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a
-                            )
-                            p_w = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a + 1
-                            )
-                            p_l = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b + 1, pt_a
-                            )
-                        else:
-                            # then 'a' is serving
-                            p = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b
-                            )
-                            p_w = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a + 1, pt_b
-                            )
-                            p_l = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b + 1
-                            )
+                        a_serving = not swap
                     else:
                         # we have the reverse where b serves first point of tb
-                        if (pt_a + pt_b) % 4 == 1 or (pt_a + pt_b) % 4 == 1:
-                            # then 'a' is serving
-                            p = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b
-                            )
-                            p_w = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a + 1, pt_b
-                            )
-                            p_l = prob_match(
-                                p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b + 1
-                            )
-                        else:
-                            p = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a
-                            )
-                            p_w = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a + 1
-                            )
-                            p_l = 1 - prob_match(
-                                p_b, p_a, st_b, st_a, g_b, g_a, pt_b + 1, pt_a
-                            )
+                        a_serving = swap
                 else:
                     # we're not in the tiebreak so much easier
-                    if game_count % 2 == 0:
-                        # then 'a' serving
-                        p = prob_match(
-                            p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b
-                        )
-                        p_w = prob_match(
-                            p_a, p_b, st_a, st_b, g_a, g_b, pt_a + 1, pt_b
-                        )
-                        p_l = prob_match(
-                            p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b + 1
-                        )
-                    else:
-                        p = 1 - prob_match(
-                            p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a
-                        )
-                        p_w = 1 - prob_match(
-                            p_b, p_a, st_b, st_a, g_b, g_a, pt_b, pt_a + 1
-                        )
-                        p_l = 1 - prob_match(
-                            p_b, p_a, st_b, st_a, g_b, g_a, pt_b + 1, pt_a
-                        )
-
-                # now add this data to a map
-                p_map = {
-                    "st_a": st_a,
-                    "st_b": st_b,
-                    "g_a": g_a,
-                    "g_b": g_b,
-                    "pt_a": pt_a,
-                    "pt_b": pt_b,
-                    "p_a": p_a,
-                    "p_b": p_b,
-                    "pc": point_count,
-                    "gc": game_count,
-                    "sc": st_a + st_b,
-                    "prob": p,
-                    "prob_w": p_w,
-                    "prob_l": p_l,
-                }
+                    a_serving = game_count % 2 == 0
 
+                p = table.prob(st_a, st_b, g_a, g_b, pt_a, pt_b, a_serving)
+                p_w = table.prob(
+                    st_a, st_b, g_a, g_b, pt_a + 1, pt_b, a_serving
+                )
+                p_l = table.prob(
+                    st_a, st_b, g_a, g_b, pt_a, pt_b + 1, a_serving
+                )
+
+                yield make(
+                    st_a,
+                    st_b,
+                    g_a,
+                    g_b,
+                    pt_a,
+                    pt_b,
+                    p_a,
+                    p_b,
+                    point_count,
+                    game_count,
+                    st_a + st_b,
+                    p,
+                    p_w,
+                    p_l,
+                )
                 point_count += 1
-                points.append(p_map)
 
             # bump game count up
             game_count += 1
@@ -296,23 +544,120 @@ def reformat_match(match_data: list, p_a: float, p_b: float) -> list:
     # add on final score
     st_a = set_prog[-1][0]
     st_b = set_prog[-1][1]
-    p = prob_match(p_a, p_b, st_a, st_b)
-    p_map = {
-        "st_a": set_prog[-1][0],
-        "st_b": set_prog[-1][1],
-        "g_a": 0,
-        "g_b": 0,
-        "pt_a": 0,
-        "pt_b": 0,
+    p = table.prob(st_a, st_b, 0, 0, 0, 0)
+    yield make(
+        st_a,
+        st_b,
+        0,
+        0,
+        0,
+        0,
+        p_a,
+        p_b,
+        point_count,
+        game_count,
+        st_a + st_b,
+        p,
+        p,
+        p,
+    )
+
+
+def _as_dict(
+    st_a: int,
+    st_b: int,
+    g_a: int,
+    g_b: int,
+    pt_a: int,
+    pt_b: int,
+    p_a: float,
+    p_b: float,
+    pc: int,
+    gc: int,
+    sc: int,
+    prob: float,
+    prob_w: float,
+    prob_l: float,
+) -> dict:
+    """Returns the fields of a point as a dict keyed as `PointRow`. Spelt
+    out rather than zipped with the field names as it's faster
+
+    Returns:
+        dict: {field: value}
+    """
+    return {
+        "st_a": st_a,
+        "st_b": st_b,
+        "g_a": g_a,
+        "g_b": g_b,
+        "pt_a": pt_a,
+        "pt_b": pt_b,
         "p_a": p_a,
         "p_b": p_b,
-        "pc": point_count,
-        "gc": game_count,
-        "sc": st_a + st_b,
-        "prob": p,
-        "prob_w": p,
-        "prob_l": p,
+        "pc": pc,
+        "gc": gc,
+        "sc": sc,
+        "prob": prob,
+        "prob_w": prob_w,
+        "prob_l": prob_l,
     }
-    points.append(p_map)
 
-    return points
+
+def _as_tuple(*row: Any) -> tuple:
+    """Returns the fields of a point as a plain tuple
+
+    Args:
+        *row (Any): fields in the order of `PointRow`
+
+    Returns:
+        tuple: the fields
+    """
+    return row
+
+
+def reformat_match(
+    match_data: Sequence,
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable] = None,
+) -> list:
+    """Reformats data generated by match simulation for ease of analysis.
+    See `iter_points` to get the points one at a time instead
+
+    Args:
+        match_data (Sequence): output of match simulation function sim_match
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable], optional): table of match probabilities
+        for p_a and p_b to reuse across matches. Defaults to None to build
+        one for this match
+
+    Returns:
+        list: list of points in chronological order of the sim'ed tennis match
+    """
+    return list(iter_points(match_data, p_a, p_b, table))
+
+
+def points_array(
+    match_data: Sequence,
+    p_a: float,
+    p_b: float,
+    table: Optional[MatchTable] = None,
+) -> np.ndarray:
+    """Returns the points of `reformat_match` as a structured numpy array,
+    one row per point with fields as `PointRow`, built straight from
+    `iter_points` without making a dict per point
+
+    Args:
+        match_data (Sequence): output of match simulation function sim_match
+        p_a (float): prob that player 'a' wins a given point on serve
+        p_b (float): prob that player 'b' wins a given point on serve
+        table (Optional[MatchTable], optional): table of match probabilities
+        for p_a and p_b to reuse across matches. Defaults to None to build
+        one for this match
+
+    Returns:
+        np.ndarray: structured array with dtype POINT_DTYPE
+    """
+    rows = iter_points(match_data, p_a, p_b, table, form="tuple")
+    return np.fromiter(rows, dtype=POINT_DTYPE)
@@ -0,0 +1,469 @@
+import random
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from tennisim.exact import match_length_dist
+from tennisim.match import prob_match
+from tennisim.match import prob_match_outcome
+from tennisim.set import prob_set
+from tennisim.sim import OUTCOME
+from tennisim.sim import sim_game
+from tennisim.sim import sim_tiebreak
+
+
+class MatchSummary(NamedTuple):
+    """What happened in one simulated match, the input to each statistic
+
+    Attributes:
+        a_won (bool): True if 'a' won the match
+        sets (List[Tuple[int, int]]): games won by 'a' and 'b' in each set
+        games (int): games played, with a tiebreak counted as a game
+        breaks_a (int): games 'a' won on the serve of 'b'
+        breaks_b (int): games 'b' won on the serve of 'a'
+        tiebreaks (int): tiebreaks played
+    """
+
+    a_won: bool
+    sets: List[Tuple[int, int]]
+    games: int
+    breaks_a: int
+    breaks_b: int
+    tiebreaks: int
+
+
+class Estimate(NamedTuple):
+    """Monte Carlo estimate of the mean of a statistic
+
+    Attributes:
+        mean (float): estimate
+        std_err (float): standard error of the estimate
+        paths (int): matches simulated
+        gain (float): variance of plain Monte Carlo with the same paths over
+        the variance of this estimate, i.e. how many times fewer paths were
+        needed for the same precision
+    """
+
+    mean: float
+    std_err: float
+    paths: int
+    gain: float
+
+
+Statistic = Callable[[MatchSummary], float]
+
+
+class _Recorder:
+    """Random source that remembers every uniform it hands out
+
+    Args:
+        rng (Any): random source with a `random` method
+        draws (List[float]): list to append the uniforms to
+    """
+
+    __slots__ = ("random",)
+
+    def __init__(self, rng: Any, draws: List[float]) -> None:
+        draw = rng.random
+        append = draws.append
+
+        def _random() -> float:
+            u = draw()
+            append(u)
+            return u
+
+        self.random = _random
+
+
+class _Mirror:
+    """Random source that hands out one minus each of a list of uniforms,
+    then fresh uniforms once they run out
+
+    Args:
+        rng (Any): random source with a `random` method
+        draws (List[float]): uniforms to mirror
+    """
+
+    __slots__ = ("random",)
+
+    def __init__(self, rng: Any, draws: List[float]) -> None:
+        mirrored = iter([1 - x for x in draws])
+        draw = rng.random
+
+        def _random() -> float:
+            return next(mirrored, None) or draw()
+
+        self.random = _random
+
+
+class AntitheticPair:
+    """Random sources for a pair of antithetic matches. Game i of the first
+    match draws uniforms from rng and they are remembered, then game i of
+    the second match uses one minus each of them in turn, carrying on with
+    fresh uniforms if it runs longer
+
+    Games are paired rather than the whole stream of points, as serve
+    alternates every game so game i has the same server in both matches.
+    Points won by the server on a low draw in one match then tend to be lost
+    in the other, so the matches are negatively correlated and their average
+    varies less than that of two independent matches
+
+    Args:
+        rng (Any): random source with a `random` method
+    """
+
+    def __init__(self, rng: Any) -> None:
+        self._rng = rng
+        self._draws: List[List[float]] = []
+
+    def first(self, game: int) -> Any:
+        """Random source for a game of the first match
+
+        Args:
+            game (int): index of the game in the match, counting from 0
+
+        Returns:
+            Any: source with a `random` method
+        """
+        self._draws.append([])
+        return _Recorder(self._rng, self._draws[game])
+
+    def second(self, game: int) -> Any:
+        """Random source for a game of the second match
+
+        Args:
+            game (int): index of the game in the match, counting from 0
+
+        Returns:
+            Any: source with a `random` method
+        """
+        if game < len(self._draws):
+            return _Mirror(self._rng, self._draws[game])
+        return self._rng
+
+
+def check_probs(p_a: float, p_b: float) -> None:
+    """Raises if the serve probabilities can't be simulated
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+
+    Raises:
+        ValueError: if either is outside [0, 1], or both are 1 or both 0 so
+        no tiebreak would ever end
+    """
+    if not (0 <= p_a <= 1 and 0 <= p_b <= 1):
+        raise ValueError(
+            f"Serve probabilities must be within [0, 1], got {p_a}, {p_b}"
+        )
+    if p_a == p_b and p_a in (0.0, 1.0):
+        raise ValueError(
+            "Tiebreaks would never end with serve probs both 1 or both 0"
+        )
+
+
+def play(
+    p_a: float,
+    p_b: float,
+    a_first: bool = True,
+    best_of: int = 3,
+    rng: Any = None,
+    sources: Optional[Callable[[int], Any]] = None,
+) -> MatchSummary:
+    """Simulates a match with the same rules and the same draws as
+    `sim_match`, only keeping what the statistics need. Each game and
+    tiebreak is played by `sim_game` and `sim_tiebreak` so each can be given
+    its own random source
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        a_first (bool, optional): True if 'a' serves first. Defaults to True.
+        best_of (int, optional): how many sets to play best of. Defaults to 3.
+        rng (Any, optional): random source for every game, as for
+        `sim_match`. Defaults to None to use the global `random` module
+        sources (Optional[Callable[[int], Any]], optional): takes the index
+        of a game in the match and returns the random source for it, used
+        instead of rng. Defaults to None.
+
+    Raises:
+        ValueError: if the serve probabilities fail `check_probs`
+
+    Returns:
+        MatchSummary: outcome, set scores, games, breaks and tiebreaks
+    """
+    check_probs(p_a, p_b)
+    first_to = best_of // 2 + 1
+    sets: List[Tuple[int, int]] = []
+    st_a = 0
+    games = 0
+    breaks_a = 0
+    breaks_b = 0
+    tiebreaks = 0
+    a_serving = a_first
+    while st_a < first_to and len(sets) - st_a < first_to:
+        g_a = 0
+        g_b = 0
+        while True:
+            source = rng if sources is None else sources(games)
+            games += 1
+            if g_a == 6 and g_b == 6:
+                tiebreaks += 1
+                if sim_tiebreak(p_a, p_b, a_serving, OUTCOME, source)[0]:
+                    g_a += 1
+                else:
+                    g_b += 1
+                a_serving = not a_serving
+                break
+            p_s = p_a if a_serving else p_b
+            if sim_game(p_s, record=OUTCOME, rng=source)[0] == a_serving:
+                g_a += 1
+                breaks_a += not a_serving
+            else:
+                g_b += 1
+                breaks_b += a_serving
+            a_serving = not a_serving
+            if max(g_a, g_b) >= 6 and abs(g_a - g_b) >= 2:
+                break
+        sets.append((g_a, g_b))
+        st_a += g_a > g_b
+    return MatchSummary(
+        st_a == first_to, sets, games, breaks_a, breaks_b, tiebreaks
+    )
+
+
+def summarise(result: tuple, a_first: bool = True) -> MatchSummary:
+    """Summarises a `sim_match` result, recorded with SUMMARY or FULL, into
+    what the statistics need
+
+    Args:
+        result (tuple): output of `sim_match`
+        a_first (bool, optional): True if 'a' served first in the match.
+        Defaults to True.
+
+    Returns:
+        MatchSummary: outcome, set scores, games, breaks and tiebreaks
+    """
+    sets = []
+    games = 0
+    breaks_a = 0
+    breaks_b = 0
+    tiebreaks = 0
+    a_serving = a_first
+    for progression in result[2]:
+        g_a = 0
+        g_b = 0
+        for x, y in progression:
+            if g_a == 6 and g_b == 6:
+                tiebreaks += 1
+            elif x > g_a and not a_serving:
+                breaks_a += 1
+            elif y > g_b and a_serving:
+                breaks_b += 1
+            g_a = x
+            g_b = y
+            a_serving = not a_serving
+        games += len(progression)
+        sets.append((g_a, g_b))
+    return MatchSummary(result[0], sets, games, breaks_a, breaks_b, tiebreaks)
+
+
+def a_won(summary: MatchSummary) -> float:
+    """1 if 'a' won the match, else 0"""
+    return float(summary.a_won)
+
+
+def sets_a(summary: MatchSummary) -> float:
+    """Sets won by 'a'"""
+    return float(sum(x > y for x, y in summary.sets))
+
+
+def total_sets(summary: MatchSummary) -> float:
+    """Sets played"""
+    return float(len(summary.sets))
+
+
+def total_games(summary: MatchSummary) -> float:
+    """Games played, with a tiebreak counted as a game"""
+    return float(summary.games)
+
+
+def total_breaks(summary: MatchSummary) -> float:
+    """Breaks of serve by either player"""
+    return float(summary.breaks_a + summary.breaks_b)
+
+
+def scoreline(st_a: int, st_b: int) -> Statistic:
+    """Statistic that is 1 if the match ends with the given score in sets
+
+    Args:
+        st_a (int): sets won by 'a'
+        st_b (int): sets won by 'b'
+
+    Returns:
+        Statistic: indicator of the scoreline
+    """
+
+    def _scoreline(summary: MatchSummary) -> float:
+        won = sets_a(summary)
+        return float(won == st_a and total_sets(summary) - won == st_b)
+
+    return _scoreline
+
+
+def controls(
+    p_a: float, p_b: float, best_of: int = 3, a_first: bool = True
+) -> Dict[str, Tuple[Statistic, float]]:
+    """Statistics whose means are known exactly from the closed forms, to use
+    as control variates
+
+    Args:
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        best_of (int, optional): how many sets match is 'best of'.
+        Defaults to 3.
+        a_first (bool, optional): True if 'a' serves first. Defaults to True.
+
+    Returns:
+        Dict[str, Tuple[Statistic, float]]: {name: (statistic, exact mean)}
+    """
+    # who serves first doesn't change the prob of winning a set
+    p_set = prob_set(p_a, p_b, 0, 0)
+    first_to = best_of // 2 + 1
+    mean_sets_a = sum(
+        prob * (first_to if a_w else x)
+        for a_w in (True, False)
+        for (w, x), prob in prob_match_outcome(
+            p_set if a_w else 1 - p_set, 0, 0, sets=best_of
+        )[1].items()
+    )
+    length = match_length_dist(p_a, p_b, best_of=best_of, a_first=a_first)
+    return {
+        "a_won": (a_won, prob_match(p_a, p_b, sets=best_of)),
+        "sets_a": (sets_a, mean_sets_a),
+        "total_sets": (
+            total_sets,
+            float(length.sets @ np.arange(length.sets.size)),
+        ),
+        "total_games": (
+            total_games,
+            float(length.games @ np.arange(length.games.size)),
+        ),
+    }
+
+
+def estimate(
+    stats: Dict[str, Statistic],
+    p_a: float,
+    p_b: float,
+    n: int,
+    best_of: int = 3,
+    a_first: bool = True,
+    antithetic: bool = True,
+    control: bool = True,
+    rng: Any = None,
+) -> Dict[str, Estimate]:
+    """Estimates the means of statistics of a match by simulation, with
+    two ways of needing fewer paths for the same precision:
+
+    - antithetic: matches are simulated in pairs, each game of the second
+      using one minus the uniforms of the same game of the first, see
+      `AntitheticPair`
+    - control: each statistic is corrected by regressing it on statistics
+      with exactly known means, see `controls`, and removing the part
+      explained by how far their sample means are from the truth
+
+    Args:
+        stats (Dict[str, Statistic]): {name: function of a `MatchSummary`}
+        p_a (float): prob that player 'a' wins a point on their serve
+        p_b (float): prob that player 'b' wins a point on their serve
+        n (int): matches to simulate, rounded up to even if antithetic
+        best_of (int, optional): how many sets match is 'best of'.
+        Defaults to 3.
+        a_first (bool, optional): True if 'a' serves first. Defaults to True.
+        antithetic (bool, optional): simulate antithetic pairs.
+        Defaults to True.
+        control (bool, optional): correct with control variates.
+        Defaults to True.
+        rng (Any, optional): random source with a `random` method, or a seed
+        for `random.Random`. Defaults to None for a fresh seed
+
+    Raises:
+        ValueError: if n is too small to estimate a standard error or the
+        serve probabilities fail `check_probs`
+
+    Returns:
+        Dict[str, Estimate]: {name: estimate} for each statistic
+    """
+    check_probs(p_a, p_b)
+    if not hasattr(rng, "random"):
+        rng = random.Random(rng)
+    ctrls = controls(p_a, p_b, best_of, a_first) if control else {}
+    funcs = list(stats.values()) + [x[0] for x in ctrls.values()]
+    group = 2 if antithetic else 1
+    units = -(-n // group)
+    if units <= len(ctrls) + 1:
+        raise ValueError(f"n={n} is too few paths to estimate an error")
+
+    # one row per path and one column per statistic then control
+    values = np.empty((units * group, len(funcs)))
+    for i in range(units):
+        if antithetic:
+            pair = AntitheticPair(rng)
+            paths = [
+                play(p_a, p_b, a_first, best_of, sources=pair.first),
+                play(p_a, p_b, a_first, best_of, sources=pair.second),
+            ]
+        else:
+            paths = [play(p_a, p_b, a_first, best_of, rng=rng)]
+        for j, summary in enumerate(paths):
+            values[i * group + j] = [f(summary) for f in funcs]
+
+    # plain Monte Carlo variance per path to compare against
+    plain = values.var(axis=0, ddof=1)[: len(stats)]
+    # average within each pair so the units are independent
+    units_vals = values.reshape(units, group, -1).mean(axis=1)
+    y = units_vals[:, : len(stats)]
+    ddof = 1
+    if ctrls:
+        known = np.array([x[1] for x in ctrls.values()])
+        z = units_vals[:, len(stats) :] - known
+        z_c = z - z.mean(axis=0)
+        y_c = y - y.mean(axis=0)
+        beta = np.linalg.lstsq(z_c, y_c, rcond=None)[0]
+        y = y - z @ beta
+        ddof += len(ctrls)
+
+    means = y.mean(axis=0)
+    var = ((y - means) ** 2).sum(axis=0) / (units - ddof)
+    # anything the controls explain exactly is only left with rounding
+    var[var <= 1e-20 * plain] = 0.0
+    out = {}
+    for k, name in enumerate(stats):
+        se2 = var[k] / units
+        if se2 > 0:
+            gain = plain[k] / (units * group) / se2
+        else:
+            gain = float("inf") if plain[k] > 0 else 1.0
+        out[name] = Estimate(
+            float(means[k]), float(se2 ** 0.5), units * group, float(gain)
+        )
+    return out
+
+
+# statistics that come ready made, keyed by name
+STATISTICS: Dict[str, Statistic] = {
+    "a_won": a_won,
+    "sets_a": sets_a,
+    "total_sets": total_sets,
+    "total_games": total_games,
+    "total_breaks": total_breaks,
+}
+
@@ -0,0 +1,128 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+import numpy as np
+
+
+def shard_seeds(seed: Optional[int], shards: int) -> List[int]:
+    """Derives independent seeds for each shard from one master seed
+
+    Args:
+        seed (Optional[int]): master seed. If None then fresh entropy is used
+        and the run will not be reproducible
+        shards (int): how many seeds to derive
+
+    Returns:
+        List[int]: one seed per shard
+    """
+    children = np.random.SeedSequence(seed).spawn(shards)
+    return [int(x.generate_state(1)[0]) for x in children]
+
+
+def shard_sizes(n: int, shards: int) -> List[int]:
+    """Splits n simulations as evenly as possible across shards
+
+    Args:
+        n (int): total count of simulations
+        shards (int): how many shards to split across
+
+    Returns:
+        List[int]: count of simulations in each shard
+    """
+    return [n // shards + (1 if i < n % shards else 0) for i in range(shards)]
+
+
+def _run_shard(
+    sim: Callable,
+    n: int,
+    seed: int,
+    args: tuple,
+    kwargs: dict,
+    reduce: Optional[Callable[[list], Any]],
+) -> Any:
+    """Runs one shard of simulations with its own seeded random source,
+    passed to sim as `rng` so the global `random` state is never touched
+
+    Args:
+        sim (Callable): simulation function e.g. `sim_match`, taking `rng`
+        n (int): count of simulations in this shard
+        seed (int): seed for the random stream of this shard
+        args (tuple): positional args for sim
+        kwargs (dict): keyword args for sim
+        reduce (Optional[Callable[[list], Any]]): applied to the shard's list
+        of results before sending them back, if given
+
+    Returns:
+        Any: list of results, or the reduced result
+    """
+    # same stream as seeding the global state, without changing the caller's
+    # when the shard runs in their process
+    rng = random.Random(seed)
+    results = [sim(*args, rng=rng, **kwargs) for x in range(n)]
+    if reduce is not None:
+        return reduce(results)
+    return results
+
+
+def sim_parallel(
+    sim: Callable,
+    n: int,
+    *args: Any,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    reduce: Optional[Callable[[list], Any]] = None,
+    combine: Optional[Callable[[list], Any]] = None,
+    **kwargs: Any,
+) -> Any:
+    """Runs n simulations of sim (e.g. `sim_match`) across a process pool.
+    The simulations are split into one shard per worker and each shard gets
+    its own random stream derived from the master seed, so the same seed and
+    worker count always give the same results
+
+    Args:
+        sim (Callable): simulation function e.g. `sim_match`, `sim_set`,
+        which must take a `random.Random` as its `rng` keyword
+        n (int): total count of simulations to run
+        *args (Any): positional args passed to each sim call
+        seed (Optional[int], optional): master seed. Defaults to None for a
+        run that is not reproducible
+        workers (Optional[int], optional): count of worker processes. Defaults
+        to None for one per cpu
+        reduce (Optional[Callable[[list], Any]], optional): applied in the
+        worker to its list of results so only the reduced value is sent back.
+        Defaults to None to send back every result
+        combine (Optional[Callable[[list], Any]], optional): applied to the
+        list of shard results in shard order. Defaults to None to concatenate
+        the results (or return the list of reduced values if reduce given)
+        **kwargs (Any): keyword args passed to each sim call, other than rng
+
+    Raises:
+        ValueError: if rng is given, as each shard has its own
+
+    Returns:
+        Any: combined results of all simulations
+    """
+    if "rng" in kwargs:
+        raise ValueError("rng is set per shard from seed so can't be given")
+    workers = workers or os.cpu_count() or 1
+    sizes = shard_sizes(n, workers)
+    seeds = shard_seeds(seed, workers)
+    jobs = [(sim, x, y, args, kwargs, reduce) for x, y in zip(sizes, seeds)]
+
+    if workers == 1:
+        # no need to pay for a pool
+        shards = [_run_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(_run_shard, *zip(*jobs)))
+
+    if combine is not None:
+        return combine(shards)
+    if reduce is not None:
+        return shards
+    return [x for shard in shards for x in shard]
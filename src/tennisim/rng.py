@@ -0,0 +1,44 @@
+from itertools import chain
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+
+class BufferedUniform:
+    """Random source that pre-draws uniforms in large blocks from a numpy
+    generator and hands them out one at a time. It has the same `random`
+    method as `random.Random` so can be passed as `rng` to any of the
+    simulation functions in `tennisim.sim`. Each instance has its own
+    generator so separate simulations never share state
+
+    Args:
+        rng (Optional[Union[int, np.random.Generator]], optional): numpy
+        random generator or seed to create one. Defaults to None for a
+        freshly seeded generator
+        block (int, optional): how many uniforms to draw at once.
+        Defaults to 65536
+    """
+
+    def __init__(
+        self,
+        rng: Optional[Union[int, np.random.Generator]] = None,
+        block: int = 65536,
+    ) -> None:
+        self.gen = np.random.default_rng(rng)
+        self.block = block
+        # handing out from a chain of python floats keeps each draw in C
+        # rather than paying for a python level method call per point
+        draws: Iterator[float] = chain.from_iterable(self._blocks())
+        self.random = draws.__next__
+
+    def _blocks(self) -> Iterator[List[float]]:
+        """Yields blocks of uniforms on [0, 1) forever
+
+        Yields:
+            Iterator[List[float]]: next block of uniforms
+        """
+        while True:
+            yield self.gen.random(self.block).tolist()
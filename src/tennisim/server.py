@@ -0,0 +1,343 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any
+from typing import DefaultDict
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+
+from tennisim import vector
+
+# score state keys of a query, all optional and 0 by default
+STATE_KEYS = ("st_a", "st_b", "g_a", "g_b", "pt_a", "pt_b")
+
+
+def parse_query(query: Dict[str, Any]) -> Tuple[float, float, tuple, int]:
+    """Checks a pricing query and pulls out what is needed to price it
+
+    Args:
+        query (Dict[str, Any]): {"p_a": .., "p_b": .., "st_a": .., ...,
+        "sets": ..} with the state keys and sets optional
+
+    Raises:
+        ValueError: if the serve probs are missing or not within [0, 1],
+        both are 0 or both 1 so tiebreaks never end, sets is not a positive
+        odd number or the score state can't happen in a match of that many
+        sets
+
+    Returns:
+        Tuple[float, float, tuple, int]: p_a, p_b, score state and sets
+    """
+    try:
+        p_a = float(query["p_a"])
+        p_b = float(query["p_b"])
+        state = tuple(int(query.get(x, 0)) for x in STATE_KEYS)
+        sets = int(query.get("sets", 3))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(
+            "Query must have numeric p_a and p_b and integer state and sets"
+        ) from e
+    if not (0 <= p_a <= 1 and 0 <= p_b <= 1):
+        raise ValueError("Serve probabilities must be within [0, 1]")
+    if p_a == p_b and p_a in (0.0, 1.0):
+        # every point goes with serve, or against it, so no tiebreak ends
+        raise ValueError("Serve probabilities can't both be 0 or both be 1")
+    if sets < 1 or sets % 2 == 0:
+        raise ValueError(f"sets must be a positive odd number, got {sets}")
+    st_a, st_b, g_a, g_b, pt_a, pt_b = state
+    win_m = sets // 2 + 1
+    if not (0 <= st_a < win_m and 0 <= st_b < win_m):
+        raise ValueError(f"Sets won must be within [0, {win_m - 1}]")
+    if not (0 <= g_a <= 7 and 0 <= g_b <= 7):
+        raise ValueError("Games won must be within [0, 7]")
+    if pt_a < 0 or pt_b < 0:
+        raise ValueError("Points won can't be negative")
+    return p_a, p_b, state, sets
+
+
+class PricingServer:
+    """Asyncio server that prices match win probabilities for queries of
+    serve probs and match state. Queries that arrive close together, from
+    one client or many, are held for up to `window` seconds and then priced
+    together with one `vector.prob_match` call per 'best of' rather than one
+    `prob_match` call each. A batch is priced straight away once it reaches
+    `max_batch` queries so bursts don't wait for the window
+
+    Clients send one JSON object per line, e.g.
+    {"id": 1, "p_a": 0.65, "p_b": 0.6, "st_a": 1, "g_a": 3, "g_b": 2}
+    and get back one line per query, e.g. {"id": 1, "prob": 0.87}, or
+    {"id": 1, "error": "..."} if the query is bad. Replies can come back out
+    of order so queries should carry an id
+
+    Args:
+        window (float, optional): most seconds a query waits for others to
+        join its batch. Defaults to 0.002.
+        max_batch (int, optional): most queries priced in one batch.
+        Defaults to 1024.
+    """
+
+    def __init__(self, window: float = 0.002, max_batch: int = 1024) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.queries = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def _ensure_started(self) -> None:
+        """Creates the queue and batching task inside the running loop"""
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._full = asyncio.Event()
+            self._batcher = asyncio.get_running_loop().create_task(
+                self._run()
+            )
+
+    async def price(self, query: Dict[str, Any]) -> float:
+        """Prices one query as part of the next batch
+
+        Args:
+            query (Dict[str, Any]): serve probs and optional state and sets
+
+        Raises:
+            ValueError: if the query is bad
+
+        Returns:
+            float: probability that player 'a' wins the match
+        """
+        self._ensure_started()
+        assert self._queue is not None and self._full is not None
+        parsed = parse_query(query)
+        fut = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((parsed, fut))
+        # the batcher may already hold the first query of the batch
+        if self._queue.qsize() >= self.max_batch - 1:
+            self._full.set()
+        return await fut
+
+    async def _run(self) -> None:
+        """Collects queued queries into batches and prices them forever"""
+        assert self._queue is not None and self._full is not None
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.max_batch - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._evaluate(batch)
+
+    def _evaluate(self, batch: List[Tuple[tuple, asyncio.Future]]) -> None:
+        """Prices a batch of queries and hands each result to its future
+
+        Args:
+            batch (List[Tuple[tuple, asyncio.Future]]): parsed queries and
+            the futures waiting on them
+        """
+        self.batches += 1
+        self.queries += len(batch)
+        # vector.prob_match takes one 'best of' per call
+        by_sets: DefaultDict[int, list] = defaultdict(list)
+        for parsed, fut in batch:
+            by_sets[parsed[3]].append((parsed, fut))
+        for sets, items in by_sets.items():
+            try:
+                probs = self._prob_match([x[0] for x in items], sets)
+            except Exception:
+                # price one at a time so only the bad queries get the error
+                for x in items:
+                    self._settle([x], sets)
+                continue
+            self._resolve(items, probs)
+
+    @staticmethod
+    def _prob_match(parsed: List[tuple], sets: int) -> List[float]:
+        """Prices parsed queries with the same 'best of' in one call
+
+        Args:
+            parsed (List[tuple]): outputs of `parse_query`
+            sets (int): how many sets the matches are 'best of'
+
+        Raises:
+            ValueError: if any price comes out as nan or infinite
+
+        Returns:
+            List[float]: probability that player 'a' wins each match
+        """
+        p_a = np.array([x[0] for x in parsed])
+        p_b = np.array([x[1] for x in parsed])
+        st_a, st_b, g_a, g_b, pt_a, pt_b = np.array(
+            [x[2] for x in parsed]
+        ).T
+        probs = vector.prob_match(
+            p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b, sets=sets
+        )
+        if not np.all(np.isfinite(probs)):
+            raise ValueError("Query has no finite price")
+        return probs.tolist()
+
+    def _settle(
+        self, items: List[Tuple[tuple, asyncio.Future]], sets: int
+    ) -> None:
+        """Prices queries and hands each future its result, or the error if
+        pricing fails
+
+        Args:
+            items (List[Tuple[tuple, asyncio.Future]]): parsed queries with
+            the same 'best of' and the futures waiting on them
+            sets (int): how many sets the matches are 'best of'
+        """
+        try:
+            probs = self._prob_match([x[0] for x in items], sets)
+        except Exception as e:
+            for x, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self._resolve(items, probs)
+
+    @staticmethod
+    def _resolve(
+        items: List[Tuple[tuple, asyncio.Future]], probs: List[float]
+    ) -> None:
+        """Hands each future its price
+
+        Args:
+            items (List[Tuple[tuple, asyncio.Future]]): parsed queries and
+            the futures waiting on them
+            probs (List[float]): price of each query
+        """
+        for prob, (x, fut) in zip(probs, items):
+            # client may have gone away and cancelled it
+            if not fut.done():
+                fut.set_result(prob)
+
+    async def _reply(
+        self, line: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        """Prices one line from a client and writes back the reply
+
+        Args:
+            line (bytes): JSON query
+            writer (asyncio.StreamWriter): stream back to the client
+        """
+        reply: Dict[str, Any] = {}
+        try:
+            query = json.loads(line)
+            if isinstance(query, dict):
+                reply["id"] = query.get("id")
+            reply["prob"] = await self.price(query)
+        except Exception as e:
+            reply["error"] = str(e)
+        writer.write(json.dumps(reply).encode() + b"\n")
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serves one client connection until it closes
+
+        Args:
+            reader (asyncio.StreamReader): stream from the client
+            writer (asyncio.StreamWriter): stream back to the client
+        """
+        # price each line as its own task so a client's queries batch up
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self._reply(line, writer))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Starts listening for clients over TCP
+
+        Args:
+            host (str, optional): address to listen on.
+            Defaults to "127.0.0.1".
+            port (int, optional): port to listen on. Defaults to 0 for any
+            free port
+
+        Returns:
+            int: port being listened on
+        """
+        self._ensure_started()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start_unix(self, path: str) -> None:
+        """Starts listening for clients on a unix socket
+
+        Args:
+            path (str): path of the socket file
+        """
+        self._ensure_started()
+        self._server = await asyncio.start_unix_server(self._handle, path)
+
+    async def close(self) -> None:
+        """Stops listening and stops the batching task"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+
+async def fetch(
+    queries: Sequence[Dict[str, Any]],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Simple client that sends queries to a `PricingServer` down one
+    connection and waits for all the replies
+
+    Args:
+        queries (Sequence[Dict[str, Any]]): queries to price
+        host (str, optional): server address. Defaults to "127.0.0.1".
+        port (int, optional): server port. Defaults to 0.
+        path (Optional[str], optional): unix socket to connect to instead of
+        TCP. Defaults to None.
+
+    Returns:
+        List[Dict[str, Any]]: replies in the same order as the queries
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i, query in enumerate(queries):
+            writer.write(json.dumps({**query, "id": i}).encode() + b"\n")
+        await writer.drain()
+        replies: List[Dict[str, Any]] = [{} for x in queries]
+        for x in queries:
+            reply = json.loads(await reader.readline())
+            replies[reply["id"]] = reply
+    finally:
+        writer.close()
+    return replies
@@ -1,8 +1,9 @@
 from typing import List, Tuple
 
+from tennisim.binom import comb_row
+from tennisim.binom import power_table
 from tennisim.game import theory_game
 from tennisim.tiebreak import prob_tiebreak
-from tennisim.utils import comb
 
 
 def prob_set_outcome(
@@ -49,6 +50,12 @@ def prob_set_outcome(
     # and breaking all the rest needed
     # all while ensuring we hit the target of g_to_win
 
+    # combination counts and powers of the game win probs to build the
+    # binomial probs of winning each count of service and return games
+    c_s = comb_row(g_s)
+    c_r = comb_row(g_r)
+    s_w, s_l = power_table(s_a, g_s)
+    r_w, r_l = power_table(r_a, g_r)
     for g in range(g_to_win + 1)[::-1]:
         # win them all on your serve
         # if we have enough services
@@ -61,12 +68,12 @@ def prob_set_outcome(
                 # then compute probability
                 p = (
                     f_a
-                    * comb(g_s, g)
-                    * s_a ** g
-                    * (1 - s_a) ** (g_s - g)
-                    * comb(g_r, r_to_win)
-                    * r_a ** r_to_win
-                    * (1 - r_a) ** (g_r - r_to_win)
+                    * c_s[g]
+                    * s_w[g]
+                    * s_l[g_s - g]
+                    * c_r[r_to_win]
+                    * r_w[r_to_win]
+                    * r_l[g_r - r_to_win]
                 )
                 # add to total prob
                 prob += p
@@ -1,47 +1,110 @@
 import random
-from typing import List
+from typing import Any
 from typing import Tuple
 from typing import Union
 
+# levels of detail the simulation functions can record
+# outcome: only who won, no score progressions are kept
+# summary: final score of each game rather than every point
+# full: every point of every game, as consumed by `reformat_match`
+OUTCOME = "outcome"
+SUMMARY = "summary"
+FULL = "full"
+RECORD_LEVELS = (OUTCOME, SUMMARY, FULL)
 
-def sim_point(p_s: float) -> bool:
+
+def check_record(record: str) -> None:
+    """Raises if record is not one of the known recording levels
+
+    Args:
+        record (str): recording level passed to a simulation function
+
+    Raises:
+        ValueError: if record is not in RECORD_LEVELS
+    """
+    if record not in RECORD_LEVELS:
+        raise ValueError(
+            f"record must be one of {RECORD_LEVELS}, got {record!r}"
+        )
+
+
+def _summarise(scores: Any, score: Tuple[int, int], record: str) -> Any:
+    """Returns what a game or tiebreak should report for its scores given
+    the recording level
+
+    Args:
+        scores (Any): progression of points if being kept, else None
+        score (Tuple[int, int]): final score
+        record (str): recording level
+
+    Returns:
+        Any: the progression for full, the
+        final score for summary and None for outcome
+    """
+    if record == FULL:
+        return scores
+    elif record == SUMMARY:
+        return score
+    return None
+
+
+def sim_point(p_s: float, rng: Any = None) -> bool:
     """Simulate point in tennis by drawing from uni dist
 
     Args:
         p_s (float): probability server wins point
+        rng (Any, optional): random source with a `random` method returning
+        uniforms on [0, 1) e.g. `random.Random` or `BufferedUniform`.
+        Defaults to None to use the global `random` module
 
     Returns:
         bool: True if server won, False if not
     """
-    return random.uniform(0, 1) <= p_s
+    if rng is None:
+        rng = random
+    return rng.random() <= p_s
 
 
-def sim_game(p_s: float, ppg: int = 4) -> Tuple[bool, List[Tuple[int, int]]]:
+def sim_game(
+    p_s: float, ppg: int = 4, record: str = FULL, rng: Any = None
+) -> Tuple[bool, Any]:
     """Simulate game of tennis using just prob server wins point
 
     Args:
         p_s (float): probability server wins point
         ppg (int): points per game in case want to play with longer game length
+        record (str, optional): recording level, one of RECORD_LEVELS.
+        Defaults to FULL to keep every point
+        rng (Any, optional): random source with a `random` method returning
+        uniforms on [0, 1) e.g. `random.Random` or `BufferedUniform`.
+        Defaults to None to use the global `random` module
 
     Returns:
         Tuple[bool, list]: tuple of True if server won game and list
         of tuples of points as the game progressed. E.g. if server won all
-        points would return (True, [(1,0),(2,0),(3,0),(4,0)])
+        points would return (True, [(1,0),(2,0),(3,0),(4,0)]). For SUMMARY
+        the list is replaced by the final score e.g. (4,0) and for OUTCOME
+        by None
     """
-    scores = []
+    check_record(record)
+    full = record == FULL
+    # look up the draw once rather than calling sim_point every point
+    draw = random.random if rng is None else rng.random
+    scores: Any = [] if full else None
     # s and r are points scored by server and returner
     s = 0
     r = 0
     # while game still going
     while (s < ppg) and (r < ppg):
         # simulate the point
-        if sim_point(p_s):
+        if draw() <= p_s:
             s += 1
         else:
             r += 1
 
         # add score tuple to the score list
-        scores.append((s, r))
+        if full:
+            scores.append((s, r))
 
         # we need a catcher here if we get to 3-3
         # so that we can handle deuce
@@ -49,7 +112,7 @@ def sim_game(p_s: float, ppg: int = 4) -> Tuple[bool, List[Tuple[int, int]]]:
             # give a bit more space
             while (s < (ppg + 1)) and (r < (ppg + 1)):
                 # simulate the point
-                if sim_point(p_s):
+                if draw() <= p_s:
                     s += 1
                 else:
                     r += 1
@@ -58,24 +121,29 @@ def sim_game(p_s: float, ppg: int = 4) -> Tuple[bool, List[Tuple[int, int]]]:
                     s = ppg - 1
                     r = ppg - 1
                 # add score tuple to the score list
-                scores.append((s, r))
+                if full:
+                    scores.append((s, r))
             # if we've exited then must be game over after deuce
             if s == ppg + 1:
-                return (True, scores)
+                return (True, _summarise(scores, (s, r), record))
             elif r == ppg + 1:
-                return (False, scores)
+                return (False, _summarise(scores, (s, r), record))
 
     # if here then must have finished game pre-deuce
     # return True if server wins, false if returner
     if s == ppg:
-        return (True, scores)
+        return (True, _summarise(scores, (s, r), record))
     else:
-        return (False, scores)
+        return (False, _summarise(scores, (s, r), record))
 
 
 def sim_tiebreak(
-    a_s: float, b_s: float, a_first: bool = True
-) -> Tuple[bool, list]:
+    a_s: float,
+    b_s: float,
+    a_first: bool = True,
+    record: str = FULL,
+    rng: Any = None,
+) -> Tuple[bool, Any]:
     """Simulate tiebreak using probab of each player winning on serve
 
     Args:
@@ -83,12 +151,21 @@ def sim_tiebreak(
         b_s (float): probability player b wins point on serve
         a_first (bool, optional): bool to mark who serves first.
         Defaults to True for player a to serve first
+        record (str, optional): recording level, one of RECORD_LEVELS.
+        Defaults to FULL to keep every point
+        rng (Any, optional): random source with a `random` method returning
+        uniforms on [0, 1) e.g. `random.Random` or `BufferedUniform`.
+        Defaults to None to use the global `random` module
 
     Returns:
         Tuple[bool, list]: returns tuple of result (True if a won, false if b)
-        and the progression of tiebreak points
+        and the progression of tiebreak points. For SUMMARY the progression
+        is replaced by the final score and for OUTCOME by None
     """
-    tb_scores = []
+    check_record(record)
+    full = record == FULL
+    draw = random.random if rng is None else rng.random
+    tb_scores: Any = [] if full else None
     a = 0
     b = 0
     points_served = 0
@@ -98,30 +175,31 @@ def sim_tiebreak(
     while True:
         # then serve and sim point
         if server:
-            point = sim_point(a_s)
+            point = draw() <= a_s
             # if true then server has won
             if point:
                 a += 1
             else:
                 b += 1
         else:
-            point = sim_point(b_s)
+            point = draw() <= b_s
             # if true then server has won
             if point:
                 b += 1
             else:
                 a += 1
-        tb_scores.append((a, b))
+        if full:
+            tb_scores.append((a, b))
 
         # check to see if a has won
         if (a >= 7) and (a - b) >= 2:
             # a has won by being >=7 and 2 points clear
-            return (True, tb_scores)
+            return (True, _summarise(tb_scores, (a, b), record))
 
         # check to see if b has won
         if (b >= 7) and (b - a) >= 2:
             # b has won by being >=7 and 2 points clear
-            return (False, tb_scores)
+            return (False, _summarise(tb_scores, (a, b), record))
 
         # if we need to continue because no one won
         # then need to handle who serves next
@@ -129,7 +207,7 @@ def sim_tiebreak(
         # add to points served var and determine new server
         points_served += 1
         # check at start to see if we have only served 1
-        if len(tb_scores) == 1:
+        if a + b == 1:
             # then only played 1, but swap server
             server = not server
             points_served = 0
@@ -141,7 +219,11 @@ def sim_tiebreak(
 
 
 def sim_set(
-    a_s: float, b_s: float, a_first: bool = True
+    a_s: float,
+    b_s: float,
+    a_first: bool = True,
+    record: str = FULL,
+    rng: Any = None,
 ) -> Union[Tuple, Tuple[bool, list, list]]:
     """Simulate set using probab of each player winning on serve
 
@@ -150,22 +232,32 @@ def sim_set(
         b_s (float): probability player b wins point on serve
         a_first (bool, optional): bool to mark who serves first.
         Defaults to True for player a to serve first
+        record (str, optional): recording level, one of RECORD_LEVELS.
+        Defaults to FULL to keep every point
+        rng (Any, optional): random source with a `random` method returning
+        uniforms on [0, 1) e.g. `random.Random` or `BufferedUniform`.
+        Defaults to None to use the global `random` module
 
     Returns:
         Union[Tuple, Tuple[bool, list, list]]: returns tuple of
         result (True if a won, false if b), list of progression of game scores
-        and list of progression of scores within games
+        and list of progression of scores within games. For SUMMARY each game
+        only has its final score and for OUTCOME the game progression is
+        replaced by the final game score and the scores within games by None
     """
+    check_record(record)
     # checker to prevent infinite tiebreak
     if (a_s == 1) and (b_s == 1):
         print("Each player will win every service point")
         print("Will enter infinite tiebreak loop")
         return ()
 
+    # only keep the progressions if not just after the outcome
+    keep = record != OUTCOME
     # games is a storing variable for game scores
-    game_scores = []
+    game_scores: Any = [] if keep else None
     # games stores game score in set
-    games = []
+    games: Any = [] if keep else None
     # a and b are count of games won for each player
     a = 0
     b = 0
@@ -174,7 +266,7 @@ def sim_set(
     while True:
         # simulate the game and set new server
         if a_first:
-            game = sim_game(a_s)
+            game = sim_game(a_s, record=record, rng=rng)
             a_first = not a_first
             # update score
             if game[0]:
@@ -184,7 +276,7 @@ def sim_set(
                 # a was broken
                 b += 1
         else:
-            game = sim_game(b_s)
+            game = sim_game(b_s, record=record, rng=rng)
             a_first = not a_first
             # update score
             if game[0]:
@@ -195,42 +287,48 @@ def sim_set(
                 a += 1
 
         # add game to game list and scores
-        game_scores.append(game[1])
-        games.append((a, b))
+        if keep:
+            game_scores.append(game[1])
+            games.append((a, b))
 
         # check if a has won
         if a >= 6 and (a - b) >= 2:
             # a has won either 6-0/1/2/3/4
             # or a has won 7-5
-            return (True, games, game_scores)
+            return (True, games if keep else (a, b), game_scores)
 
         # check if b has won
         if b >= 6 and (b - a) >= 2:
             # b has won either 6-0/1/2/3/4
             # or a has won 7-5
-            return (False, games, game_scores)
+            return (False, games if keep else (a, b), game_scores)
 
         # check if we should start a tiebreak
         if a == 6 and b == 6:
             # then we are in a tie break
-            tb_result = sim_tiebreak(a_s, b_s, a_first=a_first)
+            tb_result = sim_tiebreak(
+                a_s, b_s, a_first=a_first, record=record, rng=rng
+            )
             # update score
             if tb_result[0]:
                 a += 1
             else:
                 b += 1
-            games.append((a, b))
-            game_scores.append(tb_result[1])
+            if keep:
+                games.append((a, b))
+                game_scores.append(tb_result[1])
             # return result
-            if a > b:
-                return (True, games, game_scores)
-            else:
-                return (False, games, game_scores)
+            return (a > b, games if keep else (a, b), game_scores)
 
 
 def sim_match(
-    a_s: float, b_s: float, a_first: bool = True, best_of: int = 3
-) -> Tuple[bool, list, list, list]:
+    a_s: float,
+    b_s: float,
+    a_first: bool = True,
+    best_of: int = 3,
+    record: str = FULL,
+    rng: Any = None,
+) -> Tuple[bool, Any, Any, Any]:
     """Simulate tennis match using probab of each player winning on serve
 
     Args:
@@ -239,16 +337,24 @@ def sim_match(
         a_first (bool, optional): bool to mark who serves first.
         Defaults to True for player a to serve first
         best_of (int, optional): how many sets to play best of. Defaults to 3.
+        record (str, optional): recording level, one of RECORD_LEVELS.
+        Defaults to FULL to keep every point
+        rng (Any, optional): random source with a `random` method returning
+        uniforms on [0, 1) e.g. `random.Random` or `BufferedUniform`.
+        Defaults to None to use the global `random` module
 
     Returns:
         Tuple[bool, list, list, list]: returns tuple of result (true if a won,
         false if b won), progression of match scores, set scores and
-        game scores within those sets
+        game scores within those sets. For SUMMARY the game scores only have
+        the final score of each game and for OUTCOME the match progression is
+        replaced by the final score in sets and the others by None
     """
-
-    set_scores = []
-    game_scores = []
-    match_scores = []
+    check_record(record)
+    keep = record != OUTCOME
+    set_scores: Any = [] if keep else None
+    game_scores: Any = [] if keep else None
+    match_scores: Any = [] if keep else None
     a = 0
     b = 0
 
@@ -257,7 +363,9 @@ def sim_match(
 
     while True:
         # simulate the set
-        s = sim_set(a_s, b_s, a_first=starting_server)
+        s = sim_set(
+            a_s, b_s, a_first=starting_server, record=record, rng=rng
+        )
         # add to set totals
         if s[0]:
             # a won the set
@@ -267,17 +375,24 @@ def sim_match(
             b += 1
 
         # update list vars
-        game_scores.append(s[2])
-        set_scores.append(s[1])
-        match_scores.append((a, b))
+        if keep:
+            game_scores.append(s[2])
+            set_scores.append(s[1])
+            match_scores.append((a, b))
+            games_played = len(s[1])
+        else:
+            games_played = sum(s[1])
 
         # check if we have finished the match yet
-        if a == first_to:
-            return (True, match_scores, set_scores, game_scores)
-        if b == first_to:
-            return (False, match_scores, set_scores, game_scores)
+        if a == first_to or b == first_to:
+            return (
+                a == first_to,
+                match_scores if keep else (a, b),
+                set_scores,
+                game_scores,
+            )
 
         # need to check who serves first in the next set
-        if len(s[1]) % 2 != 0:
+        if games_played % 2 != 0:
             # then we played an odd number of games so change
             starting_server = not starting_server
@@ -0,0 +1,417 @@
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+from tennisim.batch import MatchBatch
+from tennisim.batch import RNG
+from tennisim.batch import sim_match_batch
+
+# anything numpy can turn into an array
+ArrayLike = Any
+
+
+class RunningStats:
+    """Running count, mean and variance of a stream of values, kept in fixed
+    memory however many values are seen. Values come in chunks and each
+    chunk is folded in with the pairwise update of Chan et al., which is as
+    accurate as a two pass calculation. Two instances can be merged, e.g.
+    from separate shards, with the same update
+
+    Args:
+        shape (Tuple[int, ...], optional): shape of each value, e.g. (3,)
+        to follow 3 statistics at once. Defaults to () for single values.
+    """
+
+    def __init__(self, shape: Tuple[int, ...] = ()) -> None:
+        self.shape = shape
+        self.count = 0
+        self.mean = np.zeros(shape)
+        # sum of squared distances from the mean
+        self.m2 = np.zeros(shape)
+
+    def _combine(self, count: int, mean: np.ndarray, m2: np.ndarray) -> None:
+        """Folds in the count, mean and m2 of another set of values
+
+        Args:
+            count (int): count of the other values
+            mean (np.ndarray): mean of the other values
+            m2 (np.ndarray): sum of squared distances from their mean
+        """
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+        self.count = total
+
+    def update(self, values: ArrayLike) -> "RunningStats":
+        """Folds in a chunk of values
+
+        Args:
+            values (ArrayLike): values with shape (n,) + shape
+
+        Returns:
+            RunningStats: self, so calls can be chained
+        """
+        values = np.asarray(values, dtype=float).reshape((-1,) + self.shape)
+        if values.shape[0]:
+            mean = values.mean(axis=0)
+            m2 = ((values - mean) ** 2).sum(axis=0)
+            self._combine(values.shape[0], mean, m2)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Folds in everything seen by another instance
+
+        Args:
+            other (RunningStats): instance with the same shape
+
+        Raises:
+            ValueError: if the shapes differ
+
+        Returns:
+            RunningStats: self, so calls can be chained
+        """
+        if other.shape != self.shape:
+            raise ValueError(f"Shapes differ: {self.shape} vs {other.shape}")
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Sample variance of the values seen, nan until there are 2"""
+        if self.count < 2:
+            return np.full(self.shape, np.nan)
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std_err(self) -> np.ndarray:
+        """Standard error of the mean, nan until there are 2 values"""
+        return np.sqrt(self.variance / max(self.count, 1))
+
+
+class Histogram:
+    """Counts of non-negative integers in fixed bins 0 to size - 1, with one
+    more count for anything at or past size so memory never grows.
+    Mergeable with another histogram of the same size
+
+    Args:
+        size (int): count of bins
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.overflow = 0
+
+    def update(self, values: ArrayLike) -> "Histogram":
+        """Counts a chunk of values
+
+        Args:
+            values (ArrayLike): non-negative integers
+
+        Returns:
+            Histogram: self, so calls can be chained
+        """
+        values = np.asarray(values, dtype=np.int64).ravel()
+        over = values >= self.size
+        self.overflow += int(over.sum())
+        self.counts += np.bincount(values[~over], minlength=self.size)
+        return self
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Adds on the counts of another histogram
+
+        Args:
+            other (Histogram): histogram with the same size
+
+        Raises:
+            ValueError: if the sizes differ
+
+        Returns:
+            Histogram: self, so calls can be chained
+        """
+        if other.size != self.size:
+            raise ValueError(f"Sizes differ: {self.size} vs {other.size}")
+        self.counts += other.counts
+        self.overflow += other.overflow
+        return self
+
+    @property
+    def total(self) -> int:
+        """Count of values seen, including overflow"""
+        return int(self.counts.sum()) + self.overflow
+
+    @property
+    def pmf(self) -> np.ndarray:
+        """Share of values in each bin, indexed by the value"""
+        return self.counts / max(self.total, 1)
+
+
+class Counts:
+    """Frequency counts of hashable outcomes such as scorelines. Memory is
+    bounded by how many distinct outcomes there are, which is small for
+    scores. Mergeable with other counts
+    """
+
+    def __init__(self) -> None:
+        self.counts: Dict[Hashable, int] = {}
+
+    def update(self, keys: Iterable[Hashable]) -> "Counts":
+        """Counts each key once
+
+        Args:
+            keys (Iterable[Hashable]): outcomes to count
+
+        Returns:
+            Counts: self, so calls can be chained
+        """
+        counts = self.counts
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        return self
+
+    def add(self, key: Hashable, count: int = 1) -> "Counts":
+        """Adds count to one key
+
+        Args:
+            key (Hashable): outcome
+            count (int, optional): times it happened. Defaults to 1.
+
+        Returns:
+            Counts: self, so calls can be chained
+        """
+        self.counts[key] = self.counts.get(key, 0) + count
+        return self
+
+    def merge(self, other: "Counts") -> "Counts":
+        """Adds on the counts of another instance
+
+        Args:
+            other (Counts): counts to add
+
+        Returns:
+            Counts: self, so calls can be chained
+        """
+        for key, count in other.counts.items():
+            self.add(key, count)
+        return self
+
+    @property
+    def total(self) -> int:
+        """Count of everything seen"""
+        return sum(self.counts.values())
+
+    def freqs(self) -> Dict[Hashable, float]:
+        """Share of the total for each key, most common first
+
+        Returns:
+            Dict[Hashable, float]: {key: share}
+        """
+        total = max(self.total, 1)
+        ordered = sorted(self.counts.items(), key=lambda x: -x[1])
+        return {k: v / total for k, v in ordered}
+
+
+class MatchAggregator:
+    """Summarises any number of simulated matches in fixed memory. Takes
+    `sim_match` results one at a time with `add` or `MatchBatch` results with
+    `add_batch`, and keeps:
+
+    - stats: running mean and variance of each of STATS
+    - games: histogram of games per match, a tiebreak counted as a game
+    - points: histogram of points per match, from FULL results and batches
+      only, as SUMMARY and OUTCOME results don't say how long deuce went on
+    - set_scores: counts of each set score in games, e.g. (7, 5)
+    - scorelines: counts of each match score in sets, e.g. (2, 1)
+
+    Results from `add` are held in a small buffer and folded in a block at a
+    time. Aggregators for the same 'best of' can be merged across shards
+
+    Args:
+        best_of (int, optional): how many sets matches are 'best of'.
+        Defaults to 3.
+        max_points (int, optional): bins of the points histogram, longer
+        matches are counted in its overflow. Defaults to 1024.
+    """
+
+    # statistics followed by `stats`, in order
+    STATS = ("a_won", "sets", "games", "tiebreaks")
+    # results held before being folded in
+    BUFFER = 4096
+
+    def __init__(self, best_of: int = 3, max_points: int = 1024) -> None:
+        self.best_of = best_of
+        self.stats = RunningStats((len(self.STATS),))
+        self.games = Histogram(13 * best_of + 1)
+        self.points = Histogram(max_points)
+        self.set_scores = Counts()
+        self.scorelines = Counts()
+        self._rows: List[Tuple[float, int, int, int]] = []
+        self._points: List[int] = []
+
+    def add(self, result: tuple) -> None:
+        """Adds one `sim_match` result recorded with SUMMARY or FULL
+
+        Args:
+            result (tuple): output of `sim_match`
+
+        Raises:
+            ValueError: if the result was recorded with OUTCOME
+        """
+        set_progs = result[2]
+        if set_progs is None:
+            raise ValueError("Results must be recorded with SUMMARY or FULL")
+        games = 0
+        tiebreaks = 0
+        for prog in set_progs:
+            score = prog[-1]
+            self.set_scores.add(score)
+            games += len(prog)
+            tiebreaks += score[0] + score[1] == 13
+        self.scorelines.add(result[1][-1])
+        self._rows.append((result[0], len(set_progs), games, tiebreaks))
+        # only FULL results have every point of a game as a list
+        game_scores = result[3]
+        if isinstance(game_scores[0][0], list):
+            self._points.append(sum(len(g) for x in game_scores for g in x))
+        if len(self._rows) >= self.BUFFER:
+            self.flush()
+
+    def add_batch(self, batch: MatchBatch) -> None:
+        """Adds every match of a batch from `sim_match_batch`
+
+        Args:
+            batch (MatchBatch): batch of simulated matches
+        """
+        self.flush()
+        played = batch.games_a >= 0
+        games = np.where(played, batch.games_a + batch.games_b, 0).sum(axis=1)
+        rows = np.stack(
+            [
+                batch.winner,
+                batch.sets_a + batch.sets_b,
+                games,
+                batch.tiebreaks.sum(axis=1),
+            ],
+            axis=1,
+        )
+        self.stats.update(rows)
+        self.games.update(games)
+        self.points.update(batch.points)
+        scores = np.stack([batch.games_a[played], batch.games_b[played]], 1)
+        self._count_pairs(self.set_scores, scores)
+        sets = np.stack([batch.sets_a, batch.sets_b], axis=1)
+        self._count_pairs(self.scorelines, sets)
+
+    @staticmethod
+    def _count_pairs(counts: Counts, pairs: np.ndarray) -> None:
+        """Counts each distinct row of an array of pairs
+
+        Args:
+            counts (Counts): counts to add to
+            pairs (np.ndarray): array of shape (n, 2)
+        """
+        if not pairs.size:
+            return
+        uniq, freq = np.unique(pairs, axis=0, return_counts=True)
+        for (x, y), n in zip(uniq.tolist(), freq.tolist()):
+            counts.add((x, y), n)
+
+    def flush(self) -> None:
+        """Folds the buffered results into the running stats and histograms"""
+        if self._rows:
+            rows = np.array(self._rows, dtype=float)
+            self.stats.update(rows)
+            self.games.update(rows[:, 2])
+            self._rows.clear()
+        if self._points:
+            self.points.update(self._points)
+            self._points.clear()
+
+    def merge(self, other: "MatchAggregator") -> "MatchAggregator":
+        """Adds on everything seen by another aggregator
+
+        Args:
+            other (MatchAggregator): aggregator for the same 'best of'
+
+        Raises:
+            ValueError: if the aggregators are for different 'best of'
+
+        Returns:
+            MatchAggregator: self, so calls can be chained
+        """
+        if other.best_of != self.best_of:
+            raise ValueError(
+                f"best_of differs: {self.best_of} vs {other.best_of}"
+            )
+        self.flush()
+        other.flush()
+        self.stats.merge(other.stats)
+        self.games.merge(other.games)
+        self.points.merge(other.points)
+        self.set_scores.merge(other.set_scores)
+        self.scorelines.merge(other.scorelines)
+        return self
+
+    @property
+    def count(self) -> int:
+        """Matches seen"""
+        return self.stats.count + len(self._rows)
+
+    def means(self) -> Dict[str, float]:
+        """Mean of each of STATS over the matches seen
+
+        Returns:
+            Dict[str, float]: {name: mean}
+        """
+        self.flush()
+        return dict(zip(self.STATS, self.stats.mean.tolist()))
+
+
+def aggregate_matches(
+    a_s: float,
+    b_s: float,
+    n: int,
+    best_of: int = 3,
+    a_first: bool = True,
+    chunk: int = 100_000,
+    rng: RNG = None,
+) -> MatchAggregator:
+    """Simulates n matches with `sim_match_batch` a chunk at a time and
+    aggregates them, so memory stays the same however large n is
+
+    Args:
+        a_s (float): prob player a wins point on serve
+        b_s (float): prob player b wins point on serve
+        n (int): matches to simulate
+        best_of (int, optional): how many sets to play best of. Defaults to 3.
+        a_first (bool, optional): True if 'a' serves first. Defaults to True.
+        chunk (int, optional): matches simulated at once.
+        Defaults to 100_000.
+        rng (RNG, optional): numpy random generator or seed to create one.
+        Defaults to None for a freshly seeded generator
+
+    Raises:
+        ValueError: if a_s and b_s are both 1 or both 0 so tiebreaks never
+        end
+
+    Returns:
+        MatchAggregator: summary of every match
+    """
+    rng = np.random.default_rng(rng)
+    agg = MatchAggregator(best_of=best_of)
+    for start in range(0, n, chunk):
+        size = min(chunk, n - start)
+        agg.add_batch(
+            sim_match_batch(
+                a_s, b_s, size, a_first=a_first, best_of=best_of, rng=rng
+            )
+        )
+    return agg
@@ -1,6 +1,7 @@
 from typing import List, Tuple
 
-from tennisim.utils import comb
+from tennisim.binom import comb_row
+from tennisim.binom import power_table
 
 
 def compute_tb_outcomes(
@@ -156,6 +157,12 @@ def prob_tb_outcome(
     """
 
     prob = 0.00
+    # combination counts and powers of the point win probs on serve and
+    # return to build the binomial probs of each count of points won
+    c_s = comb_row(pt_s)
+    c_r = comb_row(pt_r)
+    s_w, s_l = power_table(p_a, pt_s)
+    r_w, r_l = power_table(1 - p_b, pt_r)
     # sub 1 as we know they win the final point
     n_a = ns[0] - 1
     # e.g. if 'a' needs 3 ex. final point this loops through [3, 2, 1, 0]
@@ -166,12 +173,8 @@ def prob_tb_outcome(
             # check if it is possible to win this many return points
             if n_r >= 0 and n_r <= pt_r:
                 # compute probabs
-                p_serve = (
-                    comb(pt_s, n_s) * p_a ** n_s * (1 - p_a) ** (pt_s - n_s)
-                )
-                p_return = (
-                    comb(pt_r, n_r) * (1 - p_b) ** n_r * p_b ** (pt_r - n_r)
-                )
+                p_serve = c_s[n_s] * s_w[n_s] * s_l[pt_s - n_s]
+                p_return = c_r[n_r] * r_w[n_r] * r_l[pt_r - n_r]
                 # multiply and also prob they win final point
                 p_all = p_f * p_serve * p_return
                 prob += p_all
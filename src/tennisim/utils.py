@@ -1,14 +1,20 @@
-from math import factorial
+from tennisim import binom
 
 
 def comb(n: int, r: int) -> float:
-    """Returns combination count for binomial
+    """Returns combination count for binomial. Kept for backwards
+    compatibility, see `tennisim.binom.comb` for the exact int version
 
     Args:
         n (int): how many options to choose from
         r (int): how many you want to choose
 
+    Raises:
+        ValueError: if r is outside [0, n], as the factorial version did
+
     Returns:
         int: count of combinations
     """
-    return factorial(n) / (factorial(n - r) * factorial(r))
+    if not 0 <= r <= n:
+        raise ValueError(f"r must be in [0, {n}], got {r}")
+    return float(binom.comb(n, r))
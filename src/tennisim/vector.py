@@ -0,0 +1,165 @@
+from typing import Any
+from typing import Callable
+from typing import Sequence
+
+import numpy as np
+
+from tennisim import game
+from tennisim import match
+from tennisim import set as set_
+from tennisim import tiebreak
+
+# anything numpy can turn into an array
+ArrayLike = Any
+
+
+def _by_state(
+    func: Callable,
+    probs: Sequence[ArrayLike],
+    states: Sequence[ArrayLike],
+    **kwargs: Any,
+) -> np.ndarray:
+    """Evaluates a scalar state probability function over arrays by grouping
+    the inputs by distinct score state and calling func once per state with
+    arrays of the probabilities in that state. This works as the closed forms
+    only branch on the score state and are pure arithmetic in the serve
+    probabilities
+
+    Args:
+        func (Callable): function of (*probs, *states, **kwargs)
+        probs (Sequence[ArrayLike]): serve probabilities
+        states (Sequence[ArrayLike]): integer score states
+        **kwargs (Any): passed through to func
+
+    Returns:
+        np.ndarray: func evaluated for every element of the broadcast inputs
+    """
+    prob_arrs = [np.asarray(x, dtype=float) for x in probs]
+    state_arrs = [np.asarray(x, dtype=np.int64) for x in states]
+    arrays = np.broadcast_arrays(*prob_arrs, *state_arrs)
+    shape = arrays[0].shape
+    ps = [x.ravel() for x in arrays[: len(probs)]]
+    out = np.empty(ps[0].size)
+
+    # probabilities of 0 or 1 can make 0/0 in the closed forms
+    # same as the scalar functions that would raise, these are left as nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if all(x.size == 1 for x in state_arrs):
+            # one state for everything so no need to group
+            out[:] = func(*ps, *[int(x.item()) for x in state_arrs], **kwargs)
+        else:
+            sts = np.stack([x.ravel() for x in arrays[len(probs) :]], axis=1)
+            uniq, inverse = np.unique(sts, axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+            # group indices of each distinct state together
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.cumsum(np.bincount(inverse))[:-1]
+            for state, idx in zip(uniq, np.split(order, bounds)):
+                out[idx] = func(
+                    *[x[idx] for x in ps], *[int(x) for x in state], **kwargs
+                )
+    return out.reshape(shape)
+
+
+def theory_game(p: ArrayLike) -> np.ndarray:
+    """Array version of `tennisim.game.theory_game`
+
+    Args:
+        p (ArrayLike): probabilities that server wins given point
+
+    Returns:
+        np.ndarray: theoretical probabilities that server wins game
+    """
+    p_arr: Any = np.asarray(p, dtype=float)
+    return np.asarray(game.theory_game(p_arr))
+
+
+def prob_game(p: ArrayLike, x: ArrayLike, y: ArrayLike) -> np.ndarray:
+    """Array version of `tennisim.game.prob_game`
+
+    Args:
+        p (ArrayLike): probabilities server wins a point
+        x (ArrayLike): points already won by server
+        y (ArrayLike): points already won by returner
+
+    Returns:
+        np.ndarray: probabilities of winning the game
+    """
+    return _by_state(game.prob_game, (p,), (x, y))
+
+
+def prob_tiebreak(
+    p_a: ArrayLike, p_b: ArrayLike, pt_a: ArrayLike, pt_b: ArrayLike
+) -> np.ndarray:
+    """Array version of `tennisim.tiebreak.prob_tiebreak`. Unlike the scalar
+    version this only returns the win probability and not the dict of
+    probabilities of each final score
+
+    Args:
+        p_a (ArrayLike): probs that current server wins a point they serve
+        p_b (ArrayLike): probs that current returner wins a point they serve
+        pt_a (ArrayLike): points already won by current server
+        pt_b (ArrayLike): points already won by current returner
+
+    Returns:
+        np.ndarray: probabilities that current server will win the tiebreak
+    """
+
+    def _prob(p_a: Any, p_b: Any, pt_a: int, pt_b: int) -> Any:
+        return tiebreak.prob_tiebreak(p_a, p_b, pt_a, pt_b)[0]
+
+    return _by_state(_prob, (p_a, p_b), (pt_a, pt_b))
+
+
+def prob_set(
+    p_a: ArrayLike, p_b: ArrayLike, g_a: ArrayLike, g_b: ArrayLike
+) -> np.ndarray:
+    """Array version of `tennisim.set.prob_set`
+
+    Args:
+        p_a (ArrayLike): probs current server wins any point on their serve
+        p_b (ArrayLike): probs current returner wins any point on their serve
+        g_a (ArrayLike): games already won by current server
+        g_b (ArrayLike): games already won by current returner
+
+    Returns:
+        np.ndarray: probabilities that current server will win the set
+    """
+    return _by_state(set_.prob_set, (p_a, p_b), (g_a, g_b))
+
+
+def prob_match(
+    p_a: ArrayLike,
+    p_b: ArrayLike,
+    st_a: ArrayLike = 0,
+    st_b: ArrayLike = 0,
+    g_a: ArrayLike = 0,
+    g_b: ArrayLike = 0,
+    pt_a: ArrayLike = 0,
+    pt_b: ArrayLike = 0,
+    sets: int = 3,
+) -> np.ndarray:
+    """Array version of `tennisim.match.prob_match`
+
+    Args:
+        p_a (ArrayLike): probs that player 'a' wins a point on their serve
+        p_b (ArrayLike): probs that player 'b' wins a point on their serve
+        st_a (ArrayLike, optional): sets already won by 'a'. Defaults to 0.
+        st_b (ArrayLike, optional): sets already won by 'b'. Defaults to 0.
+        g_a (ArrayLike, optional): games in curr set won by 'a'. Defaults to 0.
+        g_b (ArrayLike, optional): games in curr set won by 'b'. Defaults to 0.
+        pt_a (ArrayLike, optional): points in curr game won by 'a'.
+        Defaults to 0.
+        pt_b (ArrayLike, optional): points in curr game won by 'b'.
+        Defaults to 0.
+        sets (int, optional): how many sets match is 'best of'. Defaults to 3.
+
+    Returns:
+        np.ndarray: probabilities that player 'a' wins the match
+    """
+    return _by_state(
+        match.prob_match,
+        (p_a, p_b),
+        (st_a, st_b, g_a, g_b, pt_a, pt_b),
+        sets=sets,
+    )
@@ -0,0 +1,68 @@
+import pytest
+
+from tennisim import montecarlo as mc
+from tennisim.adaptive import run_adaptive
+from tennisim.adaptive import z_score
+from tennisim.match import prob_match
+
+
+class TestZScore:
+    """Tests for the `z_score` function"""
+
+    def test_known_levels(self) -> None:
+        assert z_score(0.95) == pytest.approx(1.959964, abs=1e-6)
+        assert z_score(0.99) == pytest.approx(2.575829, abs=1e-6)
+
+    def test_bad_level(self) -> None:
+        with pytest.raises(ValueError):
+            z_score(1.0)
+
+
+class TestRunAdaptive:
+    """Tests for the `run_adaptive` function"""
+
+    def test_hits_target_width(self) -> None:
+        res = run_adaptive(
+            {"win": mc.a_won}, 0.64, 0.61, width=0.05, chunk=200, rng=1
+        )
+        est = res.estimates["win"]
+        assert res.converged
+        assert est.ci[1] - est.ci[0] <= 0.05
+        # not many more paths than needed, p(1-p) * (2 * 1.96 / 0.05) ** 2
+        assert res.paths <= 1400 + 400
+        assert est.ci[0] < prob_match(0.64, 0.61) < est.ci[1]
+
+    def test_widths_per_statistic(self) -> None:
+        stats = {"win": mc.a_won, "games": mc.total_games}
+        res = run_adaptive(
+            stats, 0.64, 0.61, width={"win": 0.2, "games": 2.0}, rng=2
+        )
+        assert res.converged
+        games = res.estimates["games"]
+        assert games.ci[1] - games.ci[0] <= 2.0
+
+    def test_path_budget(self) -> None:
+        res = run_adaptive(
+            {"games": mc.total_games},
+            0.64,
+            0.61,
+            width=1e-6,
+            chunk=300,
+            max_paths=1000,
+            rng=3,
+        )
+        assert not res.converged
+        assert res.paths == 1000
+
+    def test_time_budget(self) -> None:
+        res = run_adaptive(
+            {"games": mc.total_games},
+            0.64,
+            0.61,
+            width=1e-6,
+            max_seconds=0.05,
+            chunk=100,
+            rng=4,
+        )
+        assert not res.converged
+        assert res.paths < 10_000_000
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from tennisim.batch import sim_game_batch
+from tennisim.batch import sim_match_batch
+from tennisim.batch import sim_set_batch
+from tennisim.batch import sim_tiebreak_batch
+from tennisim.game import theory_game
+from tennisim.match import prob_match
+from tennisim.tiebreak import prob_tiebreak
+
+
+class TestSimGameBatch:
+    """Tests for the `sim_game_batch` function"""
+
+    def test_game_batch_zero(self) -> None:
+        wins, points = sim_game_batch(0, 1000)
+        assert not wins.any()
+        assert (points == 4).all()
+
+    def test_game_batch_one(self) -> None:
+        wins, points = sim_game_batch(1, 1000)
+        assert wins.all()
+        assert (points == 4).all()
+
+    def test_game_batch_theory(self) -> None:
+        wins, _ = sim_game_batch(0.6, 100000, rng=1)
+        assert abs(wins.mean() - theory_game(0.6)) < 0.01
+
+    def test_game_batch_per_game_probs(self) -> None:
+        p_s = np.array([0.0, 1.0] * 500)
+        wins, _ = sim_game_batch(p_s)
+        assert (wins == p_s.astype(bool)).all()
+
+    def test_game_batch_length(self) -> None:
+        _, points = sim_game_batch(1, 10, ppg=7)
+        assert (points == 7).all()
+
+    def test_game_batch_deuce_lengths_even(self) -> None:
+        _, points = sim_game_batch(0.5, 10000, rng=1)
+        long_games = points[points > 6]
+        assert (long_games % 2 == 0).all()
+
+    def test_game_batch_seeded(self) -> None:
+        first = sim_game_batch(0.5, 1000, rng=7)
+        second = sim_game_batch(0.5, 1000, rng=7)
+        assert (first[0] == second[0]).all()
+        assert (first[1] == second[1]).all()
+
+
+class TestSimTiebreakBatch:
+    """Tests for the `sim_tiebreak_batch` function"""
+
+    def test_tiebreak_batch_one(self) -> None:
+        a_won, points = sim_tiebreak_batch(1, 0, size=1000)
+        assert a_won.all()
+        assert (points == 7).all()
+
+    def test_tiebreak_batch_zero(self) -> None:
+        a_won, points = sim_tiebreak_batch(0, 1, size=1000)
+        assert not a_won.any()
+        assert (points == 7).all()
+
+    def test_tiebreak_batch_endless(self) -> None:
+        for p in (0, 1):
+            with pytest.raises(ValueError):
+                sim_tiebreak_batch(p, p, size=10)
+        # only one endless item is enough
+        with pytest.raises(ValueError):
+            sim_tiebreak_batch(np.array([0.6, 1.0]), np.array([0.6, 1.0]))
+
+    def test_tiebreak_batch_theory(self) -> None:
+        a_won, _ = sim_tiebreak_batch(0.7, 0.6, size=100000, rng=1)
+        assert abs(a_won.mean() - prob_tiebreak(0.7, 0.6, 0, 0)[0]) < 0.01
+
+
+class TestSimSetBatch:
+    """Tests for the `sim_set_batch` function"""
+
+    def test_set_batch_one(self) -> None:
+        a_won, g_a, g_b, tb, _ = sim_set_batch(1, 0, size=1000)
+        assert a_won.all()
+        assert (g_a == 6).all() and (g_b == 0).all()
+        assert not tb.any()
+
+    def test_set_batch_endless(self) -> None:
+        with pytest.raises(ValueError):
+            sim_set_batch(1, 1, size=10)
+
+    def test_set_batch_tiebreak(self) -> None:
+        # both players always hold so every set goes to a tiebreak
+        a_won, g_a, g_b, tb, points = sim_set_batch(1, 0.999, size=100, rng=1)
+        assert tb.all()
+        assert (g_a + g_b == 13).all()
+        assert (points >= 12 * 4 + 7).all()
+
+
+class TestSimMatchBatch:
+    """Tests for the `sim_match_batch` function"""
+
+    def test_match_batch_one(self) -> None:
+        res = sim_match_batch(1, 0, size=1000)
+        assert res.winner.all()
+        assert (res.sets_a == 2).all() and (res.sets_b == 0).all()
+        assert (res.games_a[:, :2] == 6).all()
+        assert (res.games_a[:, 2] == -1).all()
+
+    def test_match_batch_endless(self) -> None:
+        with pytest.raises(ValueError):
+            sim_match_batch(1.0, 1.0, 10)
+
+    def test_match_batch_zero_five(self) -> None:
+        res = sim_match_batch(0, 1, size=1000, best_of=5)
+        assert not res.winner.any()
+        assert (res.sets_b == 3).all()
+        assert (res.points == 3 * 6 * 4).all()
+
+    def test_match_batch_theory(self) -> None:
+        res = sim_match_batch(0.65, 0.6, size=100000, rng=1)
+        assert abs(res.winner.mean() - prob_match(0.65, 0.6)) < 0.01
+
+    def test_match_batch_seeded(self) -> None:
+        first = sim_match_batch(0.6, 0.6, size=1000, rng=3)
+        second = sim_match_batch(0.6, 0.6, size=1000, rng=3)
+        assert all((x == y).all() for x, y in zip(first, second))
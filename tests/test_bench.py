@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tennisim import bench
+
+
+class TestBench:
+    """Tests for the benchmark suite"""
+
+    def test_time_per_call(self) -> None:
+        took = bench.time_per_call(lambda: sum(range(100)), min_time=0.01)
+        assert 0 < took < 0.01
+
+    def test_deep_size(self) -> None:
+        inner = (1, 2)
+        data = [inner, inner]
+        expected = sys.getsizeof(data) + sys.getsizeof(inner)
+        expected += sys.getsizeof(1) + sys.getsizeof(2)
+        assert bench.deep_size(data) == expected
+
+    def test_names_unique(self) -> None:
+        names = [x.name for x in bench.BENCHMARKS]
+        assert len(names) == len(set(names))
+
+    def test_run(self) -> None:
+        res = bench.run(["prob_set", "sim_match_trace_bo3"], min_time=0.001)
+        assert list(res) == ["prob_set", "sim_match_trace_bo3"]
+        assert res["prob_set"]["unit"] == "s"
+        assert res["prob_set"]["value"] > 0
+        # memory is seeded so the same every run
+        again = bench.run(["sim_match_trace_bo3"], min_time=0.001)
+        assert again["sim_match_trace_bo3"] == res["sim_match_trace_bo3"]
+
+    def test_run_unknown(self) -> None:
+        with pytest.raises(ValueError):
+            bench.run(["not_a_benchmark"])
+
+    def test_compare(self) -> None:
+        baseline = {
+            "a": {"value": 1.0, "unit": "s"},
+            "b": {"value": 1.0, "unit": "s"},
+        }
+        results = {
+            "a": {"value": 1.2, "unit": "s"},
+            "b": {"value": 1.5, "unit": "s"},
+            "c": {"value": 9.0, "unit": "s"},
+        }
+        assert bench.compare(results, baseline, 0.25) == [
+            bench.Regression("b", 1.0, 1.5, 1.5)
+        ]
+        assert len(bench.compare(results, baseline, 0.1)) == 2
+
+    def test_main_regression(self, tmp_path: Path) -> None:
+        base = tmp_path / "base.json"
+        out = tmp_path / "out.json"
+        args = ["--min-time", "0.001", "prob_game"]
+        assert bench.main(args + ["--output", str(base)]) == 0
+        saved = json.loads(base.read_text())
+        assert "prob_game" in saved["results"]
+
+        # make the baseline far faster than anything can run
+        saved["results"]["prob_game"]["value"] = 1e-15
+        base.write_text(json.dumps(saved))
+        args += ["--output", str(out), "--baseline", str(base)]
+        assert bench.main(args) == 1
+        assert out.exists()
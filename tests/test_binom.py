@@ -0,0 +1,82 @@
+from math import factorial
+
+import numpy as np
+import pytest
+
+from tennisim.binom import binom_pmf
+from tennisim.binom import binom_pmfs
+from tennisim.binom import comb
+from tennisim.binom import comb_row
+from tennisim.binom import power_table
+from tennisim.binom import powers
+from tennisim.match import prob_match
+
+
+class TestComb:
+    """Tests for the `comb` function"""
+
+    def test_comb_exact(self) -> None:
+        for n in range(40):
+            for r in range(n + 1):
+                expected = factorial(n) // (factorial(r) * factorial(n - r))
+                assert comb(n, r) == expected
+
+    def test_comb_outside(self) -> None:
+        assert comb(5, 6) == 0
+        assert comb(5, -1) == 0
+
+    def test_comb_row_negative(self) -> None:
+        with pytest.raises(ValueError):
+            comb_row(-3)
+
+
+class TestPowers:
+    """Tests for the `powers` and `power_table` functions"""
+
+    def test_powers(self) -> None:
+        assert powers(0.6, 4) == pytest.approx([1, 0.6, 0.36, 0.216, 0.1296])
+
+    def test_power_table_cached(self) -> None:
+        first = power_table(0.61)
+        second = power_table(0.61)
+        assert first is second
+        assert first[1][3] == pytest.approx(0.39 ** 3)
+
+    def test_power_table_long(self) -> None:
+        p_pow, q_pow = power_table(0.5, 20)
+        assert len(p_pow) == 21
+        assert q_pow[20] == pytest.approx(0.5 ** 20)
+
+    def test_power_table_array(self) -> None:
+        p = np.array([0.2, 0.7])
+        p_pow, q_pow = power_table(p, 3)
+        assert p_pow[3] == pytest.approx(p ** 3)
+        assert q_pow[2] == pytest.approx((1 - p) ** 2)
+
+
+class TestBinomPmf:
+    """Tests for the `binom_pmf` and `binom_pmfs` functions"""
+
+    def test_binom_pmf(self) -> None:
+        assert binom_pmf(6, 2, 0.3) == pytest.approx(15 * 0.09 * 0.7 ** 4)
+
+    @pytest.mark.parametrize("n,k", [(-3, 0), (5, -1), (5, 6), (-1, -1)])
+    def test_binom_pmf_outside(self, n: int, k: int) -> None:
+        with pytest.raises(ValueError):
+            binom_pmf(n, k, 0.3)
+
+    def test_bad_state_raises(self) -> None:
+        # sets and points past the end of a match need negative counts
+        with pytest.raises(ValueError):
+            prob_match(0.65, 0.6, 7, 0, 0, 0, 0, 0)
+        with pytest.raises(ValueError):
+            prob_match(0.65, 0.6, 0, 0, 0, 0, 40, 0)
+
+    def test_binom_pmfs_sum(self) -> None:
+        assert sum(binom_pmfs(12, 0.37)) == pytest.approx(1)
+
+    def test_binom_pmfs_array(self) -> None:
+        p = np.linspace(0.1, 0.9, 5)
+        res = binom_pmfs(10, p)
+        assert res[4] == pytest.approx(binom_pmf(10, 4, p))
+        assert sum(res) == pytest.approx(np.ones(5))
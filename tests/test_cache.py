@@ -0,0 +1,121 @@
+import threading
+from typing import Any
+from typing import List
+
+import pytest
+
+from tennisim import match
+from tennisim import set as set_
+from tennisim import tiebreak
+from tennisim.cache import CacheInfo
+from tennisim.cache import ProbCache
+from tennisim.game import prob_game
+from tennisim.game import theory_game
+from tennisim.match import prob_match
+from tennisim.set import prob_set
+from tennisim.tiebreak import prob_tiebreak
+
+
+class TestProbCache:
+    """Tests for the `ProbCache` class"""
+
+    def test_cache_same_values(self) -> None:
+        cache = ProbCache()
+        assert cache.theory_game(0.6) == theory_game(0.6)
+        assert cache.prob_game(0.6, 2, 3) == prob_game(0.6, 2, 3)
+        assert cache.prob_tiebreak(0.6, 0.7, 3, 2) == prob_tiebreak(
+            0.6, 0.7, 3, 2
+        )
+        assert cache.prob_set(0.6, 0.7, 3, 2) == prob_set(0.6, 0.7, 3, 2)
+        assert cache.prob_match(0.6, 0.7, 1, 0, sets=5) == prob_match(
+            0.6, 0.7, 1, 0, sets=5
+        )
+
+    def test_cache_hits_misses(self) -> None:
+        cache = ProbCache()
+        for x in range(3):
+            cache.prob_match(0.65, 0.6, 0, 1, 2, 2)
+        cache.prob_match(0.65, 0.6, 0, 1, 2, 3)
+        assert cache.info()["prob_match"] == CacheInfo(2, 2, 0, 2)
+
+    def test_cache_kwargs_in_key(self) -> None:
+        cache = ProbCache()
+        three = cache.prob_match(0.65, 0.6)
+        five = cache.prob_match(0.65, 0.6, sets=5)
+        assert three != five
+        assert cache.info()["prob_match"].misses == 2
+
+    def test_cache_evicts_least_recent(self) -> None:
+        cache = ProbCache(maxsize=2)
+        cache.theory_game(0.5)
+        cache.theory_game(0.6)
+        # use 0.5 again so 0.6 is the oldest
+        cache.theory_game(0.5)
+        # no nested calls so one more entry
+        cache.prob_game(0.6, 0, 0)
+        assert cache.info()["theory_game"] == CacheInfo(1, 2, 1, 1)
+        cache.theory_game(0.5)
+        assert cache.info()["theory_game"].hits == 2
+
+    def test_cache_decimals(self) -> None:
+        cache = ProbCache(decimals=3)
+        first = cache.prob_set(0.65011, 0.6, 0, 0)
+        second = cache.prob_set(0.64992, 0.6, 0, 0)
+        assert first == second == prob_set(0.65, 0.6, 0, 0)
+        assert cache.info()["prob_set"].hits == 1
+
+    def test_cache_clear(self) -> None:
+        cache = ProbCache()
+        cache.theory_game(0.6)
+        cache.clear()
+        assert cache.info() == {}
+        cache.theory_game(0.6)
+        assert cache.info()["theory_game"].misses == 1
+
+    def test_cache_bad_size(self) -> None:
+        with pytest.raises(ValueError):
+            ProbCache(maxsize=0)
+
+    def test_cache_nested_calls(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls: List[tuple] = []
+        plain = tiebreak.create_tb_outcomes
+
+        def counted(*args: Any) -> dict:
+            calls.append(args)
+            return plain(*args)
+
+        monkeypatch.setattr(tiebreak, "create_tb_outcomes", counted)
+        cache = ProbCache()
+        for g in range(5):
+            state = (0, 0, g, 2, 1, 0)
+            res = cache.prob_match(0.65, 0.6, *state)
+            assert res == pytest.approx(prob_match(0.65, 0.6, *state))
+        calls.clear()
+        for g in range(5):
+            cache.prob_match(0.65, 0.6, 1, 0, g, 3, 0, 2)
+        # the tiebreak from 0-0 inside every prob_set is already held
+        assert calls == []
+        info = cache.info()
+        assert info["prob_set"].hits > 0
+        assert info["prob_tiebreak"].misses == 2
+        # names are pointed back at the plain functions afterwards
+        assert match.prob_set is set_.prob_set
+        assert set_.prob_tiebreak is tiebreak.prob_tiebreak
+
+    def test_cache_nested_other_thread(self) -> None:
+        cache = ProbCache()
+        seen: List[float] = []
+
+        def other() -> None:
+            seen.append(match.prob_match(0.6, 0.62, 0, 1, 2, 2))
+
+        def prob_set_then_other(*args: Any) -> float:
+            # runs while the names are routed through the cache
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+            return set_.prob_set(*args)
+
+        cache._compute(prob_set_then_other, (0.6, 0.62, 2, 2), {})
+        assert seen == [prob_match(0.6, 0.62, 0, 1, 2, 2)]
+        assert "prob_set" not in cache.info()
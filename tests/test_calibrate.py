@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from tennisim.calibrate import implied_serve_probs
+from tennisim.match import prob_match
+
+
+class TestImpliedServeProbs:
+    """Tests for the `implied_serve_probs` function"""
+
+    def test_implied_round_trip(self) -> None:
+        rng = np.random.default_rng(2)
+        p_a = rng.uniform(0.5, 0.8, 300)
+        p_b = rng.uniform(0.5, 0.8, 300)
+        target = np.array([prob_match(x, y) for x, y in zip(p_a, p_b)])
+        res = implied_serve_probs(target, p_a + p_b)
+        assert res.converged.all()
+        assert res.p_a == pytest.approx(p_a, abs=1e-6)
+        assert res.p_b == pytest.approx(p_b, abs=1e-6)
+
+    def test_implied_hits_target(self) -> None:
+        res = implied_serve_probs([0.2, 0.55, 0.93], 1.25, sets=5, tol=1e-12)
+        for x, y, t in zip(res.p_a, res.p_b, [0.2, 0.55, 0.93]):
+            assert prob_match(x, y, sets=5) == pytest.approx(t, abs=1e-12)
+        assert res.p_a + res.p_b == pytest.approx(np.full(3, 1.25))
+        assert np.abs(res.error).max() <= 1e-12
+
+    def test_implied_even_match(self) -> None:
+        res = implied_serve_probs(0.5, 1.3)
+        assert res.p_a.shape == ()
+        assert float(res.p_a) == pytest.approx(0.65)
+
+    def test_implied_shape(self) -> None:
+        res = implied_serve_probs(np.full((4, 3), 0.6), 1.2)
+        assert res.p_a.shape == (4, 3)
+        assert res.iterations.shape == (4, 3)
+
+    def test_implied_out_of_reach(self) -> None:
+        # no serve probs can make prob_match more than 1
+        res = implied_serve_probs([1.2, 0.6], 1.2)
+        assert not res.converged[0]
+        assert res.converged[1]
+        assert res.p_a[0] == pytest.approx(1)
+
+    def test_implied_max_iter(self) -> None:
+        res = implied_serve_probs(0.7, 1.2, max_iter=1)
+        assert not res.converged
+        assert res.iterations == 1
+
+    def test_implied_bad_total(self) -> None:
+        with pytest.raises(ValueError):
+            implied_serve_probs(0.6, 2.0)
@@ -0,0 +1,111 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tennisim import columnar
+from tennisim.match import MatchTable
+from tennisim.match import reformat_match
+from tennisim.sim import SUMMARY
+from tennisim.sim import sim_match
+
+
+class TestColumns:
+    """Tests for writing and reading columnar tables"""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "table")
+        with columnar.ColumnWriter(path, {"x": "int16", "y": "f8"}) as out:
+            out.append({"x": [1, 2], "y": [0.5, 0.25]})
+            out.append({"x": np.array([3]), "y": [0.125]})
+        cols = columnar.read_columns(path)
+        assert isinstance(cols["x"], np.memmap)
+        assert cols["x"].dtype == np.int16
+        assert cols["x"].tolist() == [1, 2, 3]
+        assert cols["y"].tolist() == [0.5, 0.25, 0.125]
+
+    def test_empty(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "table")
+        columnar.ColumnWriter(path, {"x": "int64"}).close()
+        assert columnar.read_columns(path)["x"].shape == (0,)
+
+    def test_bad_chunks(self, tmp_path: Path) -> None:
+        out = columnar.ColumnWriter(str(tmp_path), {"x": "i8", "y": "i8"})
+        with pytest.raises(ValueError):
+            out.append({"x": [1]})
+        with pytest.raises(ValueError):
+            out.append({"x": [1], "y": [1, 2]})
+        out.close()
+
+
+class TestMatchStore:
+    """Tests for storing simulated matches"""
+
+    def test_matches_reformat_match(self, tmp_path: Path) -> None:
+        rng = random.Random(5)
+        results = [sim_match(0.64, 0.61, rng=rng) for x in range(7)]
+        table = MatchTable(0.64, 0.61)
+        path = str(tmp_path / "store")
+        # small chunks so several are written
+        n = columnar.write_matches(
+            path, iter(results), 0.64, 0.61, table=table, chunk=3
+        )
+        store = columnar.MatchStore(path)
+        assert n == len(store) == 7
+        for i, result in enumerate(results):
+            rows = reformat_match(result, 0.64, 0.61, table)
+            points = store.match_points(i)
+            assert points["match"].tolist() == [i] * len(rows)
+            for name in list(columnar.POINT_COLUMNS)[1:]:
+                assert points[name].tolist() == [x[name] for x in rows]
+            assert store.matches["winner"][i] == result[0]
+            sets = (store.matches["sets_a"][i], store.matches["sets_b"][i])
+            assert sets == result[1][-1]
+
+    def test_builds_table(self, tmp_path: Path) -> None:
+        result = sim_match(0.6, 0.6, best_of=5, rng=random.Random(2))
+        columnar.write_matches(str(tmp_path), [result], 0.6, 0.6)
+        points = columnar.MatchStore(str(tmp_path)).match_points(0)
+        rows = reformat_match(result, 0.6, 0.6)
+        assert points["prob"].tolist() == [x["prob"] for x in rows]
+
+
+class TestAnnotateMatches:
+    """Tests for the `annotate_matches` function"""
+
+    def test_matches_reformat_match(self) -> None:
+        rng = random.Random(8)
+        for best_of in (3, 5):
+            results = [
+                sim_match(0.62, 0.6, x % 2 == 0, best_of, rng=rng)
+                for x in range(30)
+            ]
+            table = MatchTable(0.62, 0.6, sets=best_of)
+            cols = columnar.annotate_matches(
+                results, 0.62, 0.6, table, first_id=10
+            )
+            rows = [
+                dict(match=i + 10, **y)
+                for i, x in enumerate(results)
+                for y in reformat_match(x, 0.62, 0.6, table)
+            ]
+            for name, dtype in columnar.POINT_COLUMNS.items():
+                assert cols[name].dtype == np.dtype(dtype)
+                assert cols[name].tolist() == [x[name] for x in rows]
+
+    def test_builds_table(self) -> None:
+        results = [sim_match(0.6, 0.6, rng=random.Random(1))]
+        cols = columnar.annotate_matches(results, 0.6, 0.6)
+        probs = [x["prob"] for x in reformat_match(results[0], 0.6, 0.6)]
+        assert cols["prob"].tolist() == probs
+
+    def test_empty(self) -> None:
+        cols = columnar.annotate_matches([], 0.6, 0.6)
+        assert list(cols) == list(columnar.POINT_COLUMNS)
+        assert all(x.shape == (0,) for x in cols.values())
+
+    def test_needs_full(self) -> None:
+        results = [sim_match(0.6, 0.6, record=SUMMARY)]
+        with pytest.raises(ValueError):
+            columnar.annotate_matches(results, 0.6, 0.6)
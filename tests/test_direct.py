@@ -0,0 +1,122 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from tennisim import direct
+from tennisim.exact import set_score_dist
+from tennisim.exact import tiebreak_length_dist
+from tennisim.game import theory_game
+from tennisim.montecarlo import summarise
+from tennisim.sim import FULL
+from tennisim.sim import OUTCOME
+from tennisim.sim import SUMMARY
+from tennisim.sim import sim_match
+from tennisim.tiebreak import prob_tiebreak
+
+
+class _Fixed:
+    """Random source handing out set uniforms in turn"""
+
+    def __init__(self, *draws: float) -> None:
+        self.draws = list(draws)
+
+    def random(self) -> float:
+        return self.draws.pop(0)
+
+
+class TestDists:
+    """Tests for the exact game and tiebreak distributions"""
+
+    def test_game_dist(self) -> None:
+        for p in (0.0, 0.3, 0.65, 1.0):
+            dist = direct.game_dist(p)
+            assert sum(x for _, x in dist) == pytest.approx(1.0)
+            hold = sum(x for (s, r), x in dist if s > r)
+            assert hold == pytest.approx(theory_game(p))
+
+    def test_tiebreak_dist(self) -> None:
+        dist, tail = direct.tiebreak_dist(0.64, 0.61)
+        assert sum(x for _, x in dist) + tail == pytest.approx(1.0)
+        # from 6-6 the first server wins w / (w + l) of the rest
+        w = 0.64 * 0.39
+        l_ = 0.36 * 0.61
+        won = sum(x for (a, b), x in dist if a > b) + tail * w / (w + l_)
+        assert won == pytest.approx(prob_tiebreak(0.64, 0.61, 0, 0)[0])
+
+
+class TestDirectSimulator:
+    """Tests for the `DirectSimulator` class"""
+
+    def test_tiebreak_tail(self) -> None:
+        sim = direct.DirectSimulator(0.64, 0.61)
+        dist, tail = direct.tiebreak_dist(0.64, 0.61)
+        total = 1 - tail
+        # just into the tail is the first server winning 8-6
+        assert sim.sim_tiebreak(True, _Fixed(total + 1e-9)) == (True, (8, 6))
+        # b serves first so the scores are flipped round
+        assert sim.sim_tiebreak(False, _Fixed(total + 1e-9))[1] == (6, 8)
+        # deep in the tail are long tiebreaks
+        a_won, (a, b) = sim.sim_tiebreak(True, _Fixed(1 - 1e-12))
+        assert abs(a - b) == 2 and min(a, b) > 20
+
+    def test_tiebreak_lengths(self) -> None:
+        sim = direct.DirectSimulator(0.6, 0.63)
+        rng = random.Random(1)
+        n = 50_000
+        lengths = [sum(sim.sim_tiebreak(True, rng)[1]) for x in range(n)]
+        win, lose = tiebreak_length_dist(0.6, 0.63)
+        dist = win + lose
+        mean = sum(i * x for i, x in enumerate(dist))
+        std = math.sqrt(sum((i - mean) ** 2 * x for i, x in enumerate(dist)))
+        assert abs(sum(lengths) / n - mean) < 4 * std / math.sqrt(n)
+
+    def test_set_scores(self) -> None:
+        sim = direct.DirectSimulator(0.63, 0.6)
+        rng = random.Random(2)
+        n = 50_000
+        counts = Counter(sim.sim_set(False, OUTCOME, rng)[1] for x in range(n))
+        for score, p in set_score_dist(0.63, 0.6, a_serving=False).items():
+            std = math.sqrt(p * (1 - p) / n)
+            assert abs(counts[score] / n - p) < 5 * std
+
+    def test_summary_shape(self) -> None:
+        sim = direct.DirectSimulator(0.63, 0.6)
+        rng = random.Random(3)
+        for x in range(200):
+            res = sim.sim_match(x % 2 == 0, 5, SUMMARY, rng)
+            played = sim_match(0.63, 0.6, x % 2 == 0, 5, SUMMARY, rng)
+            assert len(res) == len(played)
+            summary = summarise(res, x % 2 == 0)
+            assert summary.games == sum(len(y) for y in res[2])
+            for games, scores in zip(res[2], res[3]):
+                assert len(games) == len(scores)
+                assert all(max(y) >= 4 for y in scores)
+        res = sim.sim_match(True, 3, OUTCOME, rng)
+        assert res[2] is None and max(res[1]) == 2
+
+    def test_full_plays_points(self) -> None:
+        res = direct.sim_match_direct(
+            0.63, 0.6, record=FULL, rng=random.Random(4)
+        )
+        assert res == sim_match(0.63, 0.6, record=FULL, rng=random.Random(4))
+
+    def test_fewer_draws(self) -> None:
+        class _Counting(random.Random):
+            draws = 0
+
+            def random(self) -> float:
+                self.draws += 1
+                return super().random()
+
+        fast = _Counting(5)
+        slow = _Counting(5)
+        for x in range(200):
+            direct.sim_match_direct(0.63, 0.6, rng=fast)
+            sim_match(0.63, 0.6, record=SUMMARY, rng=slow)
+        assert slow.draws > 5 * fast.draws
+
+    def test_endless_tiebreak(self) -> None:
+        with pytest.raises(ValueError):
+            direct.DirectSimulator(1.0, 1.0)
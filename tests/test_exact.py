@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+
+from tennisim.exact import game_length_dist
+from tennisim.exact import match_length_dist
+from tennisim.exact import match_score_dist
+from tennisim.exact import set_length_dist
+from tennisim.exact import set_over
+from tennisim.exact import set_score_dist
+from tennisim.exact import tb_first_serving
+from tennisim.exact import tiebreak_length_dist
+from tennisim.game import theory_game
+from tennisim.match import prob_match
+from tennisim.set import prob_set
+from tennisim.tiebreak import prob_tiebreak
+
+
+def a_won(line: tuple, first_to: int) -> bool:
+    return sum(x > y for x, y in line) == first_to
+
+
+class TestSetOver:
+    """Tests for the `set_over` function"""
+
+    def test_set_over(self) -> None:
+        assert set_over(6, 4) and set_over(3, 6) and set_over(7, 5)
+        assert set_over(7, 6) and set_over(6, 7)
+
+    def test_set_not_over(self) -> None:
+        assert not set_over(6, 5) and not set_over(5, 5)
+        assert not set_over(6, 6) and not set_over(0, 0)
+
+
+class TestTbFirstServing:
+    """Tests for the `tb_first_serving` function"""
+
+    def test_tb_first_serving(self) -> None:
+        # 'a' serves first then 'b' serves points 1,2 and 'a' 3,4
+        serving = [True, False, False, True, True, False]
+        firsts = [tb_first_serving(x, 0, y) for x, y in enumerate(serving)]
+        assert all(firsts)
+
+
+class TestSetScoreDist:
+    """Tests for the `set_score_dist` function"""
+
+    def test_set_score_dist_sums(self) -> None:
+        dist = set_score_dist(0.6, 0.55)
+        assert sum(dist.values()) == pytest.approx(1.0)
+        assert len(dist) == 14
+
+    def test_set_score_dist_prob_set(self) -> None:
+        for a_serving in (True, False):
+            dist = set_score_dist(0.6, 0.55, a_serving=a_serving)
+            p = sum(v for k, v in dist.items() if k[0] > k[1])
+            assert p == pytest.approx(prob_set(0.6, 0.55, 0, 0))
+
+    def test_set_score_dist_certain(self) -> None:
+        assert set_score_dist(1, 0) == {(6, 0): 1.0}
+
+    def test_set_score_dist_finished(self) -> None:
+        assert set_score_dist(0.6, 0.6, 6, 3) == {(6, 3): 1.0}
+
+    def test_set_score_dist_tiebreak(self) -> None:
+        dist = set_score_dist(0.6, 0.6, 6, 6)
+        assert set(dist) == {(7, 6), (6, 7)}
+
+
+class TestMatchScoreDist:
+    """Tests for the `match_score_dist` function"""
+
+    def test_match_score_dist_prob_match(self) -> None:
+        for best_of in (3, 5):
+            dist = match_score_dist(0.65, 0.6, best_of=best_of)
+            first_to = best_of // 2 + 1
+            p = sum(v for k, v in dist.items() if a_won(k, first_to))
+            assert sum(dist.values()) == pytest.approx(1.0)
+            assert p == pytest.approx(prob_match(0.65, 0.6, sets=best_of))
+
+    def test_match_score_dist_certain(self) -> None:
+        assert match_score_dist(1, 0) == {((6, 0), (6, 0)): 1.0}
+
+    def test_match_score_dist_played(self) -> None:
+        dist = match_score_dist(0.6, 0.6, played=[(6, 4), (3, 6)])
+        assert all(k[:2] == ((6, 4), (3, 6)) for k in dist)
+        assert all(len(k) == 3 for k in dist)
+
+    def test_match_score_dist_in_play(self) -> None:
+        dist = match_score_dist(0.6, 0.6, played=[(6, 4)], g_a=5, g_b=0)
+        p = sum(v for k, v in dist.items() if k[1][0] > k[1][1])
+        p_set = prob_set(0.6, 0.6, 5, 0)
+        assert p == pytest.approx(p_set)
+
+
+class TestLengthDist:
+    """Tests for the exact length distribution functions"""
+
+    def test_game_length_dist(self) -> None:
+        hold, brk = game_length_dist(0.6)
+        assert hold.sum() == pytest.approx(theory_game(0.6))
+        assert hold.sum() + brk.sum() == pytest.approx(1)
+        assert hold[:4].sum() == 0 and hold[7] == 0
+
+    def test_game_length_dist_certain(self) -> None:
+        hold, brk = game_length_dist(1)
+        assert hold[4] == 1 and hold.sum() == 1 and brk.sum() == 0
+
+    def test_game_length_dist_no_tol(self) -> None:
+        hold, brk = game_length_dist(0, tol=0)
+        assert brk[4] == 1 and brk.sum() == 1 and len(brk) == 7
+
+    def test_tiebreak_length_dist(self) -> None:
+        win, lose = tiebreak_length_dist(0.6, 0.55)
+        assert win.sum() == pytest.approx(prob_tiebreak(0.6, 0.55, 0, 0)[0])
+        assert win.sum() + lose.sum() == pytest.approx(1)
+        assert win[:7].sum() == 0
+
+    def test_set_length_dist_scores(self) -> None:
+        dist = set_length_dist(0.65, 0.6)
+        scores = set_score_dist(0.65, 0.6)
+        assert dist.keys() == scores.keys()
+        for k, v in scores.items():
+            assert dist[k].sum() == pytest.approx(v)
+
+    def test_match_length_dist_sums(self) -> None:
+        length = match_length_dist(0.65, 0.6, best_of=5)
+        assert length.points.sum() == pytest.approx(1)
+        assert length.games.sum() == pytest.approx(1)
+        assert length.sets.sum() == pytest.approx(1)
+        assert length.set_games[0].sum() == pytest.approx(1)
+
+    def test_match_length_dist_games(self) -> None:
+        length = match_length_dist(0.65, 0.6)
+        dist = match_score_dist(0.65, 0.6)
+        mean = sum(p * sum(x + y for x, y in k) for k, p in dist.items())
+        games = (length.games * np.arange(length.games.size)).sum()
+        assert games == pytest.approx(mean)
+
+    def test_match_length_dist_sets(self) -> None:
+        length = match_length_dist(0.65, 0.6)
+        dist = match_score_dist(0.65, 0.6)
+        three = sum(p for k, p in dist.items() if len(k) == 3)
+        assert length.sets[3] == pytest.approx(three)
+        assert length.set_games[2].sum() == pytest.approx(three)
+
+    def test_match_length_dist_certain(self) -> None:
+        length = match_length_dist(1, 0)
+        # 'a' wins every point so 2 sets of 6 games of 4 points
+        assert length.points[48] == pytest.approx(1)
+        assert length.games[12] == pytest.approx(1)
+        assert length.sets[2] == pytest.approx(1)
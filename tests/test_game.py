@@ -1,3 +1,5 @@
+import pytest
+
 from tennisim.game import prob_deuce_occurs
 from tennisim.game import prob_game
 from tennisim.game import prob_game_outcome
@@ -53,7 +55,13 @@ class TestProbGame:
         assert prob_game(0.5, 3, 3) == 0.5
 
     def test_prob_game_deuce_adv_in(self) -> None:
-        assert prob_game(0.5, 4, 3) == 0.5
+        assert prob_game(0.5, 4, 3) == 0.75
+
+    def test_prob_game_adv_recursion(self) -> None:
+        for p in (0.3, 0.6, 0.9):
+            back = prob_game(p, 3, 3)
+            assert prob_game(p, 4, 3) == pytest.approx(p + (1 - p) * back)
+            assert prob_game(p, 3, 4) == pytest.approx(p * back)
 
     def test_prob_game_deuce_adv_out(self) -> None:
         assert prob_game(0.5, 3, 4) == 0.25
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+from tennisim import grad
+from tennisim.game import theory_game
+from tennisim.match import MatchTable
+from tennisim.match import prob_match
+from tennisim.set import prob_set
+from tennisim.tiebreak import prob_tiebreak
+
+H = 1e-6
+
+
+def central(func, p_a: float, p_b: float, *args: int) -> tuple:
+    """Central finite differences of func with respect to p_a and p_b"""
+    d_a = (func(p_a + H, p_b, *args) - func(p_a - H, p_b, *args)) / (2 * H)
+    d_b = (func(p_a, p_b + H, *args) - func(p_a, p_b - H, *args)) / (2 * H)
+    return d_a, d_b
+
+
+class TestGrad:
+    """Tests for the gradient versions of the closed forms"""
+
+    def test_theory_game_grad(self) -> None:
+        value, d_p = grad.theory_game(0.62)
+        assert value == pytest.approx(theory_game(0.62))
+        expected = (theory_game(0.62 + H) - theory_game(0.62 - H)) / (2 * H)
+        assert d_p == pytest.approx(expected, rel=1e-6)
+
+    def test_prob_tiebreak_grad(self) -> None:
+        def func(p_a: float, p_b: float, x: int, y: int) -> float:
+            return prob_tiebreak(p_a, p_b, x, y)[0]
+
+        res = grad.prob_tiebreak(0.62, 0.67, 3, 4)
+        assert res.value == pytest.approx(func(0.62, 0.67, 3, 4))
+        assert (res.d_a, res.d_b) == pytest.approx(
+            central(func, 0.62, 0.67, 3, 4), rel=1e-6
+        )
+
+    def test_prob_set_grad(self) -> None:
+        res = grad.prob_set(0.62, 0.67, 2, 3)
+        assert res.value == pytest.approx(prob_set(0.62, 0.67, 2, 3))
+        assert (res.d_a, res.d_b) == pytest.approx(
+            central(prob_set, 0.62, 0.67, 2, 3), rel=1e-6
+        )
+
+    def test_prob_match_grad(self) -> None:
+        states = [(0, 0, 0, 0, 0, 0), (1, 0, 3, 2, 1, 2), (0, 1, 6, 6, 3, 4)]
+        for state in states:
+            res = grad.prob_match(0.64, 0.61, *state)
+            assert res.value == pytest.approx(prob_match(0.64, 0.61, *state))
+            assert (res.d_a, res.d_b) == pytest.approx(
+                central(prob_match, 0.64, 0.61, *state), rel=1e-6
+            )
+
+    def test_prob_tiebreak_grad_long(self) -> None:
+        def func(p_a: float, p_b: float, x: int, y: int) -> float:
+            return prob_tiebreak(p_a, p_b, x, y)[0]
+
+        for state in [(9, 8), (8, 9), (10, 10), (6, 2), (1, 6)]:
+            res = grad.prob_tiebreak(0.62, 0.67, *state)
+            assert res.value == pytest.approx(func(0.62, 0.67, *state))
+            assert (res.d_a, res.d_b) == pytest.approx(
+                central(func, 0.62, 0.67, *state), rel=1e-6
+            )
+
+    def test_prob_set_grad_every_state(self) -> None:
+        for x in range(8):
+            for y in range(8):
+                res = grad.prob_set(0.58, 0.71, x, y)
+                assert res.value == pytest.approx(prob_set(0.58, 0.71, x, y))
+                assert (res.d_a, res.d_b) == pytest.approx(
+                    central(prob_set, 0.58, 0.71, x, y), rel=1e-5, abs=1e-8
+                )
+
+    def test_prob_match_grad_finished(self) -> None:
+        assert grad.prob_match(0.64, 0.61, 2, 1) == (1.0, 0.0, 0.0)
+
+    def test_prob_match_grad_array(self) -> None:
+        p_a = np.array([0.55, 0.65, 0.75])
+        res = grad.prob_match(p_a, 0.6, 1, 1, 4, 4, 2, 0, 5)
+        for i, x in enumerate(p_a):
+            single = grad.prob_match(x, 0.6, 1, 1, 4, 4, 2, 0, 5)
+            assert res.d_a[i] == pytest.approx(single.d_a)
+            assert res.d_b[i] == pytest.approx(single.d_b)
+
+
+class TestGradTable:
+    """Tests for the `GradTable` class"""
+
+    def test_grad_table_matches(self) -> None:
+        table = grad.GradTable(0.64, 0.61, sets=5)
+        res = table.prob(1, 2, 4, 3, 2, 1, True)
+        expected = grad.prob_match(0.64, 0.61, 1, 2, 4, 3, 2, 1, sets=5)
+        assert res == pytest.approx(expected)
+
+    def test_grad_table_b_serving(self) -> None:
+        table = grad.GradTable(0.64, 0.61)
+        res = table.prob(0, 1, 2, 3, 0, 2, False)
+        # from 'b' view the serve probs swap places
+        flip = grad.prob_match(0.61, 0.64, 1, 0, 3, 2, 2, 0)
+        assert res == pytest.approx((1 - flip.value, -flip.d_b, -flip.d_a))
+
+    def test_grad_table_probs(self) -> None:
+        table = grad.GradTable(0.64, 0.61)
+        assert table.probs == pytest.approx(MatchTable(0.64, 0.61).probs)
+
+    @pytest.mark.parametrize("sets", [3, 5])
+    def test_grad_table_derivs(self, sets: int) -> None:
+        """every state against bumping whole tables"""
+        table = grad.GradTable(0.58, 0.69, sets)
+        up = MatchTable(0.58 + H, 0.69, sets).probs
+        down = MatchTable(0.58 - H, 0.69, sets).probs
+        assert table.d_a == pytest.approx((up - down) / (2 * H), abs=1e-8)
+        up = MatchTable(0.58, 0.69 + H, sets).probs
+        down = MatchTable(0.58, 0.69 - H, sets).probs
+        assert table.d_b == pytest.approx((up - down) / (2 * H), abs=1e-8)
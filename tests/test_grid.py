@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from tennisim.game import theory_game
+from tennisim.grid import ProbGrid
+from tennisim.match import prob_match
+from tennisim.set import prob_set
+
+STATE = (1, 0, 3, 2, 0, 1, False)
+
+
+@pytest.fixture(scope="module")
+def grid() -> ProbGrid:
+    return ProbGrid(lo=0.4, hi=0.8, n=41, states=[STATE])
+
+
+class TestProbGrid:
+    """Tests for the `ProbGrid` class"""
+
+    def test_grid_points_exact(self, grid: ProbGrid) -> None:
+        assert grid.prob_match(0.6, 0.7) == pytest.approx(
+            prob_match(0.6, 0.7), abs=1e-12
+        )
+
+    def test_hold_within_error(self, grid: ProbGrid) -> None:
+        p = 0.6234
+        err = abs(grid.prob_hold(p) - theory_game(p))
+        assert err <= grid.error["hold"]
+
+    def test_set_within_error(self, grid: ProbGrid) -> None:
+        exact = prob_set(0.6234, 0.5517, 0, 0)
+        err = abs(grid.prob_set(0.6234, 0.5517) - exact)
+        assert err <= grid.error["set"]
+
+    def test_match_within_error(self, grid: ProbGrid) -> None:
+        rng = np.random.default_rng(3)
+        p_a = rng.uniform(0.4, 0.8, 50)
+        p_b = rng.uniform(0.4, 0.8, 50)
+        res = grid.prob_match(p_a, p_b)
+        exact = np.array([prob_match(x, y) for x, y in zip(p_a, p_b)])
+        assert np.abs(res - exact).max() <= grid.error["match"]
+
+    def test_state_probs(self, grid: ProbGrid) -> None:
+        # 'b' is serving so view from their side and flip
+        exact = 1 - prob_match(0.62, 0.66, 0, 1, 2, 3, 1, 0)
+        res = grid.prob_match(0.66, 0.62, STATE)
+        assert res == pytest.approx(exact, abs=grid.error[STATE])
+
+    def test_scalar_matches_array(self, grid: ProbGrid) -> None:
+        res = grid.prob_match(np.array([0.6234]), np.array([0.5517]))
+        assert res[0] == pytest.approx(grid.prob_match(0.6234, 0.5517))
+
+    def test_error_shrinks(self) -> None:
+        coarse = ProbGrid(lo=0.4, hi=0.8, n=11)
+        fine = ProbGrid(lo=0.4, hi=0.8, n=21)
+        assert fine.error["match"] < coarse.error["match"] / 3
+
+    def test_outside_grid(self, grid: ProbGrid) -> None:
+        with pytest.raises(ValueError):
+            grid.prob_match(0.9, 0.6)
+        with pytest.raises(ValueError):
+            grid.prob_hold(np.array([0.5, 0.3]))
+
+    def test_unknown_state(self, grid: ProbGrid) -> None:
+        with pytest.raises(KeyError):
+            grid.prob_match(0.6, 0.6, (0, 0, 1, 1, 0, 0, True))
+
+    def test_save_load(self, grid: ProbGrid, tmp_path: Path) -> None:
+        path = str(tmp_path / "grid.npz")
+        grid.save(path)
+        loaded = ProbGrid.load(path)
+        assert loaded.error == grid.error
+        assert loaded.prob_set(0.61, 0.57) == grid.prob_set(0.61, 0.57)
+        assert loaded.prob_match(0.61, 0.57, STATE) == grid.prob_match(
+            0.61, 0.57, STATE
+        )
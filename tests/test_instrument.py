@@ -0,0 +1,96 @@
+import random
+from typing import Iterator
+
+import pytest
+
+from tennisim import instrument
+from tennisim import match
+from tennisim import set as set_
+from tennisim import sim
+from tennisim.sim import OUTCOME
+
+
+@pytest.fixture(autouse=True)
+def clean() -> Iterator[None]:
+    """Starts each test with instrumentation off and counters at 0"""
+    instrument.disable()
+    instrument.reset()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+class TestInstrument:
+    """Tests for the instrumentation of the hot paths"""
+
+    def test_off_by_default(self) -> None:
+        original = sim.sim_game
+        sim.sim_game(0.6)
+        assert not instrument.enabled()
+        assert instrument.snapshot() == instrument.Snapshot({}, {}, 0, 0, 0)
+        instrument.enable()
+        assert sim.sim_game is not original
+        instrument.disable()
+        # originals are put back everywhere so nothing is left in the loops
+        assert sim.sim_game is original
+        assert match.prob_set is set_.prob_set
+        assert not hasattr(set_.prob_set, "__wrapped__")
+
+    def test_counts_closed_forms(self) -> None:
+        with instrument.instrumented():
+            match.prob_match(0.64, 0.61, 1, 0, 3, 2, 1, 2)
+        snap = instrument.snapshot()
+        assert snap.calls["prob_match"] == 1
+        # prob_match calls prob_set from inside the match module
+        assert snap.calls["prob_set"] >= 1
+        assert snap.calls["prob_game"] == 1
+        assert snap.seconds["prob_match"] >= snap.seconds["prob_set"]
+
+    def test_counts_points_full(self) -> None:
+        with instrument.instrumented():
+            res = sim.sim_match(0.64, 0.61, rng=random.Random(3))
+        snap = instrument.snapshot()
+        games = [g for x in res[3] for g in x]
+        points = sum(len(x) for x in games)
+        tiebreaks = sum(1 for x in res[2] for g in x if g == (7, 6))
+        tiebreaks += sum(1 for x in res[2] for g in x if g == (6, 7))
+        assert snap.points == points
+        assert snap.games + snap.tiebreaks == len(games)
+        assert snap.tiebreaks == tiebreaks
+        assert snap.calls["sim_match"] == 1
+        assert snap.calls["sim_set"] == len(res[1])
+
+    def test_counts_points_outcome(self) -> None:
+        """points are still counted when no progression is kept"""
+        with instrument.instrumented():
+            sim.sim_match(0.64, 0.61, record=OUTCOME, rng=random.Random(3))
+        full = instrument.snapshot()
+        instrument.reset()
+        with instrument.instrumented():
+            sim.sim_match(0.64, 0.61, rng=random.Random(3))
+        assert instrument.snapshot().points == full.points > 0
+
+    def test_same_results(self) -> None:
+        expected = sim.sim_match(0.64, 0.61, rng=random.Random(5))
+        with instrument.instrumented():
+            res = sim.sim_match(0.64, 0.61, rng=random.Random(5))
+            random.seed(9)
+            game = sim.sim_game(0.6, 4, "full", None)
+        random.seed(9)
+        assert res == expected
+        assert game == sim.sim_game(0.6)
+
+    def test_reset(self) -> None:
+        with instrument.instrumented():
+            sim.sim_point(0.6)
+        assert instrument.snapshot().points == 1
+        instrument.reset()
+        assert instrument.snapshot() == instrument.Snapshot({}, {}, 0, 0, 0)
+
+    def test_export(self) -> None:
+        with instrument.instrumented():
+            sim.sim_game(0.6, rng=random.Random(1))
+        text = instrument.export()
+        assert 'tennisim_calls_total{function="sim_game"} 1' in text
+        assert "tennisim_games_simulated_total 1" in text
+        assert text.endswith("\n")
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+from tennisim.live import MatchState
+from tennisim.match import MatchTable
+from tennisim.match import prob_match
+
+P_A = 0.64
+P_B = 0.61
+TABLE = MatchTable(P_A, P_B, sets=3)
+
+
+def to_tiebreak(state: MatchState) -> None:
+    """Plays holds of serve until the set reaches 6-6"""
+    while not state.in_tiebreak:
+        server = "a" if state.a_serving else "b"
+        for x in range(4):
+            state.point_won_by(server)
+
+
+class TestMatchState:
+    """Tests for the `MatchState` class"""
+
+    def test_start_matches_prob_match(self) -> None:
+        state = MatchState(TABLE)
+        assert state.prob == pytest.approx(prob_match(P_A, P_B))
+
+    def test_mid_game_matches_prob_match(self) -> None:
+        state = MatchState(TABLE)
+        for x in "aab":
+            state.point_won_by(x)
+        assert state.score == (0, 0, 0, 0, 2, 1, True)
+        expected = prob_match(P_A, P_B, 0, 0, 0, 0, 2, 1)
+        assert state.prob == pytest.approx(expected)
+
+    def test_if_won_and_lost(self) -> None:
+        state = MatchState(TABLE, True, 1, 0, 3, 2, 1, 2)
+        p_w = state.prob_w
+        p_l = state.prob_l
+        assert p_w == pytest.approx(TABLE.prob(1, 0, 3, 2, 2, 2, True))
+        assert p_l == pytest.approx(TABLE.prob(1, 0, 3, 2, 1, 3, True))
+        assert state.point_won_by("a") == p_w
+
+    def test_deuce(self) -> None:
+        state = MatchState(TABLE, True, 0, 0, 0, 0, 3, 3)
+        state.point_won_by("a")
+        assert (state.pt_a, state.pt_b) == (4, 3)
+        state.point_won_by("b")
+        assert (state.pt_a, state.pt_b) == (3, 3)
+
+    def test_server_swaps_each_game(self) -> None:
+        state = MatchState(TABLE)
+        for x in "aaaa":
+            state.point_won_by(x)
+        assert state.score == (0, 0, 1, 0, 0, 0, False)
+        for x in "aaaa":
+            state.point_won_by(x)
+        assert state.score == (0, 0, 2, 0, 0, 0, True)
+
+    def test_tiebreak_rotation(self) -> None:
+        state = MatchState(TABLE)
+        to_tiebreak(state)
+        assert state.tb_first and state.a_serving
+        servers = []
+        for x in range(8):
+            state.point_won_by("a" if x % 2 else "b")
+            servers.append(state.a_serving)
+        # first server has point 0, then 2 each starting with the other
+        expected = [False, False, True, True, False, False, True, True]
+        assert servers == expected
+
+    def test_tiebreak_winner_returns_first(self) -> None:
+        state = MatchState(TABLE)
+        to_tiebreak(state)
+        for x in range(7):
+            state.point_won_by("a")
+        # 'a' served first in the tiebreak so 'b' serves first next set
+        assert state.score == (1, 0, 0, 0, 0, 0, False)
+
+    def test_prob_is_martingale(self) -> None:
+        """the probability now is the average of its next values, from
+        every state including deuce and advantage points"""
+        rng = random.Random(7)
+        deuce = 0
+        for x in range(20):
+            state = MatchState(TABLE)
+            while not state.over:
+                p = P_A if state.a_serving else 1 - P_B
+                expected = p * state.prob_w + (1 - p) * state.prob_l
+                assert state.prob == pytest.approx(expected, abs=1e-12)
+                if not state.in_tiebreak:
+                    deuce += min(state.pt_a, state.pt_b) >= 3
+                state.point_won_by("a" if rng.random() <= p else "b")
+            assert state.prob in (0.0, 1.0)
+            assert state.prob_w == state.prob_l == state.prob
+        # the matches played did go through deuce
+        assert deuce
+
+    def test_five_sets(self) -> None:
+        table = MatchTable(P_A, P_B, sets=5)
+        state = MatchState(table, False, 2, 2, 4, 5, 0, 2)
+        expected = 1 - prob_match(P_B, P_A, 2, 2, 5, 4, 2, 0, sets=5)
+        assert state.prob == pytest.approx(expected)
+
+    def test_bad_player(self) -> None:
+        with pytest.raises(ValueError):
+            MatchState(TABLE).point_won_by("c")
+
+    def test_match_over(self) -> None:
+        state = MatchState(TABLE, True, 2, 0)
+        assert state.over
+        with pytest.raises(ValueError):
+            state.point_won_by("a")
+
+    def test_slots(self) -> None:
+        with pytest.raises(AttributeError):
+            MatchState(TABLE).other = 1  # type: ignore
@@ -1,6 +1,19 @@
+import random
+
+import numpy as np
+import pytest
+
+from tennisim.match import POINT_DTYPE
+from tennisim.match import MatchTable
+from tennisim.match import PointRow
+from tennisim.match import encode_state
+from tennisim.match import iter_points
+from tennisim.match import points_array
 from tennisim.match import prob_match
 from tennisim.match import prob_match_outcome
+from tennisim.match import reformat_match
 from tennisim.set import prob_set
+from tennisim.sim import sim_match
 
 
 class TestProbMatchOutcome:
@@ -46,3 +59,121 @@ class TestProbMatch:
 
     def test_prob_match_not_started(self) -> None:
         assert prob_match(0.5, 0.5, 1, 1, 0, 0, 0, 0, 3) == 0.5
+
+    def test_prob_match_not_started_five(self) -> None:
+        p_set = prob_set(0.6, 0.55, 0, 0)
+        p_match = prob_match_outcome(p_set, 0, 0, 5)[0]
+        assert prob_match(0.6, 0.55, sets=5) == p_match
+
+
+class TestMatchTable:
+    """Tests for the `MatchTable` class"""
+
+    def test_match_table_a_serving(self) -> None:
+        table = MatchTable(0.65, 0.6)
+        states = [(0, 0, 0, 0, 0, 0), (1, 0, 3, 2, 1, 3), (0, 1, 5, 6, 3, 3)]
+        for s in states:
+            assert table.prob(*s) == pytest.approx(prob_match(0.65, 0.6, *s))
+
+    def test_match_table_b_serving(self) -> None:
+        table = MatchTable(0.65, 0.6)
+        states = [(0, 0, 0, 1, 0, 0), (1, 0, 2, 3, 2, 1), (1, 1, 4, 5, 0, 2)]
+        for st_a, st_b, g_a, g_b, pt_a, pt_b in states:
+            p = 1 - prob_match(0.6, 0.65, st_b, st_a, g_b, g_a, pt_b, pt_a)
+            p_t = table.prob(st_a, st_b, g_a, g_b, pt_a, pt_b, False)
+            assert p_t == pytest.approx(p)
+
+    def test_match_table_tiebreak(self) -> None:
+        table = MatchTable(0.65, 0.6)
+        for pt_a, pt_b in [(0, 0), (3, 4), (6, 5), (6, 6), (7, 6), (12, 11)]:
+            p = prob_match(0.65, 0.6, 1, 0, 6, 6, pt_a, pt_b)
+            assert table.prob(1, 0, 6, 6, pt_a, pt_b) == pytest.approx(p)
+
+    def test_match_table_finished(self) -> None:
+        table = MatchTable(0.65, 0.6, sets=5)
+        assert table.prob(3, 1, 0, 0, 0, 0) == 1.0
+        assert table.prob(2, 3, 0, 0, 0, 0) == 0.0
+
+    def test_encode_state_arrays(self) -> None:
+        states = [(0, 1, 2, 3, 1, 0, True), (1, 1, 6, 6, 9, 8, False)]
+        st_a, st_b, g_a, g_b, pt_a, pt_b, srv = [
+            np.array(x) for x in zip(*states)
+        ]
+        idx = encode_state(st_a, st_b, g_a, g_b, pt_a, pt_b, srv)
+        assert list(np.asarray(idx)) == [encode_state(*s) for s in states]
+
+
+class TestReformatMatch:
+    """Tests for the `reformat_match` function"""
+
+    def test_reformat_match_probs(self) -> None:
+        random.seed(1)
+        points = reformat_match(sim_match(0.65, 0.6), 0.65, 0.6)
+        for pt in [x for x in points if x["gc"] % 2 == 0][:-1]:
+            p = prob_match(
+                0.65,
+                0.6,
+                pt["st_a"],
+                pt["st_b"],
+                pt["g_a"],
+                pt["g_b"],
+                pt["pt_a"],
+                pt["pt_b"],
+            )
+            if pt["g_a"] != 6 or pt["g_b"] != 6:
+                assert pt["prob"] == pytest.approx(p)
+
+    def test_reformat_match_point_count(self) -> None:
+        random.seed(1)
+        match = sim_match(0.65, 0.6)
+        points = reformat_match(match, 0.65, 0.6)
+        n_points = sum(len(g) for s in match[3] for g in s)
+        assert len(points) == n_points + 1
+        assert points[-1]["prob"] == float(match[0])
+
+    def test_reformat_match_shared_table(self) -> None:
+        random.seed(1)
+        match = sim_match(0.65, 0.6)
+        table = MatchTable(0.65, 0.6)
+        assert reformat_match(match, 0.65, 0.6, table) == reformat_match(
+            match, 0.65, 0.6
+        )
+
+
+class TestIterPoints:
+    """Tests for the `iter_points` and `points_array` functions"""
+
+    def test_forms_match_reformat_match(self) -> None:
+        rng = random.Random(3)
+        table = MatchTable(0.65, 0.6, sets=5)
+        for x in range(20):
+            match = sim_match(0.65, 0.6, x % 2 == 0, 5, rng=rng)
+            points = reformat_match(match, 0.65, 0.6, table)
+            assert list(iter_points(match, 0.65, 0.6, table)) == points
+            rows = list(iter_points(match, 0.65, 0.6, table, "namedtuple"))
+            assert [x._asdict() for x in rows] == points
+            assert all(isinstance(x, PointRow) for x in rows)
+            tuples = list(iter_points(match, 0.65, 0.6, table, "tuple"))
+            assert tuples == [tuple(x.values()) for x in points]
+
+    def test_lazy(self) -> None:
+        random.seed(1)
+        points = iter_points(sim_match(0.65, 0.6), 0.65, 0.6)
+        first = next(points)
+        assert first["pc"] == 0
+        assert first["prob"] == pytest.approx(prob_match(0.65, 0.6))
+
+    def test_bad_form(self) -> None:
+        random.seed(1)
+        with pytest.raises(ValueError):
+            iter_points(sim_match(0.65, 0.6), 0.65, 0.6, form="list")
+
+    def test_points_array(self) -> None:
+        random.seed(2)
+        match = sim_match(0.65, 0.6)
+        points = reformat_match(match, 0.65, 0.6)
+        arr = points_array(match, 0.65, 0.6)
+        assert arr.dtype == POINT_DTYPE
+        assert arr.shape == (len(points),)
+        for name in PointRow._fields:
+            assert arr[name].tolist() == [x[name] for x in points]
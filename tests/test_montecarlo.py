@@ -0,0 +1,119 @@
+import random
+
+import numpy as np
+import pytest
+
+from tennisim import montecarlo as mc
+from tennisim.exact import match_length_dist
+from tennisim.match import prob_match
+from tennisim.sim import SUMMARY
+from tennisim.sim import sim_match
+
+
+class TestSummaries:
+    """Tests for summarising and playing matches"""
+
+    def test_summarise(self) -> None:
+        # 'a' serves the odd games of the first set and breaks in games 2, 6
+        # and 8, 'b' breaks in game 5. Every game of the second set is held
+        set_1 = [(1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (4, 2), (5, 2)]
+        set_1.append((6, 2))
+        set_2 = [(x // 2 + x % 2, x // 2) for x in range(1, 13)] + [(7, 6)]
+        result = (True, [(1, 0), (2, 0)], [set_1, set_2], None)
+        summary = mc.summarise(result, a_first=True)
+        assert summary.sets == [(6, 2), (7, 6)]
+        assert summary.games == 21
+        assert summary.tiebreaks == 1
+        assert summary.breaks_a == 3
+        assert summary.breaks_b == 1
+
+    def test_play_matches_sim_match(self) -> None:
+        for seed in range(20):
+            for a_first in (True, False):
+                expected = mc.summarise(
+                    sim_match(
+                        0.62,
+                        0.6,
+                        a_first,
+                        5,
+                        record=SUMMARY,
+                        rng=random.Random(seed),
+                    ),
+                    a_first,
+                )
+                res = mc.play(0.62, 0.6, a_first, 5, rng=random.Random(seed))
+                assert res == expected
+
+    def test_scoreline(self) -> None:
+        summary = mc.MatchSummary(False, [(6, 4), (3, 6), (4, 6)], 29, 0, 0, 0)
+        assert mc.scoreline(1, 2)(summary) == 1.0
+        assert mc.scoreline(2, 1)(summary) == 0.0
+
+
+class TestAntitheticPair:
+    """Tests for the `AntitheticPair` random sources"""
+
+    def test_mirrors_each_game(self) -> None:
+        pair = mc.AntitheticPair(random.Random(1))
+        first = [pair.first(0), pair.first(1)]
+        draws = [[x.random() for y in range(3)] for x in first]
+        second = [pair.second(0), pair.second(1)]
+        # game 0 mirrors its 3 draws then goes on with fresh ones
+        mirrored = [second[0].random() for y in range(4)]
+        assert mirrored[:3] == pytest.approx([1 - x for x in draws[0]])
+        assert 0 <= mirrored[3] < 1
+        assert second[1].random() == pytest.approx(1 - draws[1][0])
+        # games the first match never played get fresh draws
+        assert 0 <= pair.second(5).random() < 1
+
+
+class TestEstimate:
+    """Tests for the `estimate` function"""
+
+    def test_control_of_itself_is_exact(self) -> None:
+        res = mc.estimate({"win": mc.a_won}, 0.64, 0.61, 200, rng=3)
+        assert res["win"].mean == pytest.approx(prob_match(0.64, 0.61))
+        assert res["win"].std_err == 0.0
+        assert res["win"].paths == 200
+
+    def test_plain_estimate(self) -> None:
+        length = match_length_dist(0.64, 0.61)
+        games = float(length.games @ np.arange(length.games.size))
+        res = mc.estimate(
+            {"games": mc.total_games},
+            0.64,
+            0.61,
+            2000,
+            antithetic=False,
+            control=False,
+            rng=4,
+        )["games"]
+        assert res.gain == 1.0
+        assert abs(res.mean - games) < 4 * res.std_err
+
+    def test_reduces_variance(self) -> None:
+        stats = {
+            "breaks": mc.total_breaks,
+            "tiebreaks": lambda x: float(x.tiebreaks),
+        }
+        plain = mc.estimate(
+            stats, 0.64, 0.61, 4000, antithetic=False, control=False, rng=5
+        )
+        res = mc.estimate(stats, 0.64, 0.61, 4000, rng=5)
+        for name in stats:
+            assert res[name].gain > 1.3
+            assert res[name].std_err < plain[name].std_err
+            diff = abs(res[name].mean - plain[name].mean)
+            assert diff < 4 * plain[name].std_err
+
+    @pytest.mark.parametrize("p_a,p_b", [(1.0, 1.0), (0.0, 0.0), (0.6, 1.2)])
+    def test_bad_probs(self, p_a: float, p_b: float) -> None:
+        for control in (True, False):
+            with pytest.raises(ValueError):
+                mc.estimate({"win": mc.a_won}, p_a, p_b, 4, control=control)
+        with pytest.raises(ValueError):
+            mc.play(p_a, p_b)
+
+    def test_too_few_paths(self) -> None:
+        with pytest.raises(ValueError):
+            mc.estimate({"win": mc.a_won}, 0.64, 0.61, 6)
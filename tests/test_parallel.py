@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from tennisim.parallel import shard_seeds
+from tennisim.parallel import shard_sizes
+from tennisim.parallel import sim_parallel
+from tennisim.sim import OUTCOME
+from tennisim.sim import sim_game
+from tennisim.sim import sim_match
+
+
+def count_wins(results: list) -> int:
+    return sum(x[0] for x in results)
+
+
+class TestShards:
+    """Tests for the `shard_sizes` and `shard_seeds` functions"""
+
+    def test_shard_sizes_total(self) -> None:
+        assert sum(shard_sizes(1003, 7)) == 1003
+
+    def test_shard_sizes_even(self) -> None:
+        sizes = shard_sizes(1003, 7)
+        assert max(sizes) - min(sizes) <= 1
+
+    def test_shard_seeds_distinct(self) -> None:
+        seeds = shard_seeds(1, 16)
+        assert len(set(seeds)) == 16
+
+    def test_shard_seeds_reproducible(self) -> None:
+        assert shard_seeds(1, 4) == shard_seeds(1, 4)
+
+
+class TestSimParallel:
+    """Tests for the `sim_parallel` function"""
+
+    def test_parallel_count(self) -> None:
+        res = sim_parallel(sim_game, 1001, 0.6, seed=1, workers=2)
+        assert len(res) == 1001
+
+    def test_parallel_reproducible(self) -> None:
+        first = sim_parallel(sim_match, 500, 0.6, 0.6, seed=1, workers=2)
+        second = sim_parallel(sim_match, 500, 0.6, 0.6, seed=1, workers=2)
+        assert first == second
+
+    def test_parallel_single_worker(self) -> None:
+        first = sim_parallel(sim_game, 200, 0.6, seed=5, workers=1)
+        second = sim_parallel(sim_game, 200, 0.6, seed=5, workers=1)
+        assert first == second
+
+    def test_parallel_leaves_global_state(self) -> None:
+        random.seed(3)
+        expected = random.random()
+        random.seed(3)
+        sim_parallel(sim_game, 50, 0.6, seed=5, workers=1)
+        assert random.random() == expected
+
+    def test_parallel_same_as_seeded_rng(self) -> None:
+        seed = shard_seeds(5, 1)[0]
+        rng = random.Random(seed)
+        expected = [sim_game(0.6, rng=rng) for x in range(20)]
+        assert sim_parallel(sim_game, 20, 0.6, seed=5, workers=1) == expected
+
+    def test_parallel_rng_given(self) -> None:
+        with pytest.raises(ValueError):
+            sim_parallel(sim_game, 20, 0.6, seed=5, rng=random.Random(1))
+
+    def test_parallel_seeds_differ(self) -> None:
+        first = sim_parallel(sim_match, 200, 0.6, 0.6, seed=1, workers=2)
+        second = sim_parallel(sim_match, 200, 0.6, 0.6, seed=2, workers=2)
+        assert first != second
+
+    def test_parallel_reduce_combine(self) -> None:
+        wins = sim_parallel(
+            sim_match,
+            2000,
+            1,
+            0,
+            seed=1,
+            workers=2,
+            record=OUTCOME,
+            reduce=count_wins,
+            combine=sum,
+        )
+        assert wins == 2000
@@ -0,0 +1,29 @@
+from tennisim.rng import BufferedUniform
+
+
+class TestBufferedUniform:
+    """Tests for the `BufferedUniform` class"""
+
+    def test_buffered_range(self) -> None:
+        rng = BufferedUniform(1, block=100)
+        draws = [rng.random() for x in range(1000)]
+        assert min(draws) >= 0 and max(draws) < 1
+
+    def test_buffered_refill(self) -> None:
+        rng = BufferedUniform(1, block=3)
+        draws = [rng.random() for x in range(10)]
+        assert len(set(draws)) == 10
+
+    def test_buffered_block_size_irrelevant(self) -> None:
+        small = BufferedUniform(1, block=7)
+        large = BufferedUniform(1, block=1000)
+        assert [small.random() for x in range(50)] == [
+            large.random() for x in range(50)
+        ]
+
+    def test_buffered_seeded(self) -> None:
+        first = BufferedUniform(5)
+        second = BufferedUniform(5)
+        assert [first.random() for x in range(10)] == [
+            second.random() for x in range(10)
+        ]
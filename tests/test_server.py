@@ -0,0 +1,183 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from tennisim.match import prob_match
+from tennisim.server import PricingServer
+from tennisim.server import fetch
+from tennisim.server import parse_query
+
+QUERIES = [
+    {"p_a": 0.65, "p_b": 0.6},
+    {"p_a": 0.65, "p_b": 0.6, "st_a": 1, "g_a": 3, "g_b": 2, "pt_b": 2},
+    {"p_a": 0.7, "p_b": 0.62, "g_a": 6, "g_b": 6, "pt_a": 4, "pt_b": 3},
+    {"p_a": 0.58, "p_b": 0.66, "st_b": 2, "g_a": 1, "sets": 5},
+]
+
+
+def expected(query: dict) -> float:
+    kwargs = {x: y for x, y in query.items() if x not in ("p_a", "p_b")}
+    return prob_match(query["p_a"], query["p_b"], **kwargs)
+
+
+class TestParseQuery:
+    """Tests for the `parse_query` function"""
+
+    def test_parse_defaults(self) -> None:
+        res = parse_query({"p_a": 0.6, "p_b": 0.7})
+        assert res == (0.6, 0.7, (0, 0, 0, 0, 0, 0), 3)
+
+    def test_parse_missing(self) -> None:
+        with pytest.raises(ValueError):
+            parse_query({"p_a": 0.6})
+
+    def test_parse_range(self) -> None:
+        with pytest.raises(ValueError):
+            parse_query({"p_a": 0.6, "p_b": 1.5})
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"p_a": 1.0, "p_b": 1.0},
+            {"p_a": 0.0, "p_b": 0.0},
+            {"sets": 0},
+            {"sets": 4},
+            {"st_a": 2},
+            {"st_b": -1},
+            {"st_a": 3, "sets": 5},
+            {"g_a": -3},
+            {"g_b": 8},
+            {"pt_a": -1},
+            {"g_a": "six"},
+        ],
+    )
+    def test_parse_bad_state(self, extra: dict) -> None:
+        with pytest.raises(ValueError):
+            parse_query({"p_a": 0.6, "p_b": 0.7, **extra})
+
+
+class TestPricingServer:
+    """Tests for the `PricingServer` class"""
+
+    def test_price_batches(self) -> None:
+        async def run() -> tuple:
+            server = PricingServer(window=0.05)
+            try:
+                res = await asyncio.gather(*[server.price(x) for x in QUERIES])
+            finally:
+                await server.close()
+            return res, server.batches
+
+        res, batches = asyncio.run(run())
+        assert res == pytest.approx([expected(x) for x in QUERIES])
+        assert batches == 1
+
+    def test_price_max_batch(self) -> None:
+        async def run() -> int:
+            # long window so only the size limit can close a batch quickly
+            server = PricingServer(window=10, max_batch=2)
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*[server.price(x) for x in QUERIES]), 5
+                )
+            finally:
+                await server.close()
+            return server.batches
+
+        assert asyncio.run(run()) == 2
+
+    def test_price_max_batch_trickle(self) -> None:
+        async def run() -> int:
+            server = PricingServer(window=10, max_batch=2)
+            try:
+                first = asyncio.ensure_future(server.price(QUERIES[0]))
+                # let the batcher take the first query before the second
+                for _ in range(5):
+                    await asyncio.sleep(0)
+                await asyncio.wait_for(
+                    asyncio.gather(first, server.price(QUERIES[1])), 5
+                )
+            finally:
+                await server.close()
+            return server.batches
+
+        assert asyncio.run(run()) == 1
+
+    def test_tcp_round_trip(self) -> None:
+        async def run() -> list:
+            server = PricingServer()
+            port = await server.start()
+            try:
+                return await fetch(QUERIES, port=port)
+            finally:
+                await server.close()
+
+        replies = asyncio.run(run())
+        probs = [x["prob"] for x in replies]
+        assert probs == pytest.approx([expected(x) for x in QUERIES])
+
+    def test_tcp_bad_query(self) -> None:
+        async def run() -> list:
+            server = PricingServer()
+            port = await server.start()
+            try:
+                return await fetch([{"p_a": 0.6}, QUERIES[0]], port=port)
+            finally:
+                await server.close()
+
+        replies = asyncio.run(run())
+        assert "error" in replies[0]
+        assert replies[1]["prob"] == pytest.approx(expected(QUERIES[0]))
+
+    def test_bad_query_in_batch(self) -> None:
+        async def run() -> list:
+            server = PricingServer(window=0.05)
+            # parses but can't be priced, so fails the batch's one call
+            bad = {"p_a": 0.6, "p_b": 0.6, "pt_a": 40}
+            try:
+                return await asyncio.gather(
+                    *[server.price(x) for x in QUERIES[:3] + [bad]],
+                    return_exceptions=True,
+                )
+            finally:
+                await server.close()
+
+        res = asyncio.run(run())
+        assert res[:3] == pytest.approx([expected(x) for x in QUERIES[:3]])
+        assert isinstance(res[3], Exception)
+
+    def test_tcp_many_clients(self) -> None:
+        async def run() -> tuple:
+            server = PricingServer(window=0.05)
+            port = await server.start()
+            try:
+                res = await asyncio.gather(
+                    *[fetch(QUERIES, port=port) for x in range(10)]
+                )
+            finally:
+                await server.close()
+            return res, server.batches, server.queries
+
+        res, batches, queries = asyncio.run(run())
+        assert queries == 40
+        assert batches < 40
+        for replies in res:
+            assert [x["prob"] for x in replies] == pytest.approx(
+                [expected(x) for x in QUERIES]
+            )
+
+    @pytest.mark.skipif(os.name != "posix", reason="needs unix sockets")
+    def test_unix_round_trip(self) -> None:
+        async def run(path: str) -> list:
+            server = PricingServer()
+            await server.start_unix(path)
+            try:
+                return await fetch(QUERIES, path=path)
+            finally:
+                await server.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            replies = asyncio.run(run(os.path.join(tmp, "pricing.sock")))
+        assert replies[1]["prob"] == pytest.approx(expected(QUERIES[1]))
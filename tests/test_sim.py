@@ -1,3 +1,10 @@
+import random
+
+import pytest
+
+from tennisim.rng import BufferedUniform
+from tennisim.sim import OUTCOME
+from tennisim.sim import SUMMARY
 from tennisim.sim import sim_game
 from tennisim.sim import sim_match
 from tennisim.sim import sim_point
@@ -16,6 +23,11 @@ class TestSimPoint:
         simed_points = [sim_point(1) for x in range(0, 1000)]
         assert min(simed_points) == 1
 
+    def test_point_rng(self) -> None:
+        first = [sim_point(0.5, random.Random(1)) for x in range(0, 100)]
+        second = [sim_point(0.5, random.Random(1)) for x in range(0, 100)]
+        assert first == second
+
 
 class TestSimGame:
     """Tests for the `sim_game` function"""
@@ -39,6 +51,24 @@ class TestSimGame:
         simed_games = [len(sim_game(1, ppg=x)[1]) for x in range(4, 1000)]
         assert simed_games == [x for x in range(4, 1000)]
 
+    def test_game_summary(self) -> None:
+        random.seed(1)
+        full = [sim_game(0.6) for x in range(0, 1000)]
+        random.seed(1)
+        summ = [sim_game(0.6, record=SUMMARY) for x in range(0, 1000)]
+        assert summ == [(x[0], x[1][-1]) for x in full]
+
+    def test_game_outcome(self) -> None:
+        random.seed(1)
+        full = [sim_game(0.6) for x in range(0, 1000)]
+        random.seed(1)
+        outs = [sim_game(0.6, record=OUTCOME) for x in range(0, 1000)]
+        assert outs == [(x[0], None) for x in full]
+
+    def test_game_bad_record(self) -> None:
+        with pytest.raises(ValueError):
+            sim_game(0.6, record="points")
+
 
 class TestSimSet:
     """Tests for the `sim_set` function"""
@@ -61,6 +91,20 @@ class TestSimSet:
     def test_set_inf(self) -> None:
         assert sim_set(1, 1) == ()
 
+    def test_set_summary(self) -> None:
+        random.seed(2)
+        full = sim_set(0.6, 0.6)
+        random.seed(2)
+        summ = sim_set(0.6, 0.6, record=SUMMARY)
+        assert summ == (full[0], full[1], [x[-1] for x in full[2]])
+
+    def test_set_outcome(self) -> None:
+        random.seed(2)
+        full = sim_set(0.6, 0.6)
+        random.seed(2)
+        outs = sim_set(0.6, 0.6, record=OUTCOME)
+        assert outs == (full[0], full[1][-1], None)
+
 
 class TestSimTiebreak:
     """Tests for the `sim_tiebreak` function"""
@@ -75,6 +119,13 @@ class TestSimTiebreak:
         simed_tbs = [x for x in simed_tbs if x[1][-1] == (0, 7)]
         assert len(simed_tbs) == 1000
 
+    def test_tiebreak_summary(self) -> None:
+        random.seed(3)
+        full = sim_tiebreak(0.6, 0.6)
+        random.seed(3)
+        summ = sim_tiebreak(0.6, 0.6, record=SUMMARY)
+        assert summ == (full[0], full[1][-1])
+
 
 class TestSimMatch:
     """Tests for the `sim_match` function"""
@@ -88,3 +139,31 @@ class TestSimMatch:
         simed_matches = [sim_match(0, 1) for x in range(0, 1000)]
         simed_matches = [x for x in simed_matches if x[1][-1] == (0, 2)]
         assert len(simed_matches) == 1000
+
+    def test_match_outcome(self) -> None:
+        random.seed(4)
+        full = sim_match(0.6, 0.6, best_of=5)
+        random.seed(4)
+        outs = sim_match(0.6, 0.6, best_of=5, record=OUTCOME)
+        assert outs == (full[0], full[1][-1], None, None)
+
+    def test_match_summary(self) -> None:
+        random.seed(4)
+        full = sim_match(0.6, 0.6, best_of=5)
+        random.seed(4)
+        summ = sim_match(0.6, 0.6, best_of=5, record=SUMMARY)
+        finals = [[g[-1] for g in s] for s in full[3]]
+        assert summ == (full[0], full[1], full[2], finals)
+
+    def test_match_rng_reproducible(self) -> None:
+        first = sim_match(0.6, 0.6, rng=BufferedUniform(1))
+        second = sim_match(0.6, 0.6, rng=BufferedUniform(1))
+        assert first == second
+
+    def test_match_rng_isolated(self) -> None:
+        """simulating from a source leaves the global random state alone"""
+        random.seed(1)
+        expected = random.random()
+        random.seed(1)
+        sim_match(0.6, 0.6, rng=BufferedUniform(2))
+        assert random.random() == expected
@@ -0,0 +1,157 @@
+import random
+
+import numpy as np
+import pytest
+
+from tennisim.batch import sim_match_batch
+from tennisim.sim import OUTCOME
+from tennisim.sim import SUMMARY
+from tennisim.sim import sim_match
+from tennisim.stream import Counts
+from tennisim.stream import Histogram
+from tennisim.stream import MatchAggregator
+from tennisim.stream import RunningStats
+from tennisim.stream import aggregate_matches
+
+
+class TestRunningStats:
+    """Tests for the `RunningStats` class"""
+
+    def test_matches_numpy(self) -> None:
+        values = np.random.default_rng(1).normal(3, 2, size=(1000, 2))
+        running = RunningStats((2,))
+        for x in np.array_split(values, 7):
+            running.update(x)
+        assert running.count == 1000
+        assert running.mean == pytest.approx(values.mean(axis=0))
+        assert running.variance == pytest.approx(values.var(axis=0, ddof=1))
+        expected = values.std(axis=0, ddof=1) / np.sqrt(1000)
+        assert running.std_err == pytest.approx(expected)
+
+    def test_merge(self) -> None:
+        values = np.random.default_rng(2).exponential(size=500)
+        left = RunningStats().update(values[:123])
+        right = RunningStats().update(values[123:])
+        left.merge(right).merge(RunningStats())
+        assert left.count == 500
+        assert left.mean == pytest.approx(values.mean())
+        assert left.variance == pytest.approx(values.var(ddof=1))
+
+    def test_large_offset(self) -> None:
+        """no cancellation when the mean is far bigger than the spread"""
+        values = 1e9 + np.arange(10.0)
+        running = RunningStats()
+        for x in values:
+            running.update([x])
+        expected = np.var(np.arange(10.0), ddof=1)
+        assert running.variance == pytest.approx(expected)
+
+    def test_too_few(self) -> None:
+        running = RunningStats().update([1.0])
+        assert np.isnan(running.variance)
+        assert running.update([]).count == 1
+
+    def test_merge_bad_shape(self) -> None:
+        with pytest.raises(ValueError):
+            RunningStats((2,)).merge(RunningStats())
+
+
+class TestHistogram:
+    """Tests for the `Histogram` class"""
+
+    def test_counts_and_overflow(self) -> None:
+        hist = Histogram(4).update([0, 1, 1, 3, 4, 9])
+        assert hist.counts.tolist() == [1, 2, 0, 1]
+        assert hist.overflow == 2
+        assert hist.total == 6
+        assert hist.pmf[1] == pytest.approx(2 / 6)
+
+    def test_merge(self) -> None:
+        hist = Histogram(3).update([0, 2]).merge(Histogram(3).update([2, 5]))
+        assert hist.counts.tolist() == [1, 0, 2]
+        assert hist.overflow == 1
+        with pytest.raises(ValueError):
+            hist.merge(Histogram(4))
+
+
+class TestCounts:
+    """Tests for the `Counts` class"""
+
+    def test_counts(self) -> None:
+        counts = Counts().update([(2, 0), (2, 1), (2, 0)])
+        counts.merge(Counts().add((0, 2), 3))
+        assert counts.counts == {(2, 0): 2, (2, 1): 1, (0, 2): 3}
+        assert counts.total == 6
+        assert list(counts.freqs().items())[0] == ((0, 2), 0.5)
+
+
+class TestMatchAggregator:
+    """Tests for the `MatchAggregator` class"""
+
+    def test_matches_lists(self) -> None:
+        rng = random.Random(1)
+        results = [sim_match(0.64, 0.61, rng=rng) for x in range(300)]
+        agg = MatchAggregator()
+        for x in results[:150]:
+            agg.add(x)
+        other = MatchAggregator()
+        for x in results[150:]:
+            other.add(x)
+        agg.merge(other)
+
+        games = [sum(len(s) for s in x[2]) for x in results]
+        points = [sum(len(g) for s in x[3] for g in s) for x in results]
+        assert agg.count == 300
+        means = agg.means()
+        wins = [x[0] for x in results]
+        assert means["a_won"] == pytest.approx(np.mean(wins))
+        assert means["games"] == pytest.approx(np.mean(games))
+        expected = np.bincount(games, minlength=40)
+        assert agg.games.counts.tolist() == expected.tolist()
+        assert agg.points.total == 300
+        assert agg.points.counts @ np.arange(1024) == sum(points)
+        assert agg.scorelines.total == 300
+        assert agg.scorelines.counts[(2, 0)] == sum(
+            x[1][-1] == (2, 0) for x in results
+        )
+        assert agg.set_scores.total == sum(len(x[2]) for x in results)
+
+    def test_summary_has_no_points(self) -> None:
+        agg = MatchAggregator()
+        agg.add(sim_match(0.64, 0.61, record=SUMMARY, rng=random.Random(2)))
+        assert agg.count == 1
+        assert agg.points.total == 0
+
+    def test_outcome_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            MatchAggregator().add(sim_match(0.64, 0.61, record=OUTCOME))
+
+    def test_batch(self) -> None:
+        batch = sim_match_batch(0.64, 0.61, size=2000, best_of=5, rng=3)
+        agg = MatchAggregator(best_of=5)
+        agg.add_batch(batch)
+        assert agg.count == 2000
+        means = agg.means()
+        assert means["sets"] == pytest.approx(
+            (batch.sets_a + batch.sets_b).mean()
+        )
+        assert means["tiebreaks"] == pytest.approx(
+            batch.tiebreaks.sum(axis=1).mean()
+        )
+        assert agg.points.counts @ np.arange(1024) == batch.points.sum()
+        assert agg.scorelines.total == 2000
+        assert agg.set_scores.total == (batch.games_a >= 0).sum()
+
+    def test_aggregate_matches(self) -> None:
+        agg = aggregate_matches(0.64, 0.61, 2500, chunk=1000, rng=4)
+        assert agg.count == 2500
+        assert agg.games.total == 2500
+        assert 0.5 < agg.means()["a_won"] < 0.8
+
+    def test_aggregate_endless(self) -> None:
+        with pytest.raises(ValueError):
+            aggregate_matches(1.0, 1.0, 10)
+
+    def test_merge_bad_best_of(self) -> None:
+        with pytest.raises(ValueError):
+            MatchAggregator(3).merge(MatchAggregator(5))
@@ -0,0 +1,20 @@
+from math import factorial
+
+import pytest
+
+from tennisim.utils import comb
+
+
+class TestComb:
+    """Tests for the `comb` function"""
+
+    def test_comb_matches_factorial(self) -> None:
+        for n in range(20):
+            for r in range(n + 1):
+                expected = factorial(n) / (factorial(n - r) * factorial(r))
+                assert comb(n, r) == expected
+
+    @pytest.mark.parametrize("n, r", [(5, 6), (5, -1), (-1, 0), (-2, -3)])
+    def test_comb_outside(self, n: int, r: int) -> None:
+        with pytest.raises(ValueError):
+            comb(n, r)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from tennisim import vector
+from tennisim.game import prob_game
+from tennisim.game import theory_game
+from tennisim.match import prob_match
+from tennisim.set import prob_set
+from tennisim.tiebreak import prob_tiebreak
+
+P_A = np.linspace(0.3, 0.9, 7)
+P_B = np.linspace(0.35, 0.85, 7)
+
+
+class TestVectorTheoryGame:
+    """Tests for the array `theory_game` function"""
+
+    def test_theory_game_array(self) -> None:
+        expected = [theory_game(x) for x in P_A]
+        assert vector.theory_game(P_A) == pytest.approx(expected)
+
+
+class TestVectorProbGame:
+    """Tests for the array `prob_game` function"""
+
+    def test_prob_game_array_states(self) -> None:
+        x = np.array([0, 1, 3, 4, 4])
+        y = np.array([0, 2, 3, 3, 0])
+        expected = [prob_game(0.6, i, j) for i, j in zip(x, y)]
+        assert vector.prob_game(0.6, x, y) == pytest.approx(expected)
+
+
+class TestVectorProbTiebreak:
+    """Tests for the array `prob_tiebreak` function"""
+
+    def test_prob_tiebreak_array(self) -> None:
+        expected = [prob_tiebreak(x, y, 2, 3)[0] for x, y in zip(P_A, P_B)]
+        res = vector.prob_tiebreak(P_A, P_B, 2, 3)
+        assert res == pytest.approx(expected)
+
+
+class TestVectorProbSet:
+    """Tests for the array `prob_set` function"""
+
+    def test_prob_set_grid(self) -> None:
+        res = vector.prob_set(P_A[:, None], P_B[None, :], 0, 0)
+        assert res.shape == (7, 7)
+        assert res[2, 5] == pytest.approx(prob_set(P_A[2], P_B[5], 0, 0))
+
+    def test_prob_set_finished(self) -> None:
+        res = vector.prob_set(0.6, 0.6, [6, 3, 7], [2, 6, 6])
+        assert list(res) == [1.0, 0.0, 1.0]
+
+
+class TestVectorProbMatch:
+    """Tests for the array `prob_match` function"""
+
+    def test_prob_match_grid(self) -> None:
+        res = vector.prob_match(P_A[:, None], P_B[None, :])
+        expected = [[prob_match(x, y) for y in P_B] for x in P_A]
+        assert res == pytest.approx(np.array(expected))
+
+    def test_prob_match_mixed_states(self) -> None:
+        rng = np.random.default_rng(1)
+        states = rng.integers(0, [2, 2, 6, 6, 4, 4], size=(200, 6))
+        p_a = rng.uniform(0.5, 0.8, 200)
+        p_b = rng.uniform(0.5, 0.8, 200)
+        st_a, st_b, g_a, g_b, pt_a, pt_b = states.T
+        res = vector.prob_match(p_a, p_b, st_a, st_b, g_a, g_b, pt_a, pt_b)
+        expected = [prob_match(x, y, *s) for x, y, s in zip(p_a, p_b, states)]
+        assert res == pytest.approx(expected)
+
+    def test_prob_match_scalar(self) -> None:
+        res = vector.prob_match(0.65, 0.6, sets=5)
+        assert res.shape == ()
+        assert float(res) == pytest.approx(prob_match(0.65, 0.6, sets=5))